@@ -5,25 +5,20 @@ This is the launcher of the Greed game. It will create the
 cast of characters, then transfer game control to a
 Director instance.
 """
-# import the numerous modules needed to make the Greed game work
+# import the modules every run needs; the rest are imported by the branches that use them,
+# so each way of running the game only loads what it needs, and startup stays fast
+import argparse
 import os 
 import random
-
-from game.casting.actor import Actor
-from game.casting.artifact import Artifact
-from game.casting.cast import Cast
-
-from game.directing.director import Director
-
-from game.services.keyboard_service import KeyboardService
-from game.services.video_service import VideoService
+import sys
+import time
 
 from game.shared.color import Color
-from game.shared.point import Point
 
 
 # set defaults
-FRAME_RATE = 12
+FRAME_RATE = 60
+TICK_RATE = 12
 MAX_X = 900
 MAX_Y = 600
 CELL_SIZE = 15
@@ -34,6 +29,106 @@ CAPTION = "Greed"
 DATA_PATH = os.path.dirname(os.path.abspath(__file__)) + "/data/messages.txt"
 WHITE = Color(255, 255, 255)
 DEFAULT_ARTIFACTS = 40
+CAPTURE_FORMATS = ("ppm", "png", "raw")
+
+
+def parse_args():
+    """
+    parameters: none
+    return: the parsed command line arguments
+    The parse_args function reads the command line options. With no options
+    the game opens a window as usual.
+    """
+    parser = argparse.ArgumentParser(prog="greed", description="Catch the gems, avoid the rocks.")
+    parser.add_argument("--headless", type=int, metavar="TICKS",
+        help="run TICKS game ticks without a window or raylib and report ticks per second")
+    parser.add_argument("--video", choices=("raylib", "terminal"), default="raylib",
+        help="draw in a raylib window (default) or as text in this terminal")
+    parser.add_argument("--bot", metavar="POLICY",
+        help="let a bot play instead of the keyboard: idle, random or greedy (the terminal has "
+        "no keyboard input, so --video terminal defaults to the greedy bot)")
+    parser.add_argument("--capture", metavar="DIR",
+        help="save every frame drawn in the window to DIR as a numbered image sequence")
+    parser.add_argument("--capture-format", choices=CAPTURE_FORMATS, default="ppm",
+        help="image format for --capture: ppm (default), png or raw RGBA")
+    parser.add_argument("--artifacts", type=int, default=DEFAULT_ARTIFACTS,
+        help=f"number of falling artifacts (default {DEFAULT_ARTIFACTS})")
+    parser.add_argument("--catalog", metavar="PATH",
+        help="read the kinds of artifact from a JSON catalog, like data/artifacts.json "
+        "(default: gems and rocks)")
+    parser.add_argument("--world", metavar="PATH", nargs="?", const="",
+        help="climb through an endless world streamed in one screen at a time, generated from "
+        "--seed with --artifacts per screen, or read from a world file written by "
+        "game/casting/chunked_world.py")
+    parser.add_argument("--pool", action="store_true",
+        help="keep the artifacts in a NumPy-backed pool and update them all at once")
+    parser.add_argument("--coalesce", action="store_true",
+        help="draw only the top artifact of each grid cell; faster for huge casts, but artifacts "
+        "that would have shown around it are lost")
+    parser.add_argument("--lod", type=int, metavar="CELLS",
+        help="with --coalesce, draw columns with more than CELLS visible cells in blocks of rows, "
+        "keeping one artifact per block (default: draw every cell)")
+    parser.add_argument("--pipelined", action="store_true",
+        help="simulate each tick on a second thread while the last one is drawn")
+    parser.add_argument("--frame-rate", type=int, default=FRAME_RATE,
+        help=f"frames drawn per second; the game itself always updates {TICK_RATE} times a second")
+    parser.add_argument("--spawn-rate", metavar="SPEC", default="",
+        help="limit how many artifacts respawn per tick: N, ramp:START:END:TICKS or "
+        "burst:BASE:PEAK:PERIOD:LENGTH (default: no limit; ignored with --pool)")
+    parser.add_argument("--seed", type=int,
+        help="seed for the random numbers, from 0 to 2**64 - 1, to make the game repeatable")
+    parser.add_argument("--record", metavar="PATH",
+        help="record the input of every tick to PATH, for replaying later")
+    parser.add_argument("--replay", metavar="PATH",
+        help="replay a recording without a window and check it ends the same way")
+    parser.add_argument("--snapshot", metavar="PATH",
+        help="save the whole game state to PATH when the game ends")
+    parser.add_argument("--restore", metavar="PATH",
+        help="carry on from a game state saved with --snapshot (give the same --spawn-rate)")
+    parser.add_argument("--startup-report", action="store_true",
+        help="run the game with Python's -X importtime and report where startup time goes")
+    parser.add_argument("--profile", action="store_true",
+        help="time each phase of every frame and show the timings on screen")
+    parser.add_argument("--profile-out", metavar="PATH",
+        help="write the frame timings to PATH at exit (.json for JSON, otherwise CSV)")
+    args = parser.parse_args()
+    if args.seed is not None and not 0 <= args.seed < 2 ** 64:
+        parser.error("--seed must be from 0 to 2**64 - 1, so recordings can store it")
+    if args.record and args.restore:
+        parser.error("--record starts a game from its seed, so it cannot be used with --restore")
+    if args.world is not None and (args.pool or args.record or args.snapshot or args.restore):
+        parser.error("--world cannot be used with --pool, --record, --snapshot or --restore")
+    if args.pipelined and args.headless is not None:
+        parser.error("--headless never draws, so there is nothing to pipeline")
+    if args.lod is not None and not args.coalesce:
+        parser.error("--lod only applies with --coalesce")
+    if args.capture and args.video != "raylib":
+        parser.error("--capture needs --video raylib")
+    if args.bot is not None:
+        from game.services.bot_keyboard_service import POLICIES
+        if args.bot not in POLICIES:
+            parser.error(f"--bot must be one of {', '.join(POLICIES)}")
+    if args.spawn_rate:
+        from game.casting.respawn_scheduler import parse_curve
+        try:
+            parse_curve(args.spawn_rate)
+        except ValueError as error:
+            parser.error(str(error))
+    args.artifact_catalog = None
+    if args.catalog:
+        from game.casting.artifact_catalog import load_catalog
+        try:
+            args.artifact_catalog = load_catalog(args.catalog)
+        except (OSError, ValueError) as error:
+            parser.error(f"{args.catalog}: {error}")
+    args.world_source = None
+    if args.world:
+        from game.casting.chunked_world import MappedChunkSource
+        try:
+            args.world_source = MappedChunkSource(args.world, args.artifact_catalog)
+        except (OSError, ValueError) as error:
+            parser.error(f"{args.world}: {error}")
+    return args
 
 
 def main():
@@ -43,71 +138,181 @@ def main():
     The main function sets up the game parameters and then transfers
     control of the game to a Director instance.
     """
+    args = parse_args()
+
+    # measure startup by running this same command again under -X importtime
+    if args.startup_report:
+        from game.directing.startup_report import format_report, measure_startup
+        arguments = [argument for argument in sys.argv[1:] if argument != "--startup-report"]
+        returncode, elapsed, imports = measure_startup(os.path.abspath(__file__), arguments)
+        print("\n".join(format_report(elapsed, imports)))
+        sys.exit(returncode)
+
+    # replaying a recording needs nothing else
+    if args.replay:
+        from game.directing.replayer import replay
+        start = time.perf_counter()
+        recording, score, state_hash = replay(args.replay)
+        elapsed = time.perf_counter() - start
+        matched = score == recording.final_score and state_hash == recording.state_hash
+        print(f"replayed {len(recording.inputs)} ticks in {elapsed:.3f}s, score {score}, "
+            f"{'matches' if matched else 'DOES NOT MATCH'} the recording")
+        sys.exit(0 if matched else 1)
+
+    # one seeded generator builds the cast and drives the game, so a seed and the
+    # inputs are enough to play the same game again
+    seed = args.seed
+    if seed is None and args.record:
+        seed = random.getrandbits(64)
+    rng = None if seed is None else random.Random(seed)
+    spawn_curve = None
+    if args.spawn_rate:
+        from game.casting.respawn_scheduler import parse_curve
+        spawn_curve = parse_curve(args.spawn_rate)
     
-    # create the cast
-    cast = Cast()
-    
-    # create the banner
-    banner = Actor()
-    banner.set_text("")
-    banner.set_font_size(FONT_SIZE)
-    banner.set_color(WHITE)
-    banner.set_position(Point(CELL_SIZE, 0))
-    cast.add_actor("banners", banner)
-    
-    # create the robot at bottom of screen
-    x = int(MAX_X / 2)
-    y = int(MAX_Y - 15)
-    position = Point(x, y)
-
-    # instantiate robot as an Actor
-    robot = Actor()
-    robot.set_text(chr(164))
-    robot.set_font_size(FONT_SIZE)
-    robot.set_color(WHITE)
-    robot.set_position(position)
-    cast.add_actor("robots", robot)
-    
-    # create the artifacts randomly, either rock or gem
-    # loop through the default number of artifacts
-    for n in range(DEFAULT_ARTIFACTS):
-        
-        # if random number is 0, create a gem with a value of 1
-        if random.randint(0, 1) == 0:
-            text = chr(111)
-            message = "1"
-        
-        # otherwise, create a rock with a value of -1
-        else:
-            text = chr(42)
-            message = "-1"
-
-        # position artifact randomly on the screen
-        x = random.randint(1, COLS - 1)
-        y = random.randint(1, ROWS - 1)
-        position = Point(x, y)
-        position = position.scale(CELL_SIZE)
-
-        # assign a random color to the artifact
-        r = random.randint(0, 255)
-        g = random.randint(0, 255)
-        b = random.randint(0, 255)
-        color = Color(r, g, b)
-        
-        # create the artifact as an Artifact instance, child class of Actor
-        artifact = Artifact()
-        artifact.set_text(text)
-        artifact.set_font_size(FONT_SIZE)
-        artifact.set_color(color)
-        artifact.set_position(position)
-        artifact.set_message(message)
-        cast.add_actor("artifacts", artifact)
+    # create the cast of banner, robot and artifacts, or pick up a saved game
+    state = None
+    if args.restore:
+        from game.directing.snapshot import load_snapshot
+        cast, state = load_snapshot(args.restore)
+    elif args.world is not None:
+        cast = create_world_cast(args, seed)
+    else:
+        from game.casting.cast_factory import create_cast
+        cast = create_cast(args.artifacts, args.pool, rng, args.artifact_catalog)
     
-    # once all the cast has been created, start the game
-    keyboard_service = KeyboardService(CELL_SIZE)
-    video_service = VideoService(CAPTION, MAX_X, MAX_Y, CELL_SIZE, FRAME_RATE)
-    director = Director(keyboard_service, video_service)
-    director.start_game(cast)
+    # time each frame if asked to
+    profiler = None
+    if args.profile or args.profile_out:
+        from game.directing.frame_profiler import FrameProfiler
+        profiler = FrameProfiler(args.frame_rate)
+
+    # write down every tick's input if asked to
+    recording = None
+    if args.record:
+        from game.services.input_recording import Recording, RecordingKeyboardService
+        catalog = args.artifact_catalog.to_json() if args.artifact_catalog else ""
+        recording = Recording(seed, args.artifacts, args.pool, args.spawn_rate, catalog)
+
+    # the director runs the game however it is shown and played
+    from game.directing.director import Director
+
+    # in headless mode, run the ticks as fast as possible and report throughput
+    if args.headless is not None:
+        from game.services.null_keyboard_service import NullKeyboardService
+        from game.services.null_video_service import NullVideoService
+        keyboard_service = NullKeyboardService(CELL_SIZE)
+        if recording is not None:
+            keyboard_service = RecordingKeyboardService(keyboard_service, recording)
+        video_service = NullVideoService(MAX_X, MAX_Y, CELL_SIZE)
+        director = Director(keyboard_service, video_service, profiler, TICK_RATE, rng,
+            spawn_curve)
+        if state is not None:
+            director.set_state(state)
+        start = time.perf_counter()
+        try:
+            score = director.run_ticks(cast, args.headless)
+        finally:
+            if cast.get_world("artifacts") is not None:
+                cast.get_world("artifacts").close()
+        elapsed = time.perf_counter() - start
+        rate = args.headless / elapsed if elapsed > 0 else float("inf")
+        print(f"{args.headless} ticks in {elapsed:.3f}s ({rate:,.0f} ticks/s), score {score}")
+        if profiler is not None:
+            print("\n".join(profiler.get_summary_lines()))
+            if args.profile_out:
+                profiler.dump(args.profile_out)
+        save_recording(recording, director, cast, args.record)
+        if args.snapshot:
+            from game.directing.snapshot import save_snapshot
+            save_snapshot(args.snapshot, director, cast)
+        return
+
+    # pick where the game is drawn and who plays it; only pull in raylib when it is used
+    bot = args.bot
+    capture = None
+    if args.video == "terminal":
+        from game.services.terminal_video_service import TerminalVideoService
+        video_service = TerminalVideoService(MAX_X, MAX_Y, CELL_SIZE, args.frame_rate)
+        bot = bot or "greedy"
+    else:
+        from game.services.video_service import VideoService
+        if args.capture:
+            from game.services.frame_capture import FrameCapture
+            capture = FrameCapture(args.capture, args.capture_format)
+        video_service = VideoService(CAPTION, MAX_X, MAX_Y, CELL_SIZE, args.frame_rate, 
+            capture=capture)
+    if bot is not None:
+        from game.services.bot_keyboard_service import BotKeyboardService
+        keyboard_service = BotKeyboardService(cast, bot, seed, CELL_SIZE)
+    else:
+        from game.services.keyboard_service import KeyboardService
+        keyboard_service = KeyboardService(CELL_SIZE)
+    if recording is not None:
+        keyboard_service = RecordingKeyboardService(keyboard_service, recording)
+
+    # once all the cast has been created, start the game; the terminal version runs until
+    # Ctrl-C, which ends it like closing the window would
+    from game.shared.culling import Culler
+    culler = Culler(MAX_X, MAX_Y, CELL_SIZE, args.coalesce, args.lod)
+    director = Director(keyboard_service, video_service, profiler, TICK_RATE, rng, spawn_curve,
+        culler, args.pipelined)
+    if state is not None:
+        director.set_state(state)
+    try:
+        director.start_game(cast)
+    except KeyboardInterrupt:
+        pass
+
+    # write out the frames captured so far even if the game failed
+    finally:
+        if capture is not None:
+            capture.close()
+            print(capture.get_summary_line())
+    if args.profile_out:
+        profiler.dump(args.profile_out)
+    save_recording(recording, director, cast, args.record)
+    if args.snapshot:
+        from game.directing.snapshot import save_snapshot
+        save_snapshot(args.snapshot, director, cast)
+
+
+def create_world_cast(args, seed):
+    """
+    parameters: args - the parsed command line
+                seed - the game's seed, or None
+    return: the new Cast
+    The create_world_cast function builds the banner and robot as usual and
+    attaches a ChunkedWorld for the artifacts, read from the --world file or
+    generated from the seed.
+    """
+    from game.casting.cast_factory import create_cast
+    from game.casting.chunked_world import ChunkedWorld, GeneratedChunkSource
+    catalog = args.artifact_catalog
+    source = args.world_source
+    if source is None:
+        world_seed = random.getrandbits(32) if seed is None else seed
+        source = GeneratedChunkSource(world_seed, count=args.artifacts, catalog=catalog)
+    cast = create_cast(0, False, None, catalog)
+    cast.attach_world("artifacts", ChunkedWorld(source, catalog, CELL_SIZE, MAX_Y, FONT_SIZE))
+    return cast
+
+
+def save_recording(recording, director, cast, path):
+    """
+    parameters: recording - the Recording of the game, or None
+                director - the Director that ran the game
+                cast - the game's cast
+                path - the file to write
+    return: nothing
+    The save_recording function stores how the game ended in the recording
+    and writes it out, so a replay can check it ends the same way.
+    """
+    if recording is None:
+        return
+    recording.final_score = director.get_score()
+    recording.state_hash = director.get_state_hash(cast)
+    recording.save(path)
 
 # check to see if run directly or called, if direct then run main
 if __name__ == "__main__":
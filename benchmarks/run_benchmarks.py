@@ -0,0 +1,209 @@
+"""
+file: run_benchmarks.py
+author: Jerry Lane
+purpose: Measures how fast the core game classes run, without a window.
+Run it from the project root:
+
+    python3 -m benchmarks.run_benchmarks --output results.json
+    python3 -m benchmarks.run_benchmarks --baseline baseline.json
+
+Results are written as JSON. When a baseline file from an earlier run is
+given, every benchmark is compared against it and the run fails if any of
+them got slower by more than the allowed tolerance.
+
+Rates depend on the machine, so no baseline is kept in the repository. CI
+makes its own on each run: benchmark the target branch with --output, then
+the change with --baseline, on the same runner.
+"""
+# import needed modules
+import argparse
+import importlib.util
+import json
+import platform
+import random
+import sys
+import time
+
+from game.casting.actor import Actor
+from game.casting.cast import Cast
+from game.casting.cast_factory import create_cast, CELL_SIZE, MAX_X, MAX_Y
+from game.directing.director import Director
+from game.services.null_keyboard_service import NullKeyboardService
+from game.services.null_video_service import NullVideoService
+from game.shared.point import Point
+
+# artifact counts used for the cast and full-tick benchmarks
+DEFAULT_SIZES = [40, 1000, 10000, 100000, 1000000]
+
+# the largest cast the full-tick benchmark builds out of Artifact objects; larger sizes are only
+# run with the pool
+MAX_UNPOOLED = 100000
+
+
+def measure(function, min_time):
+    """
+    parameters: function - called with no arguments, does one operation
+                min_time - the least number of seconds to keep calling it
+    return: operations per second, from the fastest of three rounds
+    The measure function calls the function in growing batches until a
+    round takes at least min_time, then keeps the best of three rounds.
+    """
+    best = 0.0
+    batch = 1
+    for _ in range(3):
+        while True:
+            start = time.perf_counter()
+            for _ in range(batch):
+                function()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time / 3 or batch >= 1 << 24:
+                break
+            batch *= 2
+        best = max(best, batch / elapsed)
+    return best
+
+
+def point_benchmarks(min_time):
+    """
+    parameters: min_time - seconds per measurement
+    return: a dict of benchmark name to operations per second
+    The point_benchmarks function times Point arithmetic.
+    """
+    a = Point(3, 4)
+    b = Point(1, 2)
+    return {
+        "point.add": measure(lambda: a.add(b), min_time),
+        "point.scale": measure(lambda: a.scale(15), min_time),
+        "point.iadd": measure(lambda: a.iadd(b), min_time),
+        "point.move_in_place": measure(lambda: a.move_in_place(1, 1, MAX_X, MAX_Y), min_time),
+    }
+
+
+def actor_benchmarks(min_time):
+    """
+    parameters: min_time - seconds per measurement
+    return: a dict of benchmark name to operations per second
+    The actor_benchmarks function times moving a single actor.
+    """
+    actor = Actor()
+    actor.set_velocity(Point(CELL_SIZE, 3))
+    return {"actor.move_next": measure(lambda: actor.move_next(MAX_X, MAX_Y), min_time)}
+
+
+def cast_benchmarks(sizes, min_time):
+    """
+    parameters: sizes - the artifact counts to try
+                min_time - seconds per measurement
+    return: a dict of benchmark name to operations per second
+    The cast_benchmarks function times reading actors out of a Cast.
+    """
+    results = {}
+    for size in sizes:
+        cast = Cast()
+        for _ in range(size):
+            cast.add_actor("artifacts", Actor())
+        cast.add_actor("robots", Actor())
+        results[f"cast.get_actors[{size}]"] = measure(lambda: cast.get_actors("artifacts"), min_time)
+        results[f"cast.get_all_actors[{size}]"] = measure(cast.get_all_actors, min_time)
+    return results
+
+
+def director_benchmarks(sizes, min_time, pooled):
+    """
+    parameters: sizes - the artifact counts to try
+                min_time - seconds per measurement
+                pooled - whether to use the NumPy-backed ArtifactPool
+    return: a dict of benchmark name to ticks per second
+    The director_benchmarks function times full game ticks (inputs and
+    updates) against the null video and keyboard services.
+    """
+    results = {}
+    name = "director.tick.pooled" if pooled else "director.tick"
+    for size in sizes:
+        random.seed(size)
+        cast = create_cast(size, pooled)
+        keyboard_service = NullKeyboardService(CELL_SIZE, dx = 1)
+        video_service = NullVideoService(MAX_X, MAX_Y, CELL_SIZE)
+        director = Director(keyboard_service, video_service)
+        results[f"{name}[{size}]"] = measure(lambda: director.run_ticks(cast, 1), min_time)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    parameters: results - this run's benchmark results
+                baseline - an earlier run's benchmark results
+                tolerance - the allowed slowdown, as a fraction
+    return: a list of (name, current, baseline, ratio) for every regression
+    The compare function prints each benchmark next to its baseline and
+    collects the ones that slowed down by more than the tolerance.
+    """
+    regressions = []
+    for name, rate in results.items():
+        if name not in baseline:
+            print(f"{name:40} {rate:>14,.0f}/s  (new)")
+            continue
+        ratio = rate / baseline[name]
+        flag = ""
+        if ratio < 1 - tolerance:
+            flag = "  REGRESSION"
+            regressions.append((name, rate, baseline[name], ratio))
+        print(f"{name:40} {rate:>14,.0f}/s  {ratio:6.2f}x baseline{flag}")
+    return regressions
+
+
+def main():
+    """
+    parameters: none
+    return: the process exit code
+    The main function runs the benchmarks and writes and compares results.
+    """
+    parser = argparse.ArgumentParser(description="Greed benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+        help="artifact counts for the cast and director benchmarks")
+    parser.add_argument("--min-time", type=float, default=0.5,
+        help="seconds to spend on each measurement (default 0.5)")
+    parser.add_argument("--max-unpooled", type=int, default=MAX_UNPOOLED, metavar="N",
+        help="largest size to run full ticks for without the pool, which builds one Artifact "
+        f"per artifact (default {MAX_UNPOOLED})")
+    parser.add_argument("--output", metavar="PATH", help="write the results to PATH as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against results in PATH")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+        help="allowed slowdown against the baseline, as a fraction (default 0.10)")
+    args = parser.parse_args()
+
+    results = {}
+    results.update(point_benchmarks(args.min_time))
+    results.update(actor_benchmarks(args.min_time))
+    results.update(cast_benchmarks(args.sizes, args.min_time))
+    unpooled = [size for size in args.sizes if size <= args.max_unpooled]
+    results.update(director_benchmarks(unpooled, args.min_time, False))
+
+    # the pooled benchmarks need numpy, which is optional
+    if importlib.util.find_spec("numpy") is None:
+        print("numpy is not installed; skipping pooled benchmarks", file=sys.stderr)
+    else:
+        results.update(director_benchmarks(args.sizes, args.min_time, True))
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        return 1 if regressions else 0
+
+    for name, rate in results.items():
+        print(f"{name:40} {rate:>14,.0f}/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,20 +16,26 @@ class Actor:
 
     Attributes:
         _text (string): The text to display
+        _text_revision (int): Counts changes to the text, so drawn text can be cached.
         _font_size (int): The font size to use.
         _color (Color): The color of the text.
         _position (Point): The screen coordinates.
+        _previous_position (Point): The screen coordinates before the last move.
         _velocity (Point): The speed and direction.
+        _spatial_index (ColumnIndex): The index told about column changes, if any.
     """
 
     # default contructor
     def __init__(self):
         """Constructs a new Actor."""
         self._text = ""
+        self._text_revision = 0
         self._font_size = 15
         self._color = Color(255, 255, 255)
         self._position = Point(0, 0)
+        self._previous_position = Point(0, 0)
         self._velocity = Point(0, 1)
+        self._spatial_index = None
 
     def get_color(self):
         """Gets the actor's color as a tuple of three ints (r, g, b).
@@ -55,6 +61,30 @@ class Actor:
         """
         return self._position
     
+    def get_interpolated_position(self, alpha):
+        """Gets a point part way between the actor's previous and current positions, for drawing 
+        between game ticks. Jumps, like wrapping across the screen, are not smoothed.
+        
+        Args:
+            alpha (float): How far along to go, from 0 (previous) to 1 (current).
+
+        Returns:
+            Tuple(float, float): The x and y coordinates.
+        """
+        previous = self._previous_position
+        current = self._position
+        x = previous.get_x() + (current.get_x() - previous.get_x()) * alpha
+        y = previous.get_y() + (current.get_y() - previous.get_y()) * alpha
+        return (x, y)
+
+    def get_previous_position(self):
+        """Gets the actor's position before its last move.
+        
+        Returns:
+            Point: The actor's previous position.
+        """
+        return self._previous_position
+
     def get_text(self):
         """Gets the actor's textual representation.
         
@@ -63,6 +93,15 @@ class Actor:
         """
         return self._text
 
+    def get_text_revision(self):
+        """Gets a number that changes whenever the actor's text changes, so anything made from 
+        the text can be kept until it does.
+        
+        Returns:
+            int: The text revision.
+        """
+        return self._text_revision
+
     def get_velocity(self):
         """Gets the actor's speed and direction.
         
@@ -79,9 +118,21 @@ class Actor:
             max_x (int): The maximum x value.
             max_y (int): The maximum y value.
         """
-        x = (self._position.get_x() + self._velocity.get_x()) % max_x
-        y = (self._position.get_y() + self._velocity.get_y()) % max_y
-        self._position = Point(x, y)
+        position = self._position
+        old_x = position.get_x()
+        old_y = position.get_y()
+        velocity = self._velocity
+        position.move_in_place(velocity.get_x(), velocity.get_y(), max_x, max_y)
+        x = position.get_x()
+        y = position.get_y()
+
+        # remember where the actor was, unless it wrapped, so drawing doesn't sweep across the screen
+        if x == old_x + velocity.get_x() and y == old_y + velocity.get_y():
+            self._previous_position.set(old_x, old_y)
+        else:
+            self._previous_position.set(x, y)
+        if self._spatial_index is not None and x != old_x:
+            self._spatial_index.move(self, old_x, x)
 
     def set_color(self, color):
         """Updates the color to the given one.
@@ -92,12 +143,27 @@ class Actor:
         self._color = color
 
     def set_position(self, position):
-        """Updates the position to the given one.
+        """Updates the position to the given one. The values are copied, so the actor never 
+        shares its Point with the caller and can move it in place. The actor jumps straight 
+        there, without being drawn in between.
+        
+        Args:
+            position (Point): The given position.
+        """
+        old_x = self._position.get_x()
+        self._position.set(position.get_x(), position.get_y())
+        self._previous_position.set(position.get_x(), position.get_y())
+        if self._spatial_index is not None and position.get_x() != old_x:
+            self._spatial_index.move(self, old_x, position.get_x())
+    
+    def set_previous_position(self, position):
+        """Updates the position the actor is drawn moving from. Call it after set_position, 
+        which resets it. The values are copied.
         
         Args:
             position (Point): The given position.
         """
-        self._position = position
+        self._previous_position.set(position.get_x(), position.get_y())
     
     def set_font_size(self, font_size):
         """Updates the font size to the given one.
@@ -107,18 +173,28 @@ class Actor:
         """
         self._font_size = font_size
     
+    def set_spatial_index(self, spatial_index):
+        """Sets the index to tell whenever the actor changes column.
+        
+        Args:
+            spatial_index (ColumnIndex): The index, or None to stop reporting.
+        """
+        self._spatial_index = spatial_index
+    
     def set_text(self, text):
         """Updates the text to the given value.
         
         Args:
             text (string): The given value.
         """
-        self._text = text
+        if text != self._text:
+            self._text = text
+            self._text_revision += 1
 
     def set_velocity(self, velocity):
-        """Updates the velocity to the given one.
+        """Updates the velocity to the given one. The values are copied, like set_position.
         
         Args:
             velocity (Point): The given velocity.
         """
-        self._velocity = velocity
\ No newline at end of file
+        self._velocity.set(velocity.get_x(), velocity.get_y())
\ No newline at end of file
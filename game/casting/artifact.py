@@ -6,9 +6,7 @@ also an artifact. It holds a single variable as its member - message.
 """
 # since an Artifact inherits from Actor, import Actor
 from game.casting.actor import Actor 
-from game.shared.point import Point
 
-# TODO: Implement the Artifact class here. Don't forget to inherit from Actor!
 class Artifact(Actor):
     """
     Parameters: none
@@ -31,6 +29,9 @@ class Artifact(Actor):
         # initialize an empty message
         self._message = ""
 
+        # the index of the artifact's kind in the game's ArtifactCatalog
+        self._type_id = 0
+
     # set_message method to set description of the artifact instantiation
     def set_message(self, message):
         """
@@ -51,4 +52,23 @@ class Artifact(Actor):
         text.
         """
         # return the _message variable's descriptive text
-        return self._message
\ No newline at end of file
+        return self._message
+
+    # get_type_id method returns the index of the artifact's kind
+    def get_type_id(self):
+        """
+        Parameter: none
+        Return: _type_id - the index of the artifact's kind in the ArtifactCatalog
+        The get_type_id method returns the artifact's kind, used to look up its
+        score value and speed in the catalog's tables.
+        """
+        return self._type_id
+
+    # set_type_id method sets the index of the artifact's kind
+    def set_type_id(self, type_id):
+        """
+        Parameters: type_id - the index of the artifact's kind in the ArtifactCatalog
+        Return: nothing
+        The set_type_id method sets the artifact's kind.
+        """
+        self._type_id = type_id
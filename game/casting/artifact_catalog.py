@@ -0,0 +1,248 @@
+"""
+file: artifact_catalog.py
+author: Jerry Lane
+purpose: The ArtifactCatalog class holds the kinds of artifact a game can
+have: their glyph, score value, how often they appear, their color and how
+fast they fall. Catalogs are read from a JSON file, so new mixes of
+artifacts need no code changes. Each kind is set up once, and artifacts
+only carry the index of their kind (the type id), so scoring, drawing and
+speed changes look things up in tables built ahead of time.
+
+File format:
+    {"artifacts": [
+        {"name": "gem", "glyph": "o", "value": 1, "weight": 3,
+         "color": [0, 255, 0], "speed": 1.5},
+        ...
+    ]}
+name and glyph are required; value defaults to 0, weight to 1 and speed to
+1. Without a color, each artifact of the kind gets a random one. Any speed
+over 0 is accepted, but however fast a kind is, it never falls more than
+MAX_VELOCITY (one cell) per tick, so it can't skip over the robot's row or
+the bottom of the screen. Speeds above 1 are clamped to that once the game
+velocity is high enough, so fast kinds end up falling alike.
+"""
+# import needed modules
+from bisect import bisect_right
+
+from game.shared.color import Color
+from game.shared.point import Point
+
+# the most an artifact may fall in one tick: one cell
+MAX_VELOCITY = 15
+
+
+# class declaration
+class ArtifactType:
+    """One kind of artifact.
+
+    Attributes:
+        type_id (int): The kind's index in its catalog.
+        name (string): A name for the kind, for people.
+        glyph (string): The single character the artifact is drawn as.
+        value (int): The change in score when the robot catches one.
+        weight (int): How often the kind appears, relative to the other kinds.
+        color (Color): The color every artifact of the kind has, or None for random colors.
+        speed (float): How many times faster than the game velocity the kind falls.
+    """
+    __slots__ = ("type_id", "name", "glyph", "value", "weight", "color", "speed")
+
+    # default constructor
+    def __init__(self, type_id, name, glyph, value = 0, weight = 1, color = None, speed = 1):
+        """Constructs a new ArtifactType.
+
+        Args:
+            type_id (int): The kind's index in its catalog.
+            name (string): A name for the kind.
+            glyph (string): The single character the artifact is drawn as.
+            value (int): The change in score when the robot catches one.
+            weight (int): How often the kind appears, relative to the other kinds.
+            color (Color): The color of every artifact of the kind, or None for random colors.
+            speed (float): How many times faster than the game velocity the kind falls.
+        """
+        self.type_id = type_id
+        self.name = name
+        self.glyph = glyph
+        self.value = value
+        self.weight = weight
+        self.color = color
+
+        # always a float, so a catalog writes the same JSON however it was built
+        self.speed = float(speed)
+
+
+# class declaration
+class ArtifactCatalog:
+    """The kinds of artifact in a game.
+
+    The responsibility of an ArtifactCatalog is to hold the artifact kinds and the tables built 
+    from them: score values, glyphs and colors by type id, the running total of the weights for 
+    picking a kind, and each kind's velocity at each game velocity.
+
+    Attributes:
+        _types (tuple): The ArtifactTypes, in type id order.
+        _values (list): The score value of each type id.
+        _cumulative (list): The running total of the weights, for picking kinds.
+        _velocities (dict): Each kind's velocity, by game velocity { key: vy, value: tuple of Points }
+    """
+
+    # default constructor
+    def __init__(self, types):
+        """Constructs a new ArtifactCatalog.
+
+        Args:
+            types (list): The ArtifactTypes; their type ids must be 0, 1, 2 and so on.
+        """
+        if not types:
+            raise ValueError("an artifact catalog needs at least one kind of artifact")
+        self._types = tuple(types)
+        self._values = [kind.value for kind in self._types]
+        self._cumulative = []
+        total = 0
+        for kind in self._types:
+            total += kind.weight
+            self._cumulative.append(total)
+        self._velocities = {}
+
+    def __len__(self):
+        """Gets the number of kinds in the catalog.
+
+        Returns:
+            int: The number of kinds.
+        """
+        return len(self._types)
+
+    def get_type(self, type_id):
+        """Gets one kind of artifact.
+
+        Args:
+            type_id (int): The kind's type id.
+
+        Returns:
+            ArtifactType: The kind.
+        """
+        return self._types[type_id]
+
+    def get_types(self):
+        """Gets every kind of artifact.
+
+        Returns:
+            tuple: The ArtifactTypes, in type id order.
+        """
+        return self._types
+
+    def get_values(self):
+        """Gets the score value of every kind, for looking up by type id.
+
+        Returns:
+            list: The score values, in type id order.
+        """
+        return self._values
+
+    # get every kind's velocity at a game velocity
+    def get_velocities(self, vy):
+        """Gets the velocity of every kind at the given game velocity: vy times the kind's 
+        speed, rounded to the nearest whole number (halves to even), and never less than 1 or
+        more than MAX_VELOCITY.
+        Built once per game velocity; the Points are shared, so copy them rather than change 
+        them.
+
+        Args:
+            vy (int): The game velocity.
+
+        Returns:
+            tuple: One Point per kind, in type id order.
+        """
+        velocities = self._velocities.get(vy)
+        if velocities is None:
+            velocities = tuple(Point(0, min(MAX_VELOCITY, max(1, round(vy * kind.speed))))
+                for kind in self._types)
+            self._velocities[vy] = velocities
+        return velocities
+
+    # pick a kind at random
+    def pick(self, rng):
+        """Picks a kind at random, in proportion to the weights. It draws one 
+        rng.randint(0, total weight - 1), so two kinds of weight 1 are picked exactly as 
+        rng.randint(0, 1) would.
+
+        Args:
+            rng (Random): The random.Random (or random module) to draw from.
+
+        Returns:
+            int: The type id of the kind.
+        """
+        cumulative = self._cumulative
+        return bisect_right(cumulative, rng.randint(0, cumulative[-1] - 1))
+
+    # write the catalog in the file format
+    def to_json(self):
+        """Gets the catalog in the file format, so it can be stored with a recording or a 
+        snapshot.
+
+        Returns:
+            string: The catalog as JSON.
+        """
+        import json
+        entries = []
+        for kind in self._types:
+            entry = {"name": kind.name, "glyph": kind.glyph, "value": kind.value,
+                "weight": kind.weight, "speed": kind.speed}
+            if kind.color is not None:
+                entry["color"] = list(kind.color.to_tuple())
+            entries.append(entry)
+        return json.dumps({"artifacts": entries})
+
+
+def parse_catalog(text):
+    """
+    parameters: text - a catalog in the file format
+    return: the ArtifactCatalog
+    The parse_catalog function reads a catalog, raising ValueError with a
+    message saying what is wrong if it is not valid.
+    """
+    import json
+    try:
+        entries = json.loads(text)["artifacts"]
+    except (ValueError, KeyError, TypeError) as error:
+        raise ValueError(f"not an artifact catalog: {error}") from None
+    if not isinstance(entries, list):
+        raise ValueError("not an artifact catalog: artifacts must be a list")
+    types = []
+    for type_id, entry in enumerate(entries):
+        try:
+            name = str(entry["name"])
+            glyph = entry["glyph"]
+            value = int(entry.get("value", 0))
+            weight = int(entry.get("weight", 1))
+            speed = float(entry.get("speed", 1))
+            color = entry.get("color")
+            if color is not None:
+                color = Color(*(int(channel) for channel in color))
+        except (KeyError, TypeError, ValueError) as error:
+            raise ValueError(f"artifact {type_id} in the catalog is not valid: {error}") from None
+        if not isinstance(glyph, str) or len(glyph) != 1:
+            raise ValueError(f"artifact {name!r} needs a glyph of exactly one character")
+        if weight < 0 or speed <= 0:
+            raise ValueError(f"artifact {name!r} needs a weight of 0 or more and a speed over 0")
+        types.append(ArtifactType(type_id, name, glyph, value, weight, color, speed))
+    if not types or sum(kind.weight for kind in types) == 0:
+        raise ValueError("an artifact catalog needs at least one kind with a weight over 0")
+    return ArtifactCatalog(types)
+
+
+def load_catalog(path):
+    """
+    parameters: path - the catalog file
+    return: the ArtifactCatalog
+    The load_catalog function reads a catalog file; see parse_catalog.
+    """
+    with open(path) as file:
+        return parse_catalog(file.read())
+
+
+# the game's original mix: as many gems, worth a point, as rocks, which cost one, all colored at
+# random and falling at the game velocity
+DEFAULT_CATALOG = ArtifactCatalog([
+    ArtifactType(0, "gem", chr(111), 1),
+    ArtifactType(1, "rock", chr(42), -1),
+])
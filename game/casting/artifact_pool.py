@@ -0,0 +1,700 @@
+"""
+file: artifact_pool.py
+author: Jerry Lane
+purpose: The ArtifactPool class keeps every falling artifact in a set of
+NumPy columns so a whole tick of movement, catching and respawning can be
+done in a handful of array operations. PooledArtifact objects are thin
+views over one row of the pool, so the Cast, Director and VideoService can
+keep treating them as ordinary Artifacts.
+"""
+# numpy is only needed when the pool is used
+import numpy
+
+from game.casting.artifact import Artifact
+from game.casting.artifact_catalog import MAX_VELOCITY
+from game.shared.collision import swept_catch
+from game.shared.color import Color
+from game.shared.culling import LOD_ROWS
+from game.shared.point import Point
+
+# move, catch and respawn artifacts held in arrays
+def fall(x, y, previous_y, vy, robot_previous_x, robot_x, robot_y, max_y, cell_size, cols, rng):
+    """
+    parameters: x, y - the artifact positions, updated in place
+                previous_y - receives the positions before the move, for drawing
+                vy - the vertical velocities
+                robot_previous_x - the robot's x before it moved
+                robot_x, robot_y - the robot's position after it has moved
+                max_y - the height of the screen
+                cell_size - the size of a cell in the display grid
+                cols - the number of columns in the display grid
+                rng - the numpy Generator for respawn columns
+    return: a boolean array, True for each artifact the robot caught
+    The fall function applies the rules of Director._do_updates to every
+    artifact at once. The arrays can be one game's artifacts or a 2d block
+    with one row per game, as long as vy, robot_x and robot_y broadcast
+    against them. Catching uses collision.swept_catch.
+    """
+    # artifacts only fall, so only y needs to move and wrap
+    previous_y[...] = y
+    y += vy
+    wrapped = y >= max_y
+    numpy.remainder(y, max_y, out=y)
+    previous_y[wrapped] = y[wrapped]
+
+    # caught: crossed the robot's row during this tick with the robot under it
+    caught = swept_catch(x, y, vy, robot_previous_x, robot_x, robot_y, cell_size)
+
+    # respawn caught artifacts and those at the bottom in a new column at the top
+    respawn = caught | (y >= max_y - cell_size)
+    count = int(numpy.count_nonzero(respawn))
+    if count:
+        x[respawn] = rng.integers(1, cols, size=count, dtype=x.dtype) * cell_size
+        y[respawn] = 0
+        previous_y[respawn] = 0
+    return caught
+
+
+# pick the artifacts worth drawing, over arrays
+def visible_rows(x, y, previous_y, alpha, camera_y, width, height, cell_size, coalesce = False,
+        lod_threshold = None):
+    """
+    parameters: x, y, previous_y - NumPy arrays of the artifacts' positions
+                alpha - how far between the last two ticks they are drawn
+                camera_y - the world y at the top of the view
+                width, height - the size of the view
+                cell_size - the size of a cell in the display grid
+                coalesce - whether to keep one artifact per cell
+                lod_threshold - how many visible cells a column may have before it
+                                is coalesced over blocks of LOD_ROWS rows, or None
+    return: (the rows to draw in increasing order, the number culled)
+    The visible_rows function applies Culler.cull's rules to arrays: rows
+    outside the view are dropped, and when coalescing, of the rows that
+    share a cell (or a block of a crowded column) only the last is kept,
+    since it is drawn on top of the others.
+    """
+    screen_y = previous_y + (y - previous_y) * alpha - camera_y
+    inside = (x > -cell_size) & (x < width) & (screen_y > -cell_size) & (screen_y < height)
+    rows = numpy.flatnonzero(inside)
+    culled = len(x) - len(rows)
+    if not coalesce or len(rows) == 0:
+        return rows, culled
+
+    # one key per cell, counting columns and rows from the ones just off the view's edges
+    columns = (x[rows] // cell_size).astype(numpy.int64) + 1
+    cell_rows = numpy.floor_divide(screen_y[rows], cell_size).astype(numpy.int64) + 1
+    span = height // cell_size + 2
+    keys = columns * span + cell_rows
+    picks = _last_of_each(keys)
+
+    # key the cells of crowded columns by their block of rows instead, past the cell keys
+    if lod_threshold is not None:
+        crowded = numpy.bincount(columns[picks])[columns[picks]] > lod_threshold
+        blocks = columns[picks] * span + (cell_rows[picks] - 1) // LOD_ROWS + 1
+        keys = numpy.where(crowded, blocks + (columns.max() + 1) * span, keys[picks])
+        picks = picks[_last_of_each(keys)]
+    return rows[picks], culled
+
+
+def _last_of_each(keys):
+    """
+    parameters: keys - an array of keys
+    return: the indexes of the last occurrence of each key, in increasing order
+    """
+    _, first_from_end = numpy.unique(keys[::-1], return_index=True)
+    return numpy.sort(len(keys) - 1 - first_from_end)
+
+
+# class declaration
+class ArtifactPool:
+    """A structure-of-arrays store for falling artifacts.
+
+    The responsibility of an ArtifactPool is to hold the state of many artifacts in parallel
+    arrays and to advance all of them at once.
+
+    Attributes:
+        _x (ndarray): The horizontal positions.
+        _y (ndarray): The vertical positions.
+        _previous_y (ndarray): The vertical positions before the last step, for drawing.
+        _vy (ndarray): The vertical velocities.
+        _value (ndarray): The score value of each artifact.
+        _color (ndarray): The (r, g, b, a) color of each artifact.
+        _colors (list): A Color for each row, made the first time it is asked for, or None.
+        _text (ndarray): The code point of each artifact's glyph.
+        _type (ndarray): The type id of each artifact's kind.
+        _speeds (ndarray): Each kind's speed multiplier, by type id, or None if every kind falls 
+            at the game velocity.
+        _font_size (int): The font size shared by every artifact.
+        _size (int): The number of rows in use.
+        _rng (Generator): The random generator used for respawn columns.
+    """
+
+    # default constructor
+    def __init__(self, capacity, font_size = 15, seed = None, catalog = None):
+        """Constructs a new, empty ArtifactPool.
+
+        Args:
+            capacity (int): The maximum number of artifacts the pool can hold.
+            font_size (int): The font size shared by every artifact.
+            seed (int): An optional seed for the respawn generator.
+            catalog (ArtifactCatalog): The kinds the type ids refer to, for their speeds.
+        """
+        self._x = numpy.zeros(capacity, dtype=numpy.int32)
+        self._y = numpy.zeros(capacity, dtype=numpy.int32)
+        self._previous_y = numpy.zeros(capacity, dtype=numpy.int32)
+        self._vy = numpy.ones(capacity, dtype=numpy.int32)
+        self._value = numpy.zeros(capacity, dtype=numpy.int32)
+        self._color = numpy.full((capacity, 4), 255, dtype=numpy.uint8)
+        self._colors = [None] * capacity
+        self._text = numpy.zeros(capacity, dtype=numpy.uint32)
+        self._type = numpy.zeros(capacity, dtype=numpy.uint16)
+        self._speeds = None
+        if catalog is not None and any(kind.speed != 1 for kind in catalog.get_types()):
+            self._speeds = numpy.array([kind.speed for kind in catalog.get_types()])
+        self._font_size = font_size
+        self._size = 0
+        self._rng = numpy.random.default_rng(seed)
+
+    def __len__(self):
+        """Gets the number of artifacts in the pool.
+
+        Returns:
+            int: The number of artifacts in the pool.
+        """
+        return self._size
+
+    # add a new row and return its index
+    def add(self, text, value, position, color, velocity = 1, type_id = 0):
+        """Adds an artifact to the pool.
+
+        Args:
+            text (string): The single character glyph to display.
+            value (int): The score value when the artifact is caught.
+            position (Point): The starting position.
+            color (Color): The artifact's color.
+            velocity (int): The starting vertical velocity.
+            type_id (int): The artifact's kind in the catalog.
+
+        Returns:
+            int: The index of the new artifact.
+        """
+        if self._size == len(self._x):
+            raise IndexError("artifact pool is full")
+        index = self._size
+        self._x[index] = position.get_x()
+        self._y[index] = position.get_y()
+        self._previous_y[index] = position.get_y()
+        self._vy[index] = velocity
+        self._value[index] = value
+        self._color[index] = color.to_tuple()
+        self._colors[index] = None
+        self._text[index] = ord(text)
+        self._type[index] = type_id
+        self._size += 1
+        return index
+
+    # get the color of one row
+    def get_color(self, index):
+        """Gets the color of one artifact. The Color is made once and kept until the row's color 
+        changes, so drawing doesn't make a new one every frame.
+
+        Args:
+            index (int): The row.
+
+        Returns:
+            Color: The artifact's color.
+        """
+        color = self._colors[index]
+        if color is None:
+            color = Color(*self._color[index].tolist())
+            self._colors[index] = color
+        return color
+
+    # set the color of one row
+    def set_color(self, index, color):
+        """Sets the color of one artifact.
+
+        Args:
+            index (int): The row.
+            color (Color): The new color.
+        """
+        self._color[index] = color.to_tuple()
+        self._colors[index] = color
+
+    # get the position of one row
+    def get_position(self, index):
+        """Gets the position of one artifact.
+
+        Args:
+            index (int): The row.
+
+        Returns:
+            Point: A new Point at the artifact's position.
+        """
+        return Point(int(self._x[index]), int(self._y[index]))
+
+    # set the position of one row
+    def set_position(self, index, position):
+        """Moves one artifact without a trail: its previous position becomes the new one too.
+
+        Args:
+            index (int): The row.
+            position (Point): The new position.
+        """
+        self._x[index] = position.get_x()
+        self._y[index] = position.get_y()
+        self._previous_y[index] = position.get_y()
+
+    # get the position of one row before its last move
+    def get_previous_position(self, index):
+        """Gets the position of one artifact before its last move.
+
+        Args:
+            index (int): The row.
+
+        Returns:
+            Point: A new Point at the artifact's previous position.
+        """
+        return Point(int(self._x[index]), int(self._previous_y[index]))
+
+    # set the y of one row before its last move
+    def set_previous_y(self, index, y):
+        """Sets the y of one artifact before its last move; artifacts only move down, so there is 
+        no previous x.
+
+        Args:
+            index (int): The row.
+            y (int): The previous y.
+        """
+        self._previous_y[index] = y
+
+    # get a position part way through the last move of one row
+    def get_interpolated_position(self, index, alpha):
+        """Gets a point part way between one artifact's previous and current positions.
+
+        Args:
+            index (int): The row.
+            alpha (float): How far along to go, from 0 (previous) to 1 (current).
+
+        Returns:
+            Tuple(float, float): The x and y coordinates.
+        """
+        previous = int(self._previous_y[index])
+        return (int(self._x[index]), previous + (int(self._y[index]) - previous) * alpha)
+
+    # get the vertical velocity of one row
+    def get_vy(self, index):
+        """Gets the vertical velocity of one artifact.
+
+        Args:
+            index (int): The row.
+
+        Returns:
+            int: The velocity.
+        """
+        return int(self._vy[index])
+
+    # set the vertical velocity of one row
+    def set_vy(self, index, vy):
+        """Sets the vertical velocity of one artifact.
+
+        Args:
+            index (int): The row.
+            vy (int): The new velocity.
+        """
+        self._vy[index] = vy
+
+    # get the score value of one row
+    def get_value(self, index):
+        """Gets the score value of one artifact.
+
+        Args:
+            index (int): The row.
+
+        Returns:
+            int: The score value.
+        """
+        return int(self._value[index])
+
+    # set the score value of one row
+    def set_value(self, index, value):
+        """Sets the score value of one artifact.
+
+        Args:
+            index (int): The row.
+            value (int): The new score value.
+        """
+        self._value[index] = value
+
+    # get the glyph of one row
+    def get_text(self, index):
+        """Gets the glyph of one artifact.
+
+        Args:
+            index (int): The row.
+
+        Returns:
+            string: The single character glyph.
+        """
+        return chr(self._text[index])
+
+    # set the glyph of one row
+    def set_text(self, index, text):
+        """Sets the glyph of one artifact.
+
+        Args:
+            index (int): The row.
+            text (string): The new single character glyph.
+        """
+        self._text[index] = ord(text)
+
+    # get the kind of one row
+    def get_type_id(self, index):
+        """Gets the index of one artifact's kind in the catalog.
+
+        Args:
+            index (int): The row.
+
+        Returns:
+            int: The type id.
+        """
+        return int(self._type[index])
+
+    # set the kind of one row
+    def set_type_id(self, index, type_id):
+        """Sets the index of one artifact's kind in the catalog.
+
+        Args:
+            index (int): The row.
+            type_id (int): The new type id.
+        """
+        self._type[index] = type_id
+
+    # move one row
+    def move_row(self, index, max_y):
+        """Moves one artifact down by its velocity, wrapping at the bottom like Actor.move_next.
+
+        Args:
+            index (int): The row.
+            max_y (int): The maximum y value.
+        """
+        vy = int(self._vy[index])
+        y = int(self._y[index]) + vy
+        self._y[index] = y % max_y
+        self._previous_y[index] = y - vy if y < max_y else y % max_y
+
+    def get_capacity(self):
+        """Gets the maximum number of artifacts the pool can hold.
+
+        Returns:
+            int: The capacity.
+        """
+        return len(self._x)
+
+    def get_font_size(self):
+        """Gets the font size shared by every artifact.
+
+        Returns:
+            int: The font size.
+        """
+        return self._font_size
+
+    # set every artifact's velocity from the game velocity
+    def set_velocity(self, vy):
+        """Sets the vertical velocity of every artifact to the game velocity times its kind's 
+        speed, rounded as ArtifactCatalog.get_velocities does.
+
+        Args:
+            vy (int): The new game velocity.
+        """
+        n = self._size
+        if self._speeds is None:
+            self._vy[:n] = vy
+        else:
+            velocities = numpy.clip(numpy.rint(vy * self._speeds), 1, MAX_VELOCITY)
+            velocities = velocities.astype(numpy.int32)
+            self._vy[:n] = velocities[self._type[:n]]
+
+    # advance the whole pool by one tick
+    def step(self, robot_position, max_x, max_y, cell_size, cols, robot_previous_position = None):
+        """Moves every artifact, scores the ones the robot catches and respawns the caught ones
+        and the ones that reached the bottom of the screen at a random column at the top. Uses
+        the same rules as Director._do_updates.
+
+        Args:
+            robot_position (Point): The robot's position after it has moved.
+            max_x (int): The maximum x value.
+            max_y (int): The maximum y value.
+            cell_size (int): The size of a cell in the display grid.
+            cols (int): The number of columns in the display grid.
+            robot_previous_position (Point): The robot's position before it moved, or None if 
+                it did not move.
+
+        Returns:
+            int: The change in score.
+        """
+        n = self._size
+        robot_x = robot_position.get_x()
+        robot_y = robot_position.get_y()
+        robot_previous_x = robot_x
+        if robot_previous_position is not None:
+            robot_previous_x = robot_previous_position.get_x()
+        caught = fall(self._x[:n], self._y[:n], self._previous_y[:n], self._vy[:n],
+            robot_previous_x, robot_x, robot_y, max_y, cell_size, cols, self._rng)
+        return int(self._value[:n][caught].sum())
+
+    # get the rows in use and the generator state
+    def get_state(self):
+        """Gets the pool's contents, for a snapshot.
+
+        Returns:
+            tuple: (columns, rng state): the x, y, previous y, vertical velocity, value, color, 
+                glyph and type id arrays cut to the rows in use (views, not copies), and the 
+                respawn generator's bit_generator.state.
+        """
+        n = self._size
+        columns = (self._x[:n], self._y[:n], self._previous_y[:n], self._vy[:n],
+            self._value[:n], self._color[:n], self._text[:n], self._type[:n])
+        return columns, self._rng.bit_generator.state
+
+    # replace the rows and the generator state
+    def set_state(self, columns, rng_state):
+        """Replaces the pool's contents with a state from get_state. The arrays are copied.
+
+        Args:
+            columns (tuple): The arrays, in the order get_state returns them.
+            rng_state (dict): The respawn generator's bit_generator.state.
+        """
+        n = len(columns[0])
+        if n > len(self._x):
+            raise IndexError("artifact pool is full")
+
+        # keep the Colors already made unless the colors change, as they don't between ticks
+        if n != self._size or not numpy.array_equal(self._color[:n], columns[5]):
+            self._colors = [None] * len(self._x)
+        targets = (self._x, self._y, self._previous_y, self._vy, self._value, self._color,
+            self._text, self._type)
+        for target, column in zip(targets, columns):
+            target[:n] = column
+        self._size = n
+        self._rng.bit_generator.state = rng_state
+
+    # pick the rows worth drawing
+    def get_visible_rows(self, alpha, camera_y, width, height, cell_size, coalesce = False,
+            lod_threshold = None):
+        """Finds the artifacts to draw this frame, by the rules of visible_rows.
+
+        Args:
+            alpha (float): How far between the last two steps they are drawn.
+            camera_y (float): The y at the top of the view.
+            width (int): The width of the view.
+            height (int): The height of the view.
+            cell_size (int): The size of a cell in the display grid.
+            coalesce (bool): Whether to keep one artifact per cell.
+            lod_threshold (int): How many visible cells a column may have before it is 
+                coalesced over blocks of rows, or None.
+
+        Returns:
+            tuple: (rows, culled): the rows to draw, in index order, and how many were outside 
+                the view.
+        """
+        n = self._size
+        rows, culled = visible_rows(self._x[:n], self._y[:n], self._previous_y[:n], alpha,
+            camera_y, width, height, cell_size, coalesce, lod_threshold)
+        return rows.tolist(), culled
+
+    # make one view per row
+    def create_views(self, rows = None):
+        """Creates a PooledArtifact view for every artifact in the pool, or for the given rows.
+
+        Args:
+            rows (Iterable): The rows to make views of, or None for all of them.
+
+        Returns:
+            List: One PooledArtifact per row, in the order given or in index order.
+        """
+        if rows is None:
+            rows = range(self._size)
+        return [PooledArtifact(self, index) for index in rows]
+
+
+# class declaration
+class PooledArtifact(Artifact):
+    """An Artifact whose state lives in a row of an ArtifactPool.
+
+    Reads and writes go to the pool's row through its per-row methods, so the view always reflects 
+    the latest vectorized step and changes made through the view are seen by the next step.
+
+    Attributes:
+        _pool (ArtifactPool): The pool holding the state.
+        _index (int): The row of this artifact in the pool.
+    """
+
+    # constructor method for PooledArtifact
+    def __init__(self, pool, index):
+        """Constructs a view over the given row of the pool.
+
+        Args:
+            pool (ArtifactPool): The pool holding the state.
+            index (int): The row of this artifact in the pool.
+        """
+        # the state lives in the pool, so Actor's own fields are not set up
+        self._pool = pool
+        self._index = index
+
+    def get_color(self):
+        """Gets the artifact's color.
+
+        Returns:
+            Color: The artifact's text color.
+        """
+        return self._pool.get_color(self._index)
+
+    def get_font_size(self):
+        """Gets the artifact's font size.
+
+        Returns:
+            int: The artifact's font size.
+        """
+        return self._pool.get_font_size()
+
+    def get_interpolated_position(self, alpha):
+        """Gets a point part way between the artifact's previous and current positions.
+
+        Args:
+            alpha (float): How far along to go, from 0 (previous) to 1 (current).
+
+        Returns:
+            Tuple(float, float): The x and y coordinates.
+        """
+        return self._pool.get_interpolated_position(self._index, alpha)
+
+    def get_type_id(self):
+        """Gets the index of the artifact's kind in the catalog.
+
+        Returns:
+            int: The type id.
+        """
+        return self._pool.get_type_id(self._index)
+
+    def get_message(self):
+        """Gets the artifact's score value as text, like Artifact.get_message.
+
+        Returns:
+            string: The artifact's score value.
+        """
+        return str(self._pool.get_value(self._index))
+
+    def get_previous_position(self):
+        """Gets the artifact's position before its last move.
+
+        Returns:
+            Point: The artifact's previous position.
+        """
+        return self._pool.get_previous_position(self._index)
+
+    def get_position(self):
+        """Gets the artifact's position.
+
+        Returns:
+            Point: The artifact's position.
+        """
+        return self._pool.get_position(self._index)
+
+    def get_text(self):
+        """Gets the artifact's glyph.
+
+        Returns:
+            string: The artifact's glyph.
+        """
+        return self._pool.get_text(self._index)
+
+    def get_text_revision(self):
+        """Gets a number that changes whenever the glyph changes; pooled glyphs are not tracked.
+
+        Returns:
+            int: Always 0.
+        """
+        return 0
+
+    def get_velocity(self):
+        """Gets the artifact's velocity.
+
+        Returns:
+            Point: The artifact's velocity.
+        """
+        return Point(0, self._pool.get_vy(self._index))
+
+    def move_next(self, max_x, max_y):
+        """Moves this one artifact to its next position.
+
+        Args:
+            max_x (int): The maximum x value.
+            max_y (int): The maximum y value.
+        """
+        self._pool.move_row(self._index, max_y)
+
+    def set_color(self, color):
+        """Updates the color to the given one.
+
+        Args:
+            color (Color): The given color.
+        """
+        self._pool.set_color(self._index, color)
+
+    def set_font_size(self, font_size):
+        """Ignored; every artifact in a pool shares the pool's font size.
+
+        Args:
+            font_size (int): The given font size.
+        """
+        pass
+
+    def set_message(self, message):
+        """Updates the score value from its text form.
+
+        Args:
+            message (string): The score value as text.
+        """
+        self._pool.set_value(self._index, int(message))
+
+    def set_position(self, position):
+        """Updates the position to the given one.
+
+        Args:
+            position (Point): The given position.
+        """
+        self._pool.set_position(self._index, position)
+
+    def set_previous_position(self, position):
+        """Updates the position before the last move; pooled artifacts only move down, so only 
+        its y is kept.
+
+        Args:
+            position (Point): The given position.
+        """
+        self._pool.set_previous_y(self._index, position.get_y())
+
+    def set_type_id(self, type_id):
+        """Updates the index of the artifact's kind in the catalog.
+
+        Args:
+            type_id (int): The type id.
+        """
+        self._pool.set_type_id(self._index, type_id)
+
+    def set_text(self, text):
+        """Updates the glyph to the given single character.
+
+        Args:
+            text (string): The given glyph.
+        """
+        self._pool.set_text(self._index, text)
+
+    def set_velocity(self, velocity):
+        """Updates the vertical velocity; artifacts never move sideways.
+
+        Args:
+            velocity (Point): The given velocity.
+        """
+        self._pool.set_vy(self._index, velocity.get_y())
@@ -4,6 +4,9 @@ authors: authors of RobotFindsKitten
 This class represents the entirety of the game cast, actors,
 banners, and artifacts
 """
+# import needed modules
+from game.casting.artifact_catalog import DEFAULT_CATALOG
+from game.casting.spatial_index import ColumnIndex
 
 # class declaration
 class Cast:
@@ -13,13 +16,29 @@ class Cast:
     adding, removing and getting them by a group name.
 
     Attributes:
-        _actors (dict): A dictionary of actors { key: group_name, value: a list of actors }
+        _actors (dict): A dictionary of actors { key: group_name, value: a dict of actors }. Each 
+            group is a dict keyed by the actors themselves, which keeps them in the order they 
+            were added and makes membership checks constant time.
+        _generation (int): Counts changes to the cast, so cached views know when to rebuild.
+        _all_actors (tuple): The cached result of get_all_actors.
+        _all_generation (int): The generation _all_actors was built at.
+        _pools (dict): A dictionary of pools { key: group_name, value: an ArtifactPool }
+        _indexes (dict): A dictionary of indexes { key: group_name, value: a ColumnIndex }
+        _worlds (dict): A dictionary of worlds { key: group_name, value: a ChunkedWorld }
+        _catalog (ArtifactCatalog): The kinds of artifact the cast's type ids refer to.
     """
 
     # default constructor
     def __init__(self):
         """Constructs a new Actor."""
         self._actors = {}
+        self._generation = 0
+        self._all_actors = ()
+        self._all_generation = 0
+        self._pools = {}
+        self._indexes = {}
+        self._worlds = {}
+        self._catalog = DEFAULT_CATALOG
         
     # add actor method to add actore to group    
     def add_actor(self, group, actor):
@@ -30,39 +49,127 @@ class Cast:
             actor (Actor): The actor to add.
         """
         # if group isn't in the dictionary keys, create one
-        if not group in self._actors.keys():
-            self._actors[group] = []
+        if not group in self._actors:
+            self._actors[group] = {}
             
         # if actor isn't in the actor's group, add it in
         if not actor in self._actors[group]:
-            self._actors[group].append(actor)
+            self._actors[group][actor] = None
+            self._generation += 1
+            if group in self._indexes:
+                self._indexes[group].add(actor)
 
-    # get list of actors in a group
+    # keep a group bucketed by column
+    def add_spatial_index(self, group):
+        """Starts keeping the actors of the given group in a ColumnIndex, including any that
+        are already in the group.
+        
+        Args:
+            group (string): The name of the group.
+
+        Returns:
+            ColumnIndex: The index for the group.
+        """
+        if not group in self._indexes:
+            index = ColumnIndex()
+            for actor in self._actors.get(group, []):
+                index.add(actor)
+            self._indexes[group] = index
+        return self._indexes[group]
+
+    # get the column index of a group
+    def get_spatial_index(self, group):
+        """Gets the ColumnIndex kept for the given group.
+        
+        Args:
+            group (string): The name of the group.
+
+        Returns:
+            ColumnIndex: The index, or None if the group is not indexed.
+        """
+        return self._indexes.get(group)
+
+    # attach an array-backed pool to a group
+    def attach_pool(self, group, pool):
+        """Attaches an ArtifactPool to the given group and adds a view of each of its artifacts
+        to the group, so the pool's artifacts can be drawn and inspected like any other actor.
+        
+        Args:
+            group (string): The name of the group.
+            pool (ArtifactPool): The pool to attach.
+        """
+        self._pools[group] = pool
+        for view in pool.create_views():
+            self.add_actor(group, view)
+
+    # get the pool attached to a group
+    def get_pool(self, group):
+        """Gets the ArtifactPool attached to the given group.
+        
+        Args:
+            group (string): The name of the group.
+
+        Returns:
+            ArtifactPool: The attached pool, or None if the group is not pooled.
+        """
+        return self._pools.get(group)
+
+    # attach a chunked world to a group
+    def attach_world(self, group, world):
+        """Attaches a ChunkedWorld to the given group and keeps the group in a ColumnIndex. The 
+        world pages its artifacts into the group as the camera moves.
+        
+        Args:
+            group (string): The name of the group.
+            world (ChunkedWorld): The world to attach.
+        """
+        self._worlds[group] = world
+        self.add_spatial_index(group)
+        world.update(self, group)
+
+    # get the world attached to a group
+    def get_world(self, group):
+        """Gets the ChunkedWorld attached to the given group.
+        
+        Args:
+            group (string): The name of the group.
+
+        Returns:
+            ChunkedWorld: The attached world, or None if the group is not streamed from one.
+        """
+        return self._worlds.get(group)
+
+    # get the actors in a group
     def get_actors(self, group):
-        """Gets the actors in the given group.
+        """Gets the actors in the given group, as a read-only view rather than a copy. The view
+        always reflects the group's current members, so do not add or remove actors from the group
+        while iterating over it.
         
         Args:
             group (string): The name of the group.
 
         Returns:
-            List: The actors in the group.
+            Iterable: The actors in the group, in the order they were added.
         """
-        results = []
-        if group in self._actors.keys():
-            results = self._actors[group].copy()
-        return results
+        if group in self._actors:
+            return self._actors[group].keys()
+        return ()
     
-    # get all actors method returns all actors in a list
+    # get all actors method returns all actors
     def get_all_actors(self):
-        """Gets all of the actors in the cast.
+        """Gets all of the actors in the cast. The result is cached and only rebuilt after 
+        actors are added or removed.
         
         Returns:
-            List: All of the actors in the cast.
+            Tuple: All of the actors in the cast.
         """
-        results = []
-        for group in self._actors:
-            results.extend(self._actors[group])
-        return results
+        if self._all_generation != self._generation:
+            results = []
+            for group in self._actors.values():
+                results.extend(group)
+            self._all_actors = tuple(results)
+            self._all_generation = self._generation
+        return self._all_actors
 
     # get first actor method returns the first in the group parameter
     def get_first_actor(self, group):
@@ -72,13 +179,50 @@ class Cast:
             group (string): The name of the group.
             
         Returns:
-            List: The first actor in the group.
+            Actor: The first actor in the group.
         """
         result = None
-        if group in self._actors.keys():
-            result = self._actors[group][0]
+        if group in self._actors:
+            result = next(iter(self._actors[group]), None)
         return result
 
+    # get the group names
+    def get_groups(self):
+        """Gets the names of the groups in the cast.
+        
+        Returns:
+            List: The group names, in the order the groups were created.
+        """
+        return list(self._actors)
+
+    # get the artifact kinds
+    def get_catalog(self):
+        """Gets the catalog of artifact kinds the artifacts' type ids refer to.
+        
+        Returns:
+            ArtifactCatalog: The catalog; DEFAULT_CATALOG unless another was set.
+        """
+        return self._catalog
+
+    # set the artifact kinds
+    def set_catalog(self, catalog):
+        """Sets the catalog of artifact kinds the artifacts' type ids refer to.
+        
+        Args:
+            catalog (ArtifactCatalog): The catalog.
+        """
+        self._catalog = catalog
+
+    # get the generation counter
+    def get_generation(self):
+        """Gets a number that changes every time an actor is added or removed, so callers can 
+        tell whether something they cached from the cast is still current.
+        
+        Returns:
+            int: The current generation.
+        """
+        return self._generation
+
     # remove actor method simply removes an actor
     def remove_actor(self, group, actor):
         """Removes an actor from the given group.
@@ -86,6 +230,14 @@ class Cast:
         Args:
             group (string): The name of the group.
             actor (Actor): The actor to remove.
+
+        Raises:
+            ValueError: If the actor is not in the group.
         """
         if group in self._actors:
-            self._actors[group].remove(actor)
\ No newline at end of file
+            if actor not in self._actors[group]:
+                raise ValueError(f"the actor is not in the {group!r} group")
+            del self._actors[group][actor]
+            self._generation += 1
+            if group in self._indexes:
+                self._indexes[group].remove(actor)
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+file: cast_factory.py
+author: Jerry Lane
+purpose: Builds the starting cast of the Greed game: the banner, the robot
+at the bottom of the screen and the falling artifacts. Shared by the game
+launcher and by tools that run games without it, like the benchmarks.
+"""
+# import needed modules
+import random
+
+from game.casting.actor import Actor
+from game.casting.artifact import Artifact
+from game.casting.artifact_catalog import DEFAULT_CATALOG
+from game.casting.cast import Cast
+from game.shared.color import Color
+from game.shared.point import Point
+
+# set defaults
+MAX_X = 900
+MAX_Y = 600
+CELL_SIZE = 15
+FONT_SIZE = 15
+COLS = 60
+ROWS = 40
+WHITE = Color(255, 255, 255)
+DEFAULT_ARTIFACTS = 40
+
+
+def create_cast(artifact_count = DEFAULT_ARTIFACTS, pooled = False, rng = None, catalog = None):
+    """
+    parameters: artifact_count - how many artifacts to create
+                pooled - whether to keep the artifacts in a NumPy-backed ArtifactPool
+                rng - the random.Random to draw from, or None for the random module
+                catalog - the ArtifactCatalog of kinds to pick from, or None for
+                          DEFAULT_CATALOG's gems and rocks
+    return: the new Cast
+    The create_cast function builds the banner, the robot and a random mix
+    of artifacts scattered over the screen. The same seeded rng always
+    builds the same cast.
+    """
+    if rng is None:
+        rng = random
+    if catalog is None:
+        catalog = DEFAULT_CATALOG
+
+    # create the cast
+    cast = Cast()
+    cast.set_catalog(catalog)
+    
+    # create the banner
+    banner = Actor()
+    banner.set_text("")
+    banner.set_font_size(FONT_SIZE)
+    banner.set_color(WHITE)
+    banner.set_position(Point(CELL_SIZE, 0))
+    cast.add_actor("banners", banner)
+    
+    # create the robot at bottom of screen
+    x = int(MAX_X / 2)
+    y = int(MAX_Y - 15)
+    position = Point(x, y)
+
+    # instantiate robot as an Actor
+    robot = Actor()
+    robot.set_text(chr(164))
+    robot.set_font_size(FONT_SIZE)
+    robot.set_color(WHITE)
+    robot.set_position(position)
+    cast.add_actor("robots", robot)
+    
+    # large casts can be kept in an array-backed pool (needs numpy)
+    pool = None
+    if pooled:
+        from game.casting.artifact_pool import ArtifactPool
+        pool = ArtifactPool(artifact_count, FONT_SIZE, rng.getrandbits(32), catalog)
+
+    # create the artifacts randomly, picking each one's kind by the catalog's weights
+    # loop through the default number of artifacts
+    velocities = catalog.get_velocities(1)
+    for n in range(artifact_count):
+        type_id = catalog.pick(rng)
+        kind = catalog.get_type(type_id)
+
+        # position artifact randomly on the screen
+        x = rng.randint(1, COLS - 1)
+        y = rng.randint(1, ROWS - 1)
+        position = Point(x, y)
+        position = position.scale(CELL_SIZE)
+
+        # use the kind's color, or assign a random color to the artifact
+        color = kind.color
+        if color is None:
+            r = rng.randint(0, 255)
+            g = rng.randint(0, 255)
+            b = rng.randint(0, 255)
+            color = Color(r, g, b)
+
+        # pooled artifacts are stored as a row of the pool's arrays
+        if pool is not None:
+            pool.add(kind.glyph, kind.value, position, color, velocities[type_id].get_y(), type_id)
+            continue
+        
+        # create the artifact as an Artifact instance, child class of Actor
+        artifact = Artifact()
+        artifact.set_text(kind.glyph)
+        artifact.set_font_size(FONT_SIZE)
+        artifact.set_color(color)
+        artifact.set_position(position)
+        artifact.set_velocity(velocities[type_id])
+        artifact.set_message(str(kind.value))
+        artifact.set_type_id(type_id)
+        cast.add_actor("artifacts", artifact)
+
+    # pooled artifacts are scored in bulk; otherwise keep them bucketed by column
+    if pool is not None:
+        cast.attach_pool("artifacts", pool)
+    else:
+        cast.add_spatial_index("artifacts")
+
+    return cast
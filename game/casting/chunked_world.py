@@ -0,0 +1,450 @@
+"""
+file: chunked_world.py
+author: Jerry Lane
+purpose: A ChunkedWorld is a playfield much taller than the window. The
+artifacts sit still in the world, in bands of rows called chunks, while
+the camera climbs up through it at the game velocity, so on screen they
+still fall toward the robot. Only the chunks near the camera are in the
+cast: a chunk is paged in, from a generator or from a memory-mapped world
+file, just before it comes into view and paged out once it has scrolled
+off the bottom. Memory and work follow the size of the window, not the
+size of the world.
+
+World file layout (little-endian):
+    header   magic "GRWD", version, chunk count, rows per chunk, columns
+    offsets  chunk count + 1 uint32 record numbers; chunk i is records
+             offsets[i] to offsets[i + 1]
+    records  per artifact: column, row within the chunk, type id (uint16)
+             and color (r, g, b, a as uint8)
+"""
+# import needed modules
+import argparse
+import mmap
+import random
+import struct
+
+from game.casting.artifact import Artifact
+from game.casting.artifact_catalog import DEFAULT_CATALOG
+from game.shared.color import Color
+from game.shared.point import Point
+
+MAGIC = b"GRWD"
+VERSION = 1
+HEADER = struct.Struct("<4sHIHH")
+RECORD = struct.Struct("<HHH4B")
+
+# set defaults, matching the game
+CELL_SIZE = 15
+COLS = 60
+ROWS = 40
+FONT_SIZE = 15
+DEFAULT_DENSITY = 40
+
+
+# class declaration
+class GeneratedChunkSource:
+    """Makes chunks from a seed.
+
+    The responsibility of a GeneratedChunkSource is to scatter artifacts over a chunk the way 
+    create_cast scatters them over the screen. Each chunk has its own generator seeded from the 
+    world seed and the chunk number, so a chunk is the same whenever it is paged in, and the 
+    world never ends.
+
+    Attributes:
+        _seed (int): The world seed.
+        _rows (int): The rows in a chunk.
+        _cols (int): The columns in the grid.
+        _count (int): The artifacts in each chunk.
+        _catalog (ArtifactCatalog): The kinds of artifact to pick from.
+    """
+
+    # default constructor
+    def __init__(self, seed = 0, rows = ROWS, cols = COLS, count = DEFAULT_DENSITY, catalog = None):
+        """Constructs a new GeneratedChunkSource.
+
+        Args:
+            seed (int): The world seed.
+            rows (int): The rows in a chunk.
+            cols (int): The columns in the grid.
+            count (int): The artifacts in each chunk.
+            catalog (ArtifactCatalog): The kinds of artifact, or None for DEFAULT_CATALOG.
+        """
+        self._seed = seed
+        self._rows = rows
+        self._cols = cols
+        self._count = count
+        self._catalog = DEFAULT_CATALOG if catalog is None else catalog
+
+    def get_rows(self):
+        """Gets the number of rows in a chunk.
+
+        Returns:
+            int: The rows in a chunk.
+        """
+        return self._rows
+
+    # make one chunk
+    def get_chunk(self, index):
+        """Makes the artifacts of one chunk.
+
+        Args:
+            index (int): The chunk number; any whole number.
+
+        Returns:
+            list: (column, row, type id, (r, g, b, a)) per artifact.
+        """
+        rng = random.Random(f"{self._seed}:{index}")
+        catalog = self._catalog
+        records = []
+        for _ in range(self._count):
+            type_id = catalog.pick(rng)
+            column = rng.randint(1, self._cols - 1)
+            row = rng.randrange(self._rows)
+            color = catalog.get_type(type_id).color
+            if color is None:
+                color = (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255), 255)
+            else:
+                color = color.to_tuple()
+            records.append((column, row, type_id, color))
+        return records
+
+    # nothing to let go of
+    def close(self):
+        """Does nothing; a generated world holds no files."""
+
+
+# class declaration
+class MappedChunkSource:
+    """Reads chunks from a world file.
+
+    The responsibility of a MappedChunkSource is to read chunks from a memory-mapped world file, 
+    so the game only holds the chunks that are paged in. The whole file is checked once when it 
+    is opened, so a damaged file is refused up front instead of failing part way through a game. 
+    The world repeats once the camera has climbed past the last chunk.
+
+    Attributes:
+        _data (mmap): The mapped file.
+        _count (int): The number of chunks in the file.
+        _rows (int): The rows in a chunk.
+        _offsets (tuple): The record number each chunk starts at, then the number of records.
+        _records_start (int): Where the records start in the file.
+    """
+
+    # default constructor
+    def __init__(self, path, catalog = None):
+        """Maps a world file and checks it.
+
+        Args:
+            path (string): The world file, as written by save_world.
+            catalog (ArtifactCatalog): The kinds the file's type ids must refer to, or None for 
+                DEFAULT_CATALOG.
+
+        Raises:
+            ValueError: If the file is not a world file, is cut short or has records that don't 
+                fit the catalog.
+        """
+        with open(path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._check(path, DEFAULT_CATALOG if catalog is None else catalog)
+        except ValueError:
+            self._data.close()
+            raise
+
+    def get_rows(self):
+        """Gets the number of rows in a chunk.
+
+        Returns:
+            int: The rows in a chunk.
+        """
+        return self._rows
+
+    # read one chunk
+    def get_chunk(self, index):
+        """Reads the artifacts of one chunk.
+
+        Args:
+            index (int): The chunk number; any whole number, wrapped to the chunks in the file.
+
+        Returns:
+            list: (column, row, type id, (r, g, b, a)) per artifact.
+        """
+        index %= self._count
+        start = self._records_start + self._offsets[index] * RECORD.size
+        end = self._records_start + self._offsets[index + 1] * RECORD.size
+        return [(column, row, type_id, (r, g, b, a)) for column, row, type_id, r, g, b, a
+            in RECORD.iter_unpack(self._data[start:end])]
+
+    # let go of the file
+    def close(self):
+        """Unmaps the world file. No chunks can be read afterward."""
+        self._data.close()
+
+    # read and check the header, offsets and records
+    def _check(self, path, catalog):
+        """Reads the header and offsets, and checks that they agree with the file's size and 
+        that every record fits its chunk and the catalog.
+
+        Args:
+            path (string): The world file, for the error messages.
+            catalog (ArtifactCatalog): The kinds the type ids must refer to.
+
+        Raises:
+            ValueError: If anything in the file is out of place.
+        """
+        data = self._data
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path} is not a version {VERSION} Greed world file")
+        magic, version, count, rows, _ = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} Greed world file")
+        if count == 0:
+            raise ValueError(f"{path} has no chunks")
+        records_start = HEADER.size + 4 * (count + 1)
+        if len(data) < records_start:
+            raise ValueError(f"{path} is cut short: its header says {count} chunks")
+        offsets = struct.Struct(f"<{count + 1}I").unpack_from(data, HEADER.size)
+        if offsets[0] != 0 or any(end < start for start, end in zip(offsets, offsets[1:])):
+            raise ValueError(f"{path} has chunk offsets that don't start at 0 or go backward")
+        if len(data) != records_start + offsets[-1] * RECORD.size:
+            raise ValueError(f"{path} should hold {offsets[-1]} records after its offsets, "
+                f"but is {len(data)} bytes long")
+        kinds = len(catalog)
+        for _, row, type_id, *_ in RECORD.iter_unpack(data[records_start:]):
+            if row >= rows or type_id >= kinds:
+                raise ValueError(f"{path} has an artifact at row {row} of type {type_id}, "
+                    f"but chunks have {rows} rows and the catalog {kinds} kinds")
+        self._count = count
+        self._rows = rows
+        self._offsets = offsets
+        self._records_start = records_start
+
+
+def save_world(path, source, chunk_count, cols = COLS):
+    """
+    parameters: path - the world file to write
+                source - where to take the chunks from, like a GeneratedChunkSource
+                chunk_count - how many chunks to write
+                cols - the columns in the grid
+    return: nothing
+    The save_world function writes the first chunk_count chunks of a source
+    to a world file that a MappedChunkSource can read.
+    """
+    offsets = [0]
+    records = bytearray()
+    for index in range(chunk_count):
+        chunk = source.get_chunk(index)
+        for column, row, type_id, color in chunk:
+            records += RECORD.pack(column, row, type_id, *color)
+        offsets.append(offsets[-1] + len(chunk))
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, chunk_count, source.get_rows(), cols))
+        file.write(struct.pack(f"<{chunk_count + 1}I", *offsets))
+        file.write(records)
+
+
+# class declaration
+class ChunkedWorld:
+    """A tall world the camera climbs through, kept in the cast one chunk at a time.
+
+    The responsibility of a ChunkedWorld is to keep track of the camera, to page chunks of 
+    artifacts into and out of a cast group as the camera moves, and to forget caught artifacts. 
+    World y grows downward as on screen; the camera starts with its top at 0 and climbs into 
+    negative y.
+
+    Attributes:
+        _source (object): Where chunks come from: anything with get_rows, get_chunk and close.
+        _catalog (ArtifactCatalog): The kinds the chunks' type ids refer to.
+        _cell_size (int): The size of a cell in the display grid.
+        _view_height (int): The height of the window.
+        _margin (int): How far above the window chunks are paged in, in pixels.
+        _font_size (int): The font size of the artifacts.
+        _chunk_height (int): The height of a chunk, in pixels.
+        _chunks (dict): The paged-in chunks { key: chunk number, value: a dict of its artifacts }
+        _camera_y (int): The world y at the top of the window.
+        _previous_camera_y (int): The camera before the last scroll, for drawing.
+        _speed (int): How far the camera moved on the last scroll, which is how fast the 
+            artifacts fall on screen.
+        _chunks_loaded (int): The number of chunks paged in so far.
+    """
+
+    # default constructor
+    def __init__(self, source, catalog = None, cell_size = CELL_SIZE, view_height = ROWS * CELL_SIZE,
+            font_size = FONT_SIZE, margin = None):
+        """Constructs a new ChunkedWorld with nothing paged in.
+
+        Args:
+            source (object): Where chunks come from, like a GeneratedChunkSource.
+            catalog (ArtifactCatalog): The kinds the chunks' type ids refer to, or None for 
+                DEFAULT_CATALOG.
+            cell_size (int): The size of a cell in the display grid.
+            view_height (int): The height of the window.
+            font_size (int): The font size of the artifacts.
+            margin (int): How far above the window to page chunks in, in pixels; defaults to 
+                one chunk.
+        """
+        self._source = source
+        self._catalog = DEFAULT_CATALOG if catalog is None else catalog
+        self._cell_size = cell_size
+        self._view_height = view_height
+        self._font_size = font_size
+        self._chunk_height = source.get_rows() * cell_size
+        self._margin = self._chunk_height if margin is None else margin
+        self._chunks = {}
+        self._camera_y = 0
+        self._previous_camera_y = 0
+        self._speed = 0
+        self._chunks_loaded = 0
+
+    # let go of the chunk source
+    def close(self):
+        """Closes the chunk source, such as a mapped world file. Chunks already in the cast stay 
+        there, but no more can be paged in."""
+        self._source.close()
+
+    # get where the camera is
+    def get_camera_y(self, alpha = 1.0):
+        """Gets the world y at the top of the window, part way through the last scroll.
+
+        Args:
+            alpha (float): How far along the last scroll, from 0 (before) to 1 (after).
+
+        Returns:
+            float: The camera's y.
+        """
+        previous = self._previous_camera_y
+        return previous + (self._camera_y - previous) * alpha
+
+    # get how fast the artifacts fall on screen
+    def get_speed(self):
+        """Gets how far the camera moved on the last scroll.
+
+        Returns:
+            int: The distance, in pixels per tick.
+        """
+        return self._speed
+
+    # count what is paged in
+    def get_stats(self):
+        """Gets how much of the world is in memory.
+
+        Returns:
+            dict: active_chunks, live_artifacts, chunks_loaded and camera_y.
+        """
+        return {
+            "active_chunks": len(self._chunks),
+            "live_artifacts": sum(len(chunk) for chunk in self._chunks.values()),
+            "chunks_loaded": self._chunks_loaded,
+            "camera_y": self._camera_y,
+        }
+
+    # move the camera up
+    def scroll(self, distance):
+        """Moves the camera up the world.
+
+        Args:
+            distance (int): How far to move, in pixels.
+        """
+        self._previous_camera_y = self._camera_y
+        self._camera_y -= distance
+        self._speed = distance
+
+    # convert a world y to the screen
+    def to_screen_y(self, world_y):
+        """Gets where a world y is on the screen now.
+
+        Args:
+            world_y (int): The y in the world.
+
+        Returns:
+            int: The y on the screen.
+        """
+        return world_y - self._camera_y
+
+    # forget a caught artifact
+    def remove(self, cast, group, artifact):
+        """Takes an artifact out of the cast and out of its chunk, so it is gone for good.
+
+        Args:
+            cast (Cast): The cast the artifacts are in.
+            group (string): The artifacts' group.
+            artifact (Artifact): The artifact to remove.
+        """
+        chunk = self._chunks.get(artifact.get_position().get_y() // self._chunk_height)
+        if chunk is not None and artifact in chunk:
+            del chunk[artifact]
+            cast.remove_actor(group, artifact)
+
+    # page chunks in and out around the camera
+    def update(self, cast, group):
+        """Pages in the chunks from just above the window to its bottom edge that are not in the 
+        cast yet, and pages out the ones that are now outside that range.
+
+        Args:
+            cast (Cast): The cast to keep the artifacts in.
+            group (string): The artifacts' group.
+        """
+        height = self._chunk_height
+        first = (self._camera_y - self._margin) // height
+        last = (self._camera_y + self._view_height - 1) // height
+        for index in [index for index in self._chunks if index < first or index > last]:
+            for artifact in self._chunks.pop(index):
+                cast.remove_actor(group, artifact)
+        for index in range(first, last + 1):
+            if index not in self._chunks:
+                self._chunks[index] = self._page_in(cast, group, index)
+
+    # make the artifacts of one chunk
+    def _page_in(self, cast, group, index):
+        """Makes the artifacts of a chunk and adds them to the cast.
+
+        Args:
+            cast (Cast): The cast to add them to.
+            group (string): The artifacts' group.
+            index (int): The chunk number.
+
+        Returns:
+            dict: The chunk's artifacts, as dict keys.
+        """
+        catalog = self._catalog
+        cell_size = self._cell_size
+        top = index * self._chunk_height
+        still = Point(0, 0)
+        artifacts = {}
+        for column, row, type_id, color in self._source.get_chunk(index):
+            kind = catalog.get_type(type_id)
+            artifact = Artifact()
+            artifact.set_text(kind.glyph)
+            artifact.set_font_size(self._font_size)
+            artifact.set_color(kind.color if kind.color is not None else Color(*color))
+            artifact.set_position(Point(column * cell_size, top + row * cell_size))
+            artifact.set_velocity(still)
+            artifact.set_message(str(kind.value))
+            artifact.set_type_id(type_id)
+            cast.add_actor(group, artifact)
+            artifacts[artifact] = None
+        self._chunks_loaded += 1
+        return artifacts
+
+
+def main():
+    """
+    parameters: none
+    return: nothing
+    The main function writes a generated world to a world file, for
+    shipping fixed levels or for playing with --world PATH.
+    """
+    parser = argparse.ArgumentParser(prog="chunked_world",
+        description="Write a generated Greed world to a file.")
+    parser.add_argument("path", help="the world file to write")
+    parser.add_argument("--chunks", type=int, default=1000, help="number of chunks (default 1000)")
+    parser.add_argument("--density", type=int, default=DEFAULT_DENSITY,
+        help=f"artifacts per chunk (default {DEFAULT_DENSITY})")
+    parser.add_argument("--seed", type=int, default=0, help="world seed (default 0)")
+    args = parser.parse_args()
+    save_world(args.path, GeneratedChunkSource(args.seed, count=args.density), args.chunks)
+    print(f"wrote {args.chunks} chunks to {args.path}")
+
+# check to see if run directly or called, if direct then run main
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+file: respawn_scheduler.py
+author: Jerry Lane
+purpose: The RespawnScheduler class puts caught and fallen artifacts back at
+the top of the screen. Respawns are handled once per tick, in a batch, from
+columns drawn in blocks ahead of time. A spawn-rate curve can limit how many
+artifacts come back each tick; the rest wait out of the cast, so no
+artifact is ever created or destroyed.
+"""
+# import needed modules
+from collections import deque
+
+from game.shared.point import Point
+
+# how many random columns to draw at a time
+BLOCK_SIZE = 256
+
+
+# spawn-rate curves: functions of the tick number giving how many artifacts may respawn
+def constant(count):
+    """
+    parameters: count - how many artifacts may respawn each tick
+    return: a spawn-rate curve
+    The constant function makes a curve that never changes.
+    """
+    return lambda tick: count
+
+
+def ramp(start, end, ticks):
+    """
+    parameters: start - respawns allowed per tick at first
+                end - respawns allowed per tick once the ramp is over
+                ticks - how many ticks the ramp lasts
+    return: a spawn-rate curve
+    The ramp function makes a curve that goes in a straight line from start
+    to end and then stays at end.
+    """
+    return lambda tick: end if tick >= ticks else start + (end - start) * tick // ticks
+
+
+def bursts(base, peak, period, length):
+    """
+    parameters: base - respawns allowed per tick between bursts
+                peak - respawns allowed per tick during a burst
+                period - ticks from the start of one burst to the next
+                length - ticks each burst lasts
+    return: a spawn-rate curve
+    The bursts function makes a curve that jumps to peak for a while every
+    period ticks.
+    """
+    return lambda tick: peak if tick % period < length else base
+
+
+def parse_curve(spec):
+    """
+    parameters: spec - "N", "ramp:START:END:TICKS" or "burst:BASE:PEAK:PERIOD:LENGTH"
+    return: a spawn-rate curve
+    The parse_curve function turns a command line option into a curve,
+    raising ValueError if it is not valid: counts, TICKS and LENGTH can't be
+    negative, and PERIOD must be at least 1.
+    """
+    name, _, rest = spec.partition(":")
+    try:
+        values = [int(value) for value in rest.split(":")] if rest else [int(name)]
+    except ValueError:
+        values = None
+    shapes = {"ramp": 3, "burst": 4}
+    if values is None or (rest and len(values) != shapes.get(name)):
+        raise ValueError(f"bad spawn rate {spec!r}: use N, ramp:START:END:TICKS or "
+            "burst:BASE:PEAK:PERIOD:LENGTH")
+    if min(values) < 0:
+        raise ValueError(f"bad spawn rate {spec!r}: counts and lengths can't be negative")
+    if not rest:
+        return constant(values[0])
+    if name == "ramp":
+        return ramp(*values)
+    if values[2] == 0:
+        raise ValueError(f"bad spawn rate {spec!r}: a burst PERIOD must be at least 1")
+    return bursts(*values)
+
+
+# class declaration
+class RespawnScheduler:
+    """A batch respawner for artifacts.
+
+    The responsibility of a RespawnScheduler is to collect the artifacts that need to go back to 
+    the top of the screen during a tick and to respawn them all at the end of it, as many as the 
+    spawn-rate curve allows. The others leave the cast and wait, first in first out.
+
+    Attributes:
+        _random (Random): Where the columns come from.
+        _cols (int): The number of columns in the display grid.
+        _cell_size (int): The size of a cell in the display grid.
+        _curve (function): The spawn-rate curve, or None for no limit.
+        _columns (list): Columns drawn ahead of time, used from the end.
+        _pending (dict): The artifacts to respawn at the end of this tick, in order.
+        _waiting (deque): The artifacts out of the cast, waiting for their turn.
+        _tick (int): The number of ticks handled so far.
+        _position (Point): Reused for every position handed to an artifact.
+    """
+
+    # default constructor
+    def __init__(self, rng, cols, cell_size, curve = None):
+        """Constructs a new RespawnScheduler.
+
+        Args:
+            rng (Random): The random.Random (or random module) to draw columns from.
+            cols (int): The number of columns in the display grid.
+            cell_size (int): The size of a cell in the display grid.
+            curve (function): A spawn-rate curve, or None for no limit.
+        """
+        self._random = rng
+        self._cols = cols
+        self._cell_size = cell_size
+        self._curve = curve
+        self._columns = []
+        self._pending = {}
+        self._waiting = deque()
+        self._tick = 0
+        self._position = Point(0, 0)
+
+    # get the number of artifacts out of the cast
+    def get_waiting_count(self):
+        """Gets the number of artifacts waiting to respawn.
+
+        Returns:
+            int: The number of waiting artifacts.
+        """
+        return len(self._waiting)
+
+    # get what is needed to pick up where the scheduler left off
+    def get_state(self):
+        """Gets the scheduler's state between ticks, for a snapshot.
+
+        Returns:
+            tuple: (tick, pre-drawn columns, waiting artifacts), with the columns and artifacts 
+                as new lists.
+        """
+        return self._tick, list(self._columns), list(self._waiting)
+
+    # pick up where another scheduler left off
+    def set_state(self, tick, columns, waiting):
+        """Restores a state from get_state. Nothing is left pending.
+
+        Args:
+            tick (int): The number of ticks handled so far.
+            columns (list): The pre-drawn columns, used from the end.
+            waiting (list): The artifacts out of the cast, oldest first.
+        """
+        self._tick = tick
+        self._columns = list(columns)
+        self._pending.clear()
+        self._waiting = deque(waiting)
+
+    # ask for an artifact to be respawned
+    def schedule(self, artifact):
+        """Marks the artifact to be respawned at the end of this tick. Scheduling the same 
+        artifact twice in a tick respawns it once.
+
+        Args:
+            artifact (Artifact): The artifact to respawn.
+        """
+        self._pending[artifact] = None
+
+    # respawn this tick's artifacts
+    def update(self, cast, group, velocities):
+        """Respawns the artifacts whose turn it is, oldest first. Waiting artifacts are added 
+        back to the group; this tick's artifacts that don't fit under the curve are taken out 
+        of it to wait.
+
+        Args:
+            cast (Cast): The cast the artifacts belong to.
+            group (string): The name of the artifacts' group.
+            velocities (tuple): The velocity of each artifact kind at the game velocity, by type 
+                id, as from ArtifactCatalog.get_velocities; given to artifacts coming back into 
+                the cast.
+        """
+        curve = self._curve
+        allowance = len(self._waiting) + len(self._pending) if curve is None else curve(self._tick)
+        self._tick += 1
+
+        # those who waited go first
+        waiting = self._waiting
+        while waiting and allowance > 0:
+            artifact = waiting.popleft()
+            artifact.set_velocity(velocities[artifact.get_type_id()])
+            self._place(artifact)
+            cast.add_actor(group, artifact)
+            allowance -= 1
+
+        # this tick's artifacts respawn in place while there is room, then leave the cast
+        if self._pending:
+            for artifact in self._pending:
+                if allowance > 0:
+                    self._place(artifact)
+                    allowance -= 1
+                else:
+                    cast.remove_actor(group, artifact)
+                    waiting.append(artifact)
+            self._pending.clear()
+
+    # put an artifact at the top of a random column
+    def _place(self, artifact):
+        """Moves the artifact to the next pre-drawn column at the top of the screen.
+
+        Args:
+            artifact (Artifact): The artifact to move.
+        """
+        columns = self._columns
+        if not columns:
+            randint = self._random.randint
+            high = self._cols - 1
+            columns.extend([randint(1, high) for _ in range(BLOCK_SIZE)])
+        x = columns.pop() * self._cell_size
+        artifact.set_position(self._position.set(x, 0))
@@ -0,0 +1,92 @@
+"""
+file: spatial_index.py
+author: Jerry Lane
+purpose: The ColumnIndex class buckets actors by the x coordinate of their
+position, so the Director can find the artifacts in the robot's column
+without looking at every artifact on the screen.
+"""
+
+# class declaration
+class ColumnIndex:
+    """A lookup of actors by screen column.
+
+    The responsibility of a ColumnIndex is to know which actors are in which column. Actors
+    tell the index when their x coordinate changes, so it stays current without being rebuilt.
+
+    Attributes:
+        _columns (dict): A dictionary of columns { key: x coordinate, value: a dict of actors }
+    """
+
+    # default constructor
+    def __init__(self):
+        """Constructs a new, empty ColumnIndex."""
+        self._columns = {}
+
+    # start tracking an actor
+    def add(self, actor):
+        """Adds the actor to the column it is currently in and asks it to report its moves.
+
+        Args:
+            actor (Actor): The actor to track.
+        """
+        x = actor.get_position().get_x()
+        self._columns.setdefault(x, {})[actor] = None
+        actor.set_spatial_index(self)
+
+    # stop tracking an actor
+    def remove(self, actor):
+        """Removes the actor from the index.
+
+        Args:
+            actor (Actor): The actor to stop tracking.
+        """
+        x = actor.get_position().get_x()
+        column = self._columns.get(x)
+        if column is not None:
+            column.pop(actor, None)
+            if not column:
+                del self._columns[x]
+        actor.set_spatial_index(None)
+
+    # called by an actor whose x coordinate changed
+    def move(self, actor, old_x, new_x):
+        """Moves the actor from one column to another.
+
+        Args:
+            actor (Actor): The actor that moved.
+            old_x (int): The x coordinate it moved from.
+            new_x (int): The x coordinate it moved to.
+        """
+        column = self._columns.get(old_x)
+        if column is not None:
+            column.pop(actor, None)
+            if not column:
+                del self._columns[old_x]
+        self._columns.setdefault(new_x, {})[actor] = None
+
+    # get every tracked actor
+    def get_actors(self):
+        """Gets every actor in the index, column by column from left to right, each column in 
+        the order its actors arrived there. Adding them to an empty index in this order rebuilds 
+        the same columns.
+
+        Returns:
+            List: The actors.
+        """
+        columns = self._columns
+        return [actor for x in sorted(columns) for actor in columns[x]]
+
+    # get the actors in one column
+    def get_actors_at(self, x):
+        """Gets the actors whose position has the given x coordinate.
+
+        Args:
+            x (int): The x coordinate of the column.
+
+        Returns:
+            List: The actors in the column.
+        """
+        column = self._columns.get(x)
+        if column is None:
+            return []
+        return list(column)
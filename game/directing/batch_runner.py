@@ -0,0 +1,129 @@
+"""
+file: batch_runner.py
+author: Jerry Lane
+purpose: Plays many headless games at once, one per process, each with its
+own seed and an automated player, and summarizes the scores. Run it from
+the project root:
+
+    python3 -m game.directing.batch_runner --games 1000 --ticks 2000 --policy greedy
+"""
+# import needed modules
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game.casting.cast_factory import create_cast, CELL_SIZE, MAX_X, MAX_Y, DEFAULT_ARTIFACTS
+from game.directing.director import Director
+from game.services.bot_keyboard_service import BotKeyboardService, POLICIES
+from game.services.null_video_service import NullVideoService
+
+
+def run_game(seed, ticks, artifact_count, policy, pooled = False):
+    """
+    parameters: seed - seeds both the game and the bot
+                ticks - how many ticks to play
+                artifact_count - how many artifacts to create
+                policy - the bot's policy, one of BotKeyboardService's POLICIES
+                pooled - whether to keep the artifacts in an ArtifactPool
+    return: a dict describing the finished game
+    The run_game function plays one headless game from start to finish.
+    It runs in a worker process, so it only takes and returns plain values.
+    """
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    cast = create_cast(artifact_count, pooled, rng)
+    keyboard_service = BotKeyboardService(cast, policy, seed, CELL_SIZE)
+    video_service = NullVideoService(MAX_X, MAX_Y, CELL_SIZE)
+    director = Director(keyboard_service, video_service, rng = rng)
+    score = director.run_ticks(cast, ticks)
+    return {
+        "seed": seed,
+        "policy": policy,
+        "ticks": ticks,
+        "score": score,
+        "state_hash": director.get_state_hash(cast),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def summarize(scores):
+    """
+    parameters: scores - the final score of every game
+    return: a dict of summary statistics
+    The summarize function describes the distribution of scores.
+    """
+    ordered = sorted(scores)
+    count = len(ordered)
+    def percentile(q):
+        return ordered[min(count - 1, int(count * q))]
+    return {
+        "games": count,
+        "mean": statistics.fmean(ordered),
+        "stdev": statistics.pstdev(ordered),
+        "min": ordered[0],
+        "p5": percentile(0.05),
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "max": ordered[-1],
+        "histogram": {str(score): ordered.count(score) for score in sorted(set(ordered))},
+    }
+
+
+def main():
+    """
+    parameters: none
+    return: the process exit code
+    The main function spreads the games over a pool of processes, prints
+    each result as a line of JSON as soon as it finishes, and prints a
+    summary of the scores at the end.
+    """
+    parser = argparse.ArgumentParser(description="Play many headless Greed games in parallel.")
+    parser.add_argument("--games", type=int, default=100, help="number of games (default 100)")
+    parser.add_argument("--ticks", type=int, default=1000, help="ticks per game (default 1000)")
+    parser.add_argument("--artifacts", type=int, default=DEFAULT_ARTIFACTS,
+        help=f"artifacts per game (default {DEFAULT_ARTIFACTS})")
+    parser.add_argument("--policy", choices=POLICIES, default="greedy",
+        help="how the automated player plays (default greedy)")
+    parser.add_argument("--seed", type=int, default=0,
+        help="seed of the first game; game n uses seed + n (default 0)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+        help="number of worker processes (default: one per core)")
+    parser.add_argument("--pool", action="store_true", help="use the NumPy-backed ArtifactPool")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    parser.add_argument("--output", metavar="PATH", help="also write the summary to PATH as JSON")
+    args = parser.parse_args()
+    if args.games < 1 or args.workers < 1:
+        parser.error("--games and --workers must be at least 1")
+    if args.ticks < 0 or args.artifacts < 0:
+        parser.error("--ticks and --artifacts can't be negative")
+
+    start = time.perf_counter()
+    scores = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(run_game, args.seed + n, args.ticks, args.artifacts,
+            args.policy, args.pool) for n in range(args.games)]
+        for future in as_completed(futures):
+            result = future.result()
+            scores.append(result["score"])
+            if not args.quiet:
+                print(json.dumps(result), flush=True)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(scores)
+    summary["policy"] = args.policy
+    summary["seconds"] = elapsed
+    summary["ticks_per_second"] = args.games * args.ticks / elapsed
+    print(json.dumps(summary))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(summary, file, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,8 +6,16 @@ of banner, actor, and artifacts through their respective classes, reading
 the keyboard_service inputs, and displaying the game onscreen through the
 video_service outputs.
 """
-# import the random and Point modules
+# import the random, time, RespawnScheduler, collision and Point modules
 import random
+import sys
+import threading
+import time
+from array import array
+from game.casting.respawn_scheduler import RespawnScheduler
+from game.directing.frame_buffer import FrameBuffer
+from game.shared.collision import swept_catch, swept_columns
+from game.shared.culling import Culler
 from game.shared.point import Point
 
 # set defaults, in case needed
@@ -20,6 +28,8 @@ COLS = 60
 ROWS = 40
 CAPTION = "Greed"
 DEFAULT_ARTIFACTS = 40
+TICK_RATE = 12
+MAX_CATCH_UP = 0.25
 
 # class declaration
 class Director:
@@ -30,35 +40,288 @@ class Director:
     Attributes:
         _keyboard_service (KeyboardService): For getting directional input.
         _video_service (VideoService): For providing video output.
+        _profiler (FrameProfiler): For timing each phase of the loop, if given.
+        _tick_rate (int): How many times per second the game is updated, whatever the frame rate.
+        _random (Random): Where respawn columns come from.
+        _scheduler (RespawnScheduler): Puts caught and fallen artifacts back at the top.
+        _culler (Culler): Picks the artifacts worth drawing each frame.
+        _pipelined (bool): Whether start_game simulates on a worker thread while drawing.
     """
 
-    def __init__(self, keyboard_service, video_service):
+    def __init__(self, keyboard_service, video_service, profiler = None, tick_rate = TICK_RATE,
+            rng = None, spawn_curve = None, culler = None, pipelined = False):
         """Constructs a new Director using the specified keyboard and video services.
         
         Args:
             keyboard_service (KeyboardService): An instance of KeyboardService.
             video_service (VideoService): An instance of VideoService.
+            profiler (FrameProfiler): An optional FrameProfiler to time each frame with.
+            tick_rate (int): The number of game updates per second.
+            rng (Random): The random.Random to draw respawn columns from, or None for the random
+                module. Seeding it makes a game repeatable.
+            spawn_curve (function): How many artifacts may respawn on a given tick, or None for 
+                no limit. See respawn_scheduler for ready-made curves.
+            culler (Culler): Picks the artifacts to draw, or None to cull to the video service's 
+                playfield.
+            pipelined (bool): Whether start_game runs the ticks on a worker thread, so the next 
+                tick is simulated while the last one is drawn.
         """
         # create private variables for the keyboard and video services
         self._keyboard_service = keyboard_service
         self._video_service = video_service
+        self._profiler = profiler
+        self._tick_rate = tick_rate
+        self._random = random if rng is None else rng
+        self._scheduler = RespawnScheduler(self._random, COLS, CELL_SIZE, spawn_curve)
+        if culler is None:
+            culler = Culler(video_service.get_width(), video_service.get_height(), CELL_SIZE)
+        self._culler = culler
+        self._pipelined = pipelined
         
         # keep track of score and velocity
         self._score = 0
         self._velocity = Point(0, 1)
+
+        # the velocity and score the banner text was last built for
+        self._banner_velocity = None
+        self._banner_score = None
+
+        # reused for every position and velocity handed to an actor, since actors copy them
+        self._scratch = Point(0, 0)
         
     def start_game(self, cast):
-        """Starts the game using the given cast. Runs the main game loop.
+        """Starts the game using the given cast. Runs the main game loop. The game is updated
+        tick_rate times per second no matter how often frames are drawn, and each frame shows the
+        actors part way between the last two ticks, so drawing faster only makes motion smoother.
+        When the game ends, the window is closed, and so is the chunk source of a streamed world.
 
         Args:
             cast (Cast): The cast of actors.
         """
         self._video_service.open_window()
+        try:
+            if self._pipelined:
+                self._run_pipelined(cast)
+            else:
+                self._run_loop(cast)
+        finally:
+            self._video_service.close_window()
+            world = cast.get_world("artifacts")
+            if world is not None:
+                world.close()
+
+    def _run_loop(self, cast):
+        """Runs frames until the window closes; see start_game.
+
+        Args:
+            cast (Cast): The cast of actors.
+        """
+        profiler = self._profiler
+        clock = time.perf_counter
+        tick_length = 1 / self._tick_rate
+        accumulator = 0.0
+        previous = clock()
         while self._video_service.is_window_open():
-            self._get_inputs(cast)
-            self._do_updates(cast)
-            self._do_outputs(cast)
-        self._video_service.close_window()
+            start = clock()
+
+            # never catch up on more than MAX_CATCH_UP seconds, so a long stall doesn't freeze
+            # the game while it runs every missed tick
+            accumulator += min(start - previous, MAX_CATCH_UP)
+            previous = start
+
+            # collect key presses every frame, so taps between ticks are not lost
+            self._keyboard_service.poll()
+
+            # run as many ticks as the time since the last frame calls for; under load several
+            # ticks run per frame, which skips frames instead of slowing the game down
+            inputs_time = 0.0
+            updates_time = 0.0
+            while accumulator >= tick_length:
+                tick_start = clock()
+                self._get_inputs(cast)
+                inputs_end = clock()
+                self._do_updates(cast)
+                inputs_time += inputs_end - tick_start
+                updates_time += clock() - inputs_end
+                accumulator -= tick_length
+
+            # draw the actors the leftover fraction of a tick along
+            outputs_start = clock()
+            self._do_outputs(cast, accumulator / tick_length)
+            if profiler is not None:
+                profiler.record(start, inputs_time, updates_time, clock() - outputs_start)
+
+    def _run_pipelined(self, cast):
+        """Runs frames until the window closes, with the ticks on a worker thread. After each 
+        tick the worker copies the cast into a FrameBuffer, and this thread draws the last 
+        complete copy while the worker simulates the next tick, so updating and drawing overlap 
+        instead of adding up. Only the worker touches the cast; keyboard polling and reading are 
+        kept apart by a lock.
+
+        Args:
+            cast (Cast): The cast of actors.
+        """
+        profiler = self._profiler
+        clock = time.perf_counter
+        tick_length = 1 / self._tick_rate
+        frames = FrameBuffer()
+        input_lock = threading.Lock()
+        stop = threading.Event()
+        errors = []
+        worker = threading.Thread(target=self._simulate,
+            args=(cast, frames, input_lock, stop, errors), name="greed-simulation", daemon=True)
+
+        # draw the starting cast while the worker gets going
+        frames.get_back().copy(cast, clock(), 0.0, 0.0)
+        frames.publish()
+        worker.start()
+        drawn_time = None
+        try:
+            while self._video_service.is_window_open() and not errors:
+                start = clock()
+                with input_lock:
+                    self._keyboard_service.poll()
+
+                # draw the newest complete tick, part way towards it by the time since it was due
+                frame = frames.acquire()
+                try:
+                    alpha = min(1.0, (start - frame.get_time()) / tick_length)
+                    self._draw(frame, frame.get_camera_y(alpha), alpha)
+                finally:
+                    frames.release()
+                self._video_service.flush_buffer()
+
+                # each tick's phases are counted in the first frame that shows it
+                inputs_time = updates_time = 0.0
+                if frame.get_time() != drawn_time:
+                    inputs_time, updates_time = frame.get_tick_times()
+                    drawn_time = frame.get_time()
+                if profiler is not None:
+                    profiler.record(start, inputs_time, updates_time, clock() - start)
+        finally:
+            stop.set()
+            frames.close()
+            worker.join()
+        if errors:
+            raise errors[0]
+
+    def _simulate(self, cast, frames, input_lock, stop, errors):
+        """Runs ticks on time until stop is set, publishing a copy of the cast after each one. 
+        This is the worker thread of _run_pipelined. Like _run_loop, it never catches up on more 
+        than MAX_CATCH_UP seconds of missed ticks.
+
+        Args:
+            cast (Cast): The cast of actors.
+            frames (FrameBuffer): Where to publish the copies.
+            input_lock (Lock): Held while reading the keyboard.
+            stop (Event): Set when the game is over.
+            errors (list): Where to put an exception that ends the worker, for the main thread.
+        """
+        clock = time.perf_counter
+        tick_length = 1 / self._tick_rate
+        due = clock() + tick_length
+        try:
+            while not stop.is_set():
+                now = clock()
+                if now < due:
+                    stop.wait(due - now)
+                    continue
+                due = max(due, now - MAX_CATCH_UP)
+                with input_lock:
+                    self._get_inputs(cast)
+                inputs_end = clock()
+                self._do_updates(cast)
+                updates_end = clock()
+                frame = frames.get_back()
+                if frame is None:
+                    break
+                frame.copy(cast, due, inputs_end - now, updates_end - inputs_end)
+                frames.publish()
+                due += tick_length
+        except Exception as error:
+            errors.append(error)
+
+    def run_ticks(self, cast, ticks):
+        """Runs the given number of game ticks without opening a window, drawing, or waiting for
+        the frame rate. Used for headless soak tests and throughput measurements.
+
+        Args:
+            cast (Cast): The cast of actors.
+            ticks (int): The number of ticks to run.
+
+        Returns:
+            int: The score after the last tick.
+        """
+        profiler = self._profiler
+        for _ in range(ticks):
+            if profiler is None:
+                self._get_inputs(cast)
+                self._do_updates(cast)
+            else:
+                start = time.perf_counter()
+                self._get_inputs(cast)
+                inputs_end = time.perf_counter()
+                self._do_updates(cast)
+                profiler.record(start, inputs_end - start, time.perf_counter() - inputs_end, 0.0)
+        return self._score
+
+    def get_score(self):
+        """Gets the current score.
+
+        Returns:
+            int: The current score.
+        """
+        return self._score
+
+    def get_state(self):
+        """Gets everything the director keeps between ticks, for a snapshot: the score, the game 
+        velocity, the state of its random number generator and the respawn scheduler's state.
+
+        Returns:
+            dict: score (int), velocity (tuple), random (tuple from getstate) and scheduler 
+                (tuple from RespawnScheduler.get_state).
+        """
+        return {
+            "score": self._score,
+            "velocity": (self._velocity.get_x(), self._velocity.get_y()),
+            "random": self._random.getstate(),
+            "scheduler": self._scheduler.get_state(),
+        }
+
+    def set_state(self, state):
+        """Picks up from a state returned by get_state. The banner is rebuilt on the next tick.
+
+        Args:
+            state (dict): The state to restore.
+        """
+        self._score = state["score"]
+        self._velocity.set(*state["velocity"])
+        self._random.setstate(state["random"])
+        self._scheduler.set_state(*state["scheduler"])
+        self._banner_velocity = None
+        self._banner_score = None
+
+    def get_state_hash(self, cast):
+        """Gets a fingerprint of the game state: the score, the game velocity and the position of
+        every actor. Two games that played out the same way have the same fingerprint.
+
+        Args:
+            cast (Cast): The cast of actors.
+
+        Returns:
+            string: The SHA-1 of the state, in hex.
+        """
+        values = array("i", (self._score, self._velocity.get_y()))
+        for actor in cast.get_all_actors():
+            position = actor.get_position()
+            values.append(position.get_x())
+            values.append(position.get_y())
+        if sys.byteorder == "big":
+            values.byteswap()
+
+        # hashlib is only needed here, so games that never check their state don't load it
+        import hashlib
+        return hashlib.sha1(values.tobytes()).hexdigest()
 
     def _get_inputs(self, cast):
         """Gets directional input from the keyboard and applies it to the robot
@@ -67,9 +330,8 @@ class Director:
         Args:
             cast (Cast): The cast of actors.
         """
-        # get robot and artifacts from cast
+        # get robot from cast
         robot = cast.get_first_actor("robots")
-        artifacts = cast.get_actors("artifacts")
 
         # get input from keyboard service, separate into x and y
         velocity = self._keyboard_service.get_direction()
@@ -94,13 +356,21 @@ class Director:
             if (self._y >= 0 and y > 0 and self._y <= 13) or \
                (self._y <= 14 and y < 0 and self._y > 1):
                 self._y += y
-                self._velocity = Point(0, self._y)
-                for artifact in artifacts:
-                    artifact.set_velocity(Point(0, self._y))
+                self._velocity.set(0, self._y)
+                pool = cast.get_pool("artifacts")
+                if pool is not None:
+                    pool.set_velocity(self._y)
+
+                # a world's artifacts stand still; the camera scrolls at the game velocity instead
+                elif cast.get_world("artifacts") is None:
+
+                    # each kind falls at its own multiple of the game velocity
+                    velocities = cast.get_catalog().get_velocities(self._y)
+                    for artifact in cast.get_actors("artifacts"):
+                        artifact.set_velocity(velocities[artifact.get_type_id()])
         
         # take keyboard input from above, adjust robot velocity left or right
-        velocity = Point(x, 0)
-        robot.set_velocity(velocity)
+        robot.set_velocity(self._scratch.set(x, 0))
 
     def _do_updates(self, cast):
         """Updates the robot's position and resolves any collisions with artifacts.
@@ -110,62 +380,161 @@ class Director:
         Args:
             cast (Cast): The cast of actors.
         """
-        # get banner, robot, and artifacts from cast
+        # get banner and robot from cast
         banner = cast.get_first_actor("banners")
         robot = cast.get_first_actor("robots")
-        artifacts = cast.get_actors("artifacts")
         
-        # if score is zero, alert player how to change game velocity
+        # only rebuild the banner when the velocity or score changed
         self._y = self._velocity.get_y()
-        if self._y == 1:
-            banner.set_text(f"Press up and down arrows to change velocity. Velocity: {self._y} Score: {self._score}")
-        
-        # show artifact velocity and score
-        else:    
-            banner.set_text(f"Velocity: {self._y} Score: {self._score}")
+        if self._y != self._banner_velocity or self._score != self._banner_score:
+            self._banner_velocity = self._y
+            self._banner_score = self._score
+
+            # if velocity is one, alert player how to change game velocity
+            if self._y == 1:
+                banner.set_text(f"Press up and down arrows to change velocity. Velocity: {self._y} Score: {self._score}")
+            
+            # show artifact velocity and score
+            else:    
+                banner.set_text(f"Velocity: {self._y} Score: {self._score}")
         
         # move the robot
         max_x = self._video_service.get_width()
         max_y = self._video_service.get_height()
         robot.move_next(max_x, max_y)
+
+        # a pooled group moves, scores and respawns all of its artifacts at once
+        pool = cast.get_pool("artifacts")
+        if pool is not None:
+            self._score += pool.step(robot.get_position(), max_x, max_y, CELL_SIZE, COLS,
+                robot.get_previous_position())
+            return
+
+        # a streamed world scrolls under the robot instead of its artifacts falling
+        world = cast.get_world("artifacts")
+        if world is not None:
+            self._update_world(cast, world, robot)
+            return
         
+        # an indexed group only needs collision checks in the columns the robot passed over;
+        # every artifact still moves and is checked against the bottom, so the tick stays
+        # linear in the cast. Scores come from the catalog's table of values by type id
+        artifacts = cast.get_actors("artifacts")
+        index = cast.get_spatial_index("artifacts")
+        catalog = cast.get_catalog()
+        values = catalog.get_values()
+        if index is not None:
+            for artifact in artifacts:
+                artifact.move_next(max_x, max_y)
+            columns = swept_columns(robot.get_previous_position().get_x(),
+                robot.get_position().get_x(), CELL_SIZE)
+            for column in columns:
+                for artifact in index.get_actors_at(column):
+                    if self._is_caught(robot, artifact):
+                        self._score += values[artifact.get_type_id()]
+                        self._scheduler.schedule(artifact)
+            for artifact in artifacts:
+                if artifact.get_position().get_y() >= (max_y - 15):
+                    self._scheduler.schedule(artifact)
+
         # update artifacts, adjust score if collision
-        for artifact in artifacts:
-            artifact.move_next(max_x, max_y)
-            artifact_position = artifact.get_position()
-            
-            # if robot and artifact collide, adjust score, change artifact to new location
-            if robot.get_position().get_x() == artifact_position.get_x() and \
-            robot.get_position().get_y() <= artifact_position.get_y() and \
-            (artifact_position.get_y() - robot.get_position().get_y()) <= artifact.get_velocity().get_y():
+        else:
+            for artifact in artifacts:
+                artifact.move_next(max_x, max_y)
+                artifact_position = artifact.get_position()
                 
-                # get value from artifact and adjust score
-                artifact_value = int(artifact.get_message())
-                self._score += artifact_value
+                # if robot and artifact collide, adjust score, send the artifact back to the top
+                if self._is_caught(robot, artifact):
+                    
+                    # get value from artifact and adjust score
+                    artifact_value = values[artifact.get_type_id()]
+                    self._score += artifact_value
+                    self._scheduler.schedule(artifact)
                 
-                # set new column for the artifact at top of screen
-                x = random.randint(1, COLS - 1)
-                position = Point(x, 0)
-                position = position.scale(CELL_SIZE)
-                artifact.set_position(position)   
-            
-            # if no collision, if artifact reaches bottom of screen, reset to new position
-            elif artifact_position.get_y() >= (max_y - 15):
-                
-                # get new column, assign new position to artifact
-                x = random.randint(1, COLS - 1)
-                position = Point(x, 0)
-                position = position.scale(CELL_SIZE)
-                artifact.set_position(position)
+                # if no collision, if artifact reaches bottom of screen, send it back to the top
+                elif artifact_position.get_y() >= (max_y - 15):
+                    self._scheduler.schedule(artifact)
+
+        # respawn this tick's artifacts in one batch
+        self._scheduler.update(cast, "artifacts", catalog.get_velocities(self._velocity.get_y()))
+
+    def _update_world(self, cast, world, robot):
+        """Scrolls a ChunkedWorld one tick at the game velocity, pages its chunks in and out, and 
+        scores and forgets the artifacts the robot caught. On screen the artifacts fall exactly as 
+        fast as the camera climbs, so catches use the same swept test as falling artifacts.
+
+        Args:
+            cast (Cast): The cast of actors.
+            world (ChunkedWorld): The world attached to the artifacts group.
+            robot (Actor): The robot, already moved this tick.
+        """
+        vy = self._velocity.get_y()
+        world.scroll(vy)
+        world.update(cast, "artifacts")
+        camera_y = world.get_camera_y()
+        index = cast.get_spatial_index("artifacts")
+        values = cast.get_catalog().get_values()
+        robot_position = robot.get_position()
+        robot_x = robot_position.get_x()
+        robot_y = robot_position.get_y()
+        previous_x = robot.get_previous_position().get_x()
+        for column in swept_columns(previous_x, robot_x, CELL_SIZE):
+            for artifact in index.get_actors_at(column):
+                position = artifact.get_position()
+                if swept_catch(position.get_x(), position.get_y() - camera_y, vy, previous_x,
+                        robot_x, robot_y, CELL_SIZE):
+                    self._score += values[artifact.get_type_id()]
+                    world.remove(cast, "artifacts", artifact)
 
-    def _do_outputs(self, cast):
+    def _is_caught(self, robot, artifact):
+        """Whether or not the robot caught the artifact during this tick: the artifact crossed the 
+        robot's row on its last move while the robot, moving from its previous column to its 
+        current one, was under it. See collision.swept_catch.
+
+        Args:
+            robot (Actor): The robot.
+            artifact (Artifact): The artifact to test.
+
+        Returns:
+            boolean: True if the artifact was caught; false if otherwise.
+        """
+        robot_position = robot.get_position()
+        artifact_position = artifact.get_position()
+        return swept_catch(artifact_position.get_x(), artifact_position.get_y(),
+            artifact.get_velocity().get_y(), robot.get_previous_position().get_x(),
+            robot_position.get_x(), robot_position.get_y(), CELL_SIZE)
+
+    def _do_outputs(self, cast, alpha = 1.0):
         """Draws the actors on the screen.
         
         Args:
             cast (Cast): The cast of actors.
+            alpha (float): How far between the last two ticks to draw the actors, from 0 to 1.
+        """
+        world = cast.get_world("artifacts")
+        camera_y = 0 if world is None else world.get_camera_y(alpha)
+        self._draw(cast, camera_y, alpha)
+        self._video_service.flush_buffer()
+
+    def _draw(self, cast, camera_y, alpha):
+        """Draws the actors into the video service's buffer, without showing them.
+
+        Args:
+            cast (Cast): The cast of actors, or a Frame copied from one.
+            camera_y (float): The world y at the top of the screen.
+            alpha (float): How far between the last two ticks to draw the actors, from 0 to 1.
         """
-        # send updated cast locations to video_service for drawing 
-        self._video_service.clear_buffer()
-        actors = cast.get_all_actors()
-        self._video_service.draw_actors(actors)
-        self._video_service.flush_buffer()
\ No newline at end of file
+        # only draw the artifacts that can be seen, through the world's camera if there is one,
+        # then the robot and banner over them
+        video_service = self._video_service
+        video_service.clear_buffer()
+        artifacts = self._culler.cull(cast.get_actors("artifacts"), alpha, camera_y,
+            cast.get_pool("artifacts"))
+        video_service.set_camera(0, camera_y)
+        video_service.draw_actors(artifacts, alpha)
+        video_service.set_camera(0, 0)
+        video_service.draw_actors(cast.get_actors("robots"), alpha)
+        video_service.draw_actors(cast.get_actors("banners"), alpha)
+        if self._profiler is not None:
+            video_service.draw_overlay(self._profiler.get_summary_lines() +
+                [self._culler.get_summary_line()])
@@ -0,0 +1,325 @@
+"""
+file: frame_buffer.py
+author: Jerry Lane
+purpose: Lets the game be simulated on one thread and drawn on another.
+After each tick the simulation copies what drawing needs into a Frame: the
+text, color and last two positions of every actor, the pool's arrays and
+the world's camera. A FrameBuffer holds two Frames: the one being drawn
+never changes, while the next tick is copied into the other, and the two
+only swap once the copy is complete, so a frame never shows half of one
+tick and half of the next.
+"""
+# import needed modules
+import threading
+
+from game.shared.point import Point
+
+# the groups a frame keeps, in the order they are drawn
+GROUPS = ("artifacts", "robots", "banners")
+
+
+# class declaration
+class FrozenActor:
+    """A copy of what it takes to draw an actor, taken between ticks.
+
+    The responsibility of a FrozenActor is to stand in for an Actor when drawing, with values that
+    don't change while the real actor moves on.
+
+    Attributes:
+        _text (string): The actor's text.
+        _text_revision (int): The revision of the actor's text.
+        _font_size (int): The actor's font size.
+        _color (Color): The actor's color.
+        _position (Point): The actor's position.
+        _previous_x (int): The actor's x before its last move.
+        _previous_y (int): The actor's y before its last move.
+    """
+    __slots__ = ("_text", "_text_revision", "_font_size", "_color", "_position", "_previous_x",
+        "_previous_y")
+
+    # default constructor
+    def __init__(self):
+        """Constructs a new, blank FrozenActor."""
+        self._text = ""
+        self._text_revision = 0
+        self._font_size = 0
+        self._color = None
+        self._position = Point(0, 0)
+        self._previous_x = 0
+        self._previous_y = 0
+
+    # copy an actor
+    def copy(self, actor):
+        """Copies what drawing needs from the given actor.
+
+        Args:
+            actor (Actor): The actor to copy.
+        """
+        self._text = actor.get_text()
+        self._text_revision = actor.get_text_revision()
+        self._font_size = actor.get_font_size()
+        self._color = actor.get_color()
+        position = actor.get_position()
+        previous = actor.get_previous_position()
+        self._position.set(position.get_x(), position.get_y())
+        self._previous_x = previous.get_x()
+        self._previous_y = previous.get_y()
+
+    def get_color(self):
+        """Gets the actor's color.
+
+        Returns:
+            Color: The actor's color.
+        """
+        return self._color
+
+    def get_font_size(self):
+        """Gets the actor's font size.
+
+        Returns:
+            int: The actor's font size.
+        """
+        return self._font_size
+
+    def get_interpolated_position(self, alpha):
+        """Gets a point part way between the actor's previous and current positions.
+
+        Args:
+            alpha (float): How far along to go, from 0 (previous) to 1 (current).
+
+        Returns:
+            Tuple(float, float): The x and y coordinates.
+        """
+        x = self._previous_x + (self._position.get_x() - self._previous_x) * alpha
+        y = self._previous_y + (self._position.get_y() - self._previous_y) * alpha
+        return (x, y)
+
+    def get_position(self):
+        """Gets the actor's position.
+
+        Returns:
+            Point: The actor's position.
+        """
+        return self._position
+
+    def get_text(self):
+        """Gets the actor's text.
+
+        Returns:
+            string: The actor's text.
+        """
+        return self._text
+
+    def get_text_revision(self):
+        """Gets the revision of the actor's text.
+
+        Returns:
+            int: The text revision.
+        """
+        return self._text_revision
+
+
+# class declaration
+class Frame:
+    """Everything needed to draw one tick of the game.
+
+    The responsibility of a Frame is to answer the drawing code's questions the way the cast
+    would, from copies. Its FrozenActors and pool are reused from one copy to the next, so
+    copying does not allocate once the frame has grown to the cast's size, and actors keep the
+    same stand-in, which keeps the text cache's textures.
+
+    Attributes:
+        _groups (dict): The frozen actors of each group { key: group_name, value: a list }
+        _counts (dict): How many of each group's frozen actors are in use.
+        _pool (ArtifactPool): A copy of the artifacts' pool, or None.
+        _views (list): Views of every row of the copied pool.
+        _camera (tuple): The world camera's y before and after the tick.
+        _time (float): When the tick was due, from time.perf_counter.
+        _inputs_time (float): How long the tick's input phase took.
+        _updates_time (float): How long the tick's update phase took.
+    """
+
+    # default constructor
+    def __init__(self):
+        """Constructs a new, empty Frame."""
+        self._groups = {group: [] for group in GROUPS}
+        self._counts = {group: 0 for group in GROUPS}
+        self._pool = None
+        self._views = []
+        self._camera = (0, 0)
+        self._time = 0.0
+        self._inputs_time = 0.0
+        self._updates_time = 0.0
+
+    # copy the cast
+    def copy(self, cast, time, inputs_time, updates_time):
+        """Copies what drawing needs from the cast, just after a tick.
+
+        Args:
+            cast (Cast): The cast of actors.
+            time (float): When the tick was due, from time.perf_counter.
+            inputs_time (float): How long the tick's input phase took.
+            updates_time (float): How long the tick's update phase took.
+        """
+        pool = cast.get_pool("artifacts")
+        if pool is not None:
+            if self._pool is None or self._pool.get_capacity() != pool.get_capacity():
+                self._pool = type(pool)(pool.get_capacity(), pool.get_font_size())
+                self._views = []
+            self._pool.set_state(*pool.get_state())
+            if len(self._views) != len(pool):
+                self._views = self._pool.create_views()
+        else:
+            self._pool = None
+        for group in GROUPS:
+            if group != "artifacts" or pool is None:
+                self._freeze(group, cast.get_actors(group))
+        world = cast.get_world("artifacts")
+        if world is not None:
+            self._camera = (world.get_camera_y(0), world.get_camera_y(1))
+        self._time = time
+        self._inputs_time = inputs_time
+        self._updates_time = updates_time
+
+    def get_actors(self, group):
+        """Gets the frozen actors of the given group.
+
+        Args:
+            group (string): The name of the group.
+
+        Returns:
+            List: The frozen actors, or views of the copied pool for a pooled group.
+        """
+        if group == "artifacts" and self._pool is not None:
+            return self._views
+        return self._groups[group][:self._counts[group]]
+
+    def get_camera_y(self, alpha):
+        """Gets the world camera's y part way through the tick, or 0 if there is no world.
+
+        Args:
+            alpha (float): How far along the tick, from 0 to 1.
+
+        Returns:
+            float: The camera's y.
+        """
+        previous, current = self._camera
+        return previous + (current - previous) * alpha
+
+    def get_pool(self, group):
+        """Gets the copy of the given group's pool.
+
+        Args:
+            group (string): The name of the group.
+
+        Returns:
+            ArtifactPool: The copy, or None if the group is not pooled.
+        """
+        return self._pool if group == "artifacts" else None
+
+    def get_time(self):
+        """Gets when the tick was due.
+
+        Returns:
+            float: The time, from time.perf_counter.
+        """
+        return self._time
+
+    def get_tick_times(self):
+        """Gets how long the tick's phases took.
+
+        Returns:
+            tuple: The seconds taken by the input and the update phases.
+        """
+        return (self._inputs_time, self._updates_time)
+
+    # copy one group into the reused frozen actors
+    def _freeze(self, group, actors):
+        """Copies the actors of one group, growing its list of frozen actors as needed.
+
+        Args:
+            group (string): The name of the group.
+            actors (Iterable): The actors to copy.
+        """
+        frozen = self._groups[group]
+        count = 0
+        for actor in actors:
+            if count == len(frozen):
+                frozen.append(FrozenActor())
+            frozen[count].copy(actor)
+            count += 1
+        self._counts[group] = count
+
+
+# class declaration
+class FrameBuffer:
+    """Two Frames shared by the thread that simulates and the thread that draws.
+
+    The responsibility of a FrameBuffer is to hand over finished frames without either thread
+    seeing the other's half-done work. The simulation only writes the back frame, waiting if the
+    drawing thread is still reading it; the drawing thread only reads the front frame, which is
+    the last one published.
+
+    Attributes:
+        _frames (list): The two Frames.
+        _front (int): The index of the last frame published.
+        _reading (int): The index of the frame being drawn, or None.
+        _closed (bool): Whether the buffer has been closed.
+        _condition (Condition): Guards the indexes above and wakes waiting threads.
+    """
+
+    # default constructor
+    def __init__(self):
+        """Constructs a new FrameBuffer with two empty Frames."""
+        self._frames = [Frame(), Frame()]
+        self._front = 0
+        self._reading = None
+        self._closed = False
+        self._condition = threading.Condition()
+
+    # get the frame to write into
+    def get_back(self):
+        """Gets the frame to copy the next tick into, once it is not being drawn. Only the
+        simulating thread calls this.
+
+        Returns:
+            Frame: The back frame, or None if the buffer was closed while waiting.
+        """
+        with self._condition:
+            back = 1 - self._front
+            while self._reading == back and not self._closed:
+                self._condition.wait()
+            return None if self._closed else self._frames[back]
+
+    # make the back frame the front one
+    def publish(self):
+        """Swaps the frames, once the back frame holds a complete tick."""
+        with self._condition:
+            self._front = 1 - self._front
+            self._condition.notify_all()
+
+    # take the front frame for drawing
+    def acquire(self):
+        """Gets the last frame published and keeps it from being written until release. Only the
+        drawing thread calls this.
+
+        Returns:
+            Frame: The front frame.
+        """
+        with self._condition:
+            self._reading = self._front
+            return self._frames[self._front]
+
+    # let the frame being drawn be written again
+    def release(self):
+        """Lets the frame taken by acquire be written again."""
+        with self._condition:
+            self._reading = None
+            self._condition.notify_all()
+
+    # stop handing out frames
+    def close(self):
+        """Closes the buffer, waking a simulating thread waiting in get_back."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
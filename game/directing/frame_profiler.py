@@ -0,0 +1,160 @@
+"""
+file: frame_profiler.py
+author: Jerry Lane
+purpose: The FrameProfiler class records how long each phase of a frame
+(input, update, output) takes, keeps the most recent frames in a ring
+buffer, and summarizes them as percentiles and dropped-frame counts.
+"""
+# the phases of a frame, in the order the Director runs them
+PHASES = ("inputs", "updates", "outputs")
+
+# class declaration
+class FrameProfiler:
+    """Wall-clock timing of the Director's game loop.
+
+    The responsibility of a FrameProfiler is to collect per-phase frame times without slowing the 
+    loop down, and to report them on request.
+
+    Attributes:
+        _capacity (int): The number of frames kept in the ring buffer.
+        _budget (float): The seconds a frame may take at the target frame rate.
+        _times (list): One preallocated list of seconds per phase, plus one for the frame period.
+        _count (int): The number of frames recorded so far.
+        _dropped (int): The number of frames whose period went over budget.
+        _last_start (float): When the previous frame started, or None.
+        _refresh (int): How many frames the on-screen summary is reused for.
+        _summary (list): The last on-screen summary.
+        _summary_frame (int): The frame count when the summary was made.
+    """
+
+    # default constructor
+    def __init__(self, frame_rate, capacity = 1024):
+        """Constructs a new FrameProfiler.
+
+        Args:
+            frame_rate (int): The target frames per second, used to decide which frames dropped.
+            capacity (int): The number of recent frames to keep.
+        """
+        self._capacity = capacity
+        self._budget = 1 / frame_rate
+        self._times = [[0.0] * capacity for _ in range(len(PHASES) + 1)]
+        self._count = 0
+        self._dropped = 0
+        self._last_start = None
+        self._refresh = max(1, int(frame_rate))
+        self._summary = None
+        self._summary_frame = 0
+
+    # record one frame
+    def record(self, start, inputs_time, updates_time, outputs_time):
+        """Records a frame's start time and how long each of its phases took.
+
+        Args:
+            start (float): When the frame started, from time.perf_counter.
+            inputs_time (float): Seconds spent getting inputs.
+            updates_time (float): Seconds spent updating the game.
+            outputs_time (float): Seconds spent drawing.
+        """
+        slot = self._count % self._capacity
+        times = self._times
+        times[0][slot] = inputs_time
+        times[1][slot] = updates_time
+        times[2][slot] = outputs_time
+
+        # a frame is dropped when it started more than half a frame late
+        period = 0.0 if self._last_start is None else start - self._last_start
+        times[3][slot] = period
+        if period > self._budget * 1.5:
+            self._dropped += 1
+        self._last_start = start
+        self._count += 1
+
+    # get the number of frames recorded
+    def get_frame_count(self):
+        """Gets the number of frames recorded since the profiler was created.
+
+        Returns:
+            int: The number of frames.
+        """
+        return self._count
+
+    # get the number of dropped frames
+    def get_dropped_frames(self):
+        """Gets the number of frames that started more than half a frame late.
+
+        Returns:
+            int: The number of dropped frames.
+        """
+        return self._dropped
+
+    # summarize the frames in the ring buffer
+    def get_stats(self):
+        """Gets p50, p95 and p99 milliseconds for each phase and the frame period, over the frames
+        still in the ring buffer.
+
+        Returns:
+            dict: { key: phase name, value: { "p50": ms, "p95": ms, "p99": ms } }
+        """
+        size = min(self._count, self._capacity)
+        stats = {}
+        for name, times in zip(PHASES + ("period",), self._times):
+            ordered = sorted(times[:size])
+            stats[name] = {
+                label: (ordered[min(size - 1, int(size * q))] * 1000 if size else 0.0)
+                for label, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+            }
+        return stats
+
+    # text for the on-screen overlay
+    def get_summary_lines(self):
+        """Gets a few short lines describing the recent frames, for drawing on screen. The lines 
+        are rebuilt about once a second, so drawing them every frame stays cheap.
+
+        Returns:
+            List: The lines of text.
+        """
+        if self._summary is not None and self._count - self._summary_frame < self._refresh:
+            return self._summary
+        stats = self.get_stats()
+        lines = []
+        for name in PHASES + ("period",):
+            phase = stats[name]
+            lines.append(f"{name}: {phase['p50']:.2f} / {phase['p95']:.2f} / {phase['p99']:.2f} ms")
+        lines.append(f"dropped: {self._dropped} of {self._count}")
+        self._summary = lines
+        self._summary_frame = self._count
+        return lines
+
+    # write the recorded frames to a file
+    def dump(self, path):
+        """Writes the frames still in the ring buffer to a file, oldest first. A path ending in
+        .json gets the frames plus the summary as JSON; anything else gets CSV.
+
+        Args:
+            path (string): The file to write.
+        """
+        size = min(self._count, self._capacity)
+        first = self._count - size
+        rows = []
+        for frame in range(first, self._count):
+            slot = frame % self._capacity
+            rows.append([frame] + [times[slot] * 1000 for times in self._times])
+
+        # the writers are only imported when a trace is actually written
+        columns = ["frame"] + [f"{name}_ms" for name in PHASES + ("period",)]
+        if path.endswith(".json"):
+            import json
+            trace = {
+                "frames": [dict(zip(columns, row)) for row in rows],
+                "stats": self.get_stats(),
+                "dropped": self._dropped,
+                "frame_count": self._count,
+            }
+            with open(path, "w") as file:
+                json.dump(trace, file, indent=1)
+        else:
+            import csv
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(columns)
+                writer.writerows(rows)
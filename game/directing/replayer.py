@@ -0,0 +1,37 @@
+"""
+file: replayer.py
+author: Jerry Lane
+purpose: Plays a recorded game back without a window, as fast as the CPU
+allows, and checks that it ends with the same score and state as when it
+was recorded.
+"""
+# import needed modules
+import random
+
+from game.casting.artifact_catalog import parse_catalog
+from game.casting.cast_factory import create_cast, CELL_SIZE, MAX_X, MAX_Y
+from game.casting.respawn_scheduler import parse_curve
+from game.directing.director import Director
+from game.services.input_recording import Recording, ReplayKeyboardService
+from game.services.null_video_service import NullVideoService
+
+
+def replay(path):
+    """
+    parameters: path - the recording file to play back
+    return: a tuple of (recording, score, state_hash)
+    The replay function rebuilds the recorded game from its seed, feeds it
+    the recorded input one tick at a time and returns how it ended. The game
+    matches the recording when score and state_hash equal the recording's
+    final_score and state_hash.
+    """
+    recording = Recording.load(path)
+    rng = random.Random(recording.seed)
+    catalog = parse_catalog(recording.catalog) if recording.catalog else None
+    cast = create_cast(recording.artifact_count, recording.pooled, rng, catalog)
+    keyboard_service = ReplayKeyboardService(recording, CELL_SIZE)
+    video_service = NullVideoService(MAX_X, MAX_Y, CELL_SIZE)
+    spawn_curve = parse_curve(recording.spawn_rate) if recording.spawn_rate else None
+    director = Director(keyboard_service, video_service, rng = rng, spawn_curve = spawn_curve)
+    score = director.run_ticks(cast, len(recording.inputs))
+    return recording, score, director.get_state_hash(cast)
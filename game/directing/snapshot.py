@@ -0,0 +1,452 @@
+"""
+file: snapshot.py
+author: Jerry Lane
+purpose: Saves a whole game in progress to a compact binary file and
+restores it, so long runs can be checkpointed, a game can be forked from
+any point, and a bug report can ship the exact state it happened in.
+
+File layout (little-endian; every array starts on an 8-byte boundary, so
+the file can be memory-mapped and the arrays read in place):
+    header     magic "GRSN", version, score, velocity x and y, group count
+    catalog    the cast's ArtifactCatalog in its JSON file format
+    random     getstate() of the director's generator: version, whether a
+               gauss value is pending and its value, then the words as uint32
+    scheduler  tick, pre-drawn columns as int32, then the waiting artifacts
+               as an actor block
+    groups     per group: name, flags (indexed, pooled), then an actor block,
+               or a pool block for pooled groups; indexed groups are followed
+               by the order of the actors in their ColumnIndex as uint32
+Actor block: count, kinds (0 Actor, 1 Artifact) as uint8, type ids as
+uint16, then x, y,
+previous x, previous y, velocity x, velocity y and font size as int32
+columns, colors as uint8 (r, g, b, a), then texts and messages as UTF-8
+with uint32 offsets.
+Pool block: capacity, font size, row count, then the pool's columns and the
+NumPy generator state as JSON.
+"""
+# import needed modules
+import mmap
+import struct
+import sys
+from array import array
+
+from game.casting.actor import Actor
+from game.casting.artifact import Artifact
+from game.casting.artifact_catalog import parse_catalog
+from game.casting.cast import Cast
+from game.shared.color import Color
+from game.shared.point import Point
+
+MAGIC = b"GRSN"
+VERSION = 2
+HEADER = struct.Struct("<4sHiiiH")
+RANDOM = struct.Struct("<I?d")
+GROUP_INDEXED = 1
+GROUP_POOLED = 2
+KIND_ACTOR = 0
+KIND_ARTIFACT = 1
+ALIGNMENT = 8
+
+
+def save_snapshot(path, director, cast):
+    """
+    parameters: path - the file to write
+                director - the Director running the game
+                cast - the game's cast
+    return: nothing
+    The save_snapshot function writes the game's full state to a file.
+    Take snapshots between ticks, never during one.
+    """
+    with open(path, "wb") as file:
+        file.write(pack_snapshot(director, cast))
+
+
+def load_snapshot(path):
+    """
+    parameters: path - the file to read
+    return: a tuple of (cast, state)
+    The load_snapshot function memory-maps a snapshot file and rebuilds the
+    cast and the director's state from it. Pass the state to
+    Director.set_state on a director made with the same spawn curve as the
+    saved game.
+    """
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # the map closes itself once nothing read from it is left
+    return unpack_snapshot(data)
+
+
+def pack_snapshot(director, cast):
+    """
+    parameters: director - the Director running the game
+                cast - the game's cast
+    return: the snapshot as bytes
+    The pack_snapshot function encodes the game's full state. Together
+    with unpack_snapshot it forks a game in memory without touching disk.
+    Take snapshots between ticks, never during one. Casts streamed from a
+    ChunkedWorld can't be snapshotted; their world is rebuilt from its seed
+    or file instead.
+    """
+    groups = cast.get_groups()
+    for group in groups:
+        if cast.get_world(group) is not None:
+            raise ValueError(f"group {group} is streamed from a world and can't be snapshotted")
+    state = director.get_state()
+    writer = _Writer()
+    velocity_x, velocity_y = state["velocity"]
+    writer.write(HEADER.pack(MAGIC, VERSION, state["score"], velocity_x, velocity_y,
+        len(groups)))
+    catalog = cast.get_catalog().to_json().encode()
+    writer.write(struct.pack("<I", len(catalog)) + catalog)
+
+    # the director's random numbers
+    version, words, gauss = state["random"]
+    writer.write(RANDOM.pack(version, gauss is not None, gauss or 0.0))
+    writer.write_array(array("I", words))
+
+    # the respawn scheduler and the artifacts waiting off screen
+    tick, columns, waiting = state["scheduler"]
+    writer.write(struct.pack("<I", tick))
+    writer.write_array(array("i", columns))
+    _pack_actors(writer, waiting)
+
+    # every group, in order, so the restored cast iterates the same way
+    for group in groups:
+        name = group.encode()
+        pool = cast.get_pool(group)
+        flags = GROUP_POOLED if pool is not None else 0
+        if cast.get_spatial_index(group) is not None:
+            flags |= GROUP_INDEXED
+        writer.write(struct.pack("<HB", len(name), flags) + name)
+        if pool is not None:
+            _pack_pool(writer, pool)
+            continue
+        actors = cast.get_actors(group)
+        _pack_actors(writer, actors)
+
+        # the order within each column decides which of two artifacts caught together
+        # respawns first, so it is kept too
+        index = cast.get_spatial_index(group)
+        if index is not None:
+            positions = {actor: position for position, actor in enumerate(actors)}
+            writer.write_array(array("I", [positions[actor] for actor in index.get_actors()]))
+    return writer.getvalue()
+
+
+def unpack_snapshot(data):
+    """
+    parameters: data - the snapshot, as bytes or any buffer
+    return: a tuple of (cast, state)
+    The unpack_snapshot function rebuilds the cast and the director's state
+    from a snapshot made by pack_snapshot, like load_snapshot.
+    """
+    reader = _Reader(data)
+    magic, version, score, velocity_x, velocity_y, group_count = reader.read(HEADER)
+    if magic != MAGIC:
+        raise ValueError("not a Greed snapshot")
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    length, = reader.read(struct.Struct("<I"))
+    catalog = parse_catalog(bytes(reader.read_bytes(length)))
+    random_version, has_gauss, gauss = reader.read(RANDOM)
+    words = tuple(reader.read_array("I"))
+    tick, = reader.read(struct.Struct("<I"))
+    columns = reader.read_array("i").tolist()
+    waiting = _unpack_actors(reader)
+
+    # rebuild the cast group by group
+    cast = Cast()
+    cast.set_catalog(catalog)
+    for _ in range(group_count):
+        length, flags = reader.read(struct.Struct("<HB"))
+        group = bytes(reader.read_bytes(length)).decode()
+        if flags & GROUP_POOLED:
+            cast.attach_pool(group, _unpack_pool(reader, catalog))
+            continue
+        actors = _unpack_actors(reader)
+        for actor in actors:
+            cast.add_actor(group, actor)
+        if flags & GROUP_INDEXED:
+            index = cast.add_spatial_index(group)
+            for position in reader.read_array("I"):
+                index.remove(actors[position])
+                index.add(actors[position])
+
+    state = {
+        "score": score,
+        "velocity": (velocity_x, velocity_y),
+        "random": (random_version, words, gauss if has_gauss else None),
+        "scheduler": (tick, columns, waiting),
+    }
+    return cast, state
+
+
+def _pack_actors(writer, actors):
+    """
+    parameters: writer - the _Writer to append to
+                actors - the actors to encode
+    return: nothing
+    The _pack_actors function writes an actor block, one column at a time.
+    """
+    actors = list(actors)
+    kinds = array("B", (KIND_ARTIFACT if isinstance(actor, Artifact) else KIND_ACTOR
+        for actor in actors))
+    type_ids = array("H", (actor.get_type_id() if isinstance(actor, Artifact) else 0
+        for actor in actors))
+    numbers = array("i")
+    colors = array("B")
+    texts = []
+    messages = []
+    for actor in actors:
+        position = actor.get_position()
+        previous = actor.get_previous_position()
+        velocity = actor.get_velocity()
+        numbers.extend((position.get_x(), position.get_y(), previous.get_x(), previous.get_y(),
+            velocity.get_x(), velocity.get_y(), actor.get_font_size()))
+        colors.extend(actor.get_color().to_tuple())
+        texts.append(actor.get_text())
+        messages.append(actor.get_message() if isinstance(actor, Artifact) else "")
+    writer.write(struct.pack("<I", len(actors)))
+    writer.write_array(kinds)
+    writer.write_array(type_ids)
+    writer.write_array(numbers)
+    writer.write_array(colors)
+    _pack_strings(writer, texts)
+    _pack_strings(writer, messages)
+
+
+def _unpack_actors(reader):
+    """
+    parameters: reader - the _Reader to read from
+    return: a list of the actors in the block
+    The _unpack_actors function rebuilds the actors of an actor block.
+    """
+    count, = reader.read(struct.Struct("<I"))
+    kinds = reader.read_array("B")
+    type_ids = reader.read_array("H")
+    numbers = reader.read_array("i")
+    colors = reader.read_array("B")
+    texts = _unpack_strings(reader, count)
+    messages = _unpack_strings(reader, count)
+    actors = []
+    point = Point(0, 0)
+    for index in range(count):
+        x, y, previous_x, previous_y, velocity_x, velocity_y, font_size = \
+            numbers[index * 7:index * 7 + 7]
+        if kinds[index] == KIND_ARTIFACT:
+            actor = Artifact()
+            actor.set_message(messages[index])
+            actor.set_type_id(type_ids[index])
+        else:
+            actor = Actor()
+        actor.set_text(texts[index])
+        actor.set_font_size(font_size)
+        actor.set_color(Color(*colors[index * 4:index * 4 + 4]))
+        actor.set_position(point.set(x, y))
+        actor.set_previous_position(point.set(previous_x, previous_y))
+        actor.set_velocity(point.set(velocity_x, velocity_y))
+        actors.append(actor)
+    return actors
+
+
+def _pack_pool(writer, pool):
+    """
+    parameters: writer - the _Writer to append to
+                pool - the ArtifactPool to encode
+    return: nothing
+    The _pack_pool function writes a pool block.
+    """
+    import json
+    columns, rng_state = pool.get_state()
+    writer.write(struct.pack("<IHI", pool.get_capacity(), pool.get_font_size(), len(pool)))
+    for column in columns:
+        writer.write_array(column)
+    rng_state = json.dumps(rng_state).encode()
+    writer.write(struct.pack("<I", len(rng_state)) + rng_state)
+
+
+def _unpack_pool(reader, catalog):
+    """
+    parameters: reader - the _Reader to read from
+                catalog - the ArtifactCatalog the pool's type ids refer to
+    return: the restored ArtifactPool
+    The _unpack_pool function rebuilds a pool from a pool block. NumPy is
+    only needed for snapshots of pooled games.
+    """
+    import json
+    import numpy
+    from game.casting.artifact_pool import ArtifactPool
+    capacity, font_size, size = reader.read(struct.Struct("<IHI"))
+    pool = ArtifactPool(capacity, font_size, catalog=catalog)
+    columns = []
+    for dtype in ("<i4", "<i4", "<i4", "<i4", "<i4", "u1", "<u4", "<u2"):
+        column = numpy.frombuffer(reader.read_block(), dtype=dtype)
+        columns.append(column.reshape(size, 4) if dtype == "u1" else column)
+    length, = reader.read(struct.Struct("<I"))
+    pool.set_state(columns, json.loads(bytes(reader.read_bytes(length))))
+    return pool
+
+
+def _pack_strings(writer, strings):
+    """
+    parameters: writer - the _Writer to append to
+                strings - the strings to encode
+    return: nothing
+    The _pack_strings function writes the strings as one UTF-8 blob with
+    the offset of each one.
+    """
+    encoded = [text.encode() for text in strings]
+    offsets = array("I", [0])
+    total = 0
+    for text in encoded:
+        total += len(text)
+        offsets.append(total)
+    writer.write_array(offsets)
+    writer.write_array(b"".join(encoded))
+
+
+def _unpack_strings(reader, count):
+    """
+    parameters: reader - the _Reader to read from
+                count - the number of strings
+    return: a list of the strings
+    The _unpack_strings function reads strings written by _pack_strings.
+    """
+    offsets = reader.read_array("I")
+    blob = bytes(reader.read_block())
+    return [blob[offsets[index]:offsets[index + 1]].decode() for index in range(count)]
+
+
+# class declaration
+class _Writer:
+    """Collects the pieces of a snapshot.
+
+    Attributes:
+        _chunks (list): The bytes written so far.
+        _size (int): Their total length.
+    """
+
+    # default constructor
+    def __init__(self):
+        """Constructs a new, empty _Writer."""
+        self._chunks = []
+        self._size = 0
+
+    # append bytes
+    def write(self, data):
+        """Appends bytes.
+
+        Args:
+            data (bytes): The bytes to append.
+        """
+        self._chunks.append(data)
+        self._size += len(data)
+
+    # append an aligned, length-prefixed array
+    def write_array(self, values):
+        """Appends the byte length of an array, padding up to the next 8-byte boundary, and then 
+        the array's bytes in little-endian order.
+
+        Args:
+            values (array): An array.array, NumPy array or bytes.
+        """
+        if hasattr(values, "dtype"):
+            data = values.astype(values.dtype.newbyteorder("<"), copy=False).tobytes()
+        elif hasattr(values, "tobytes"):
+            data = values.tobytes()
+        else:
+            data = bytes(values)
+        if sys.byteorder == "big" and isinstance(values, array):
+            swapped = array(values.typecode, values)
+            swapped.byteswap()
+            data = swapped.tobytes()
+        self.write(struct.pack("<Q", len(data)))
+        self.write(bytes(-self._size % ALIGNMENT))
+        self.write(data)
+
+    # join the pieces
+    def getvalue(self):
+        """Gets everything written so far.
+
+        Returns:
+            bytes: The snapshot.
+        """
+        return b"".join(self._chunks)
+
+
+# class declaration
+class _Reader:
+    """Reads the pieces of a snapshot in order, without copying the arrays.
+
+    Attributes:
+        _data (memoryview): The snapshot.
+        _offset (int): Where the next read starts.
+    """
+
+    # default constructor
+    def __init__(self, data):
+        """Constructs a new _Reader.
+
+        Args:
+            data (buffer): The snapshot.
+        """
+        self._data = memoryview(data)
+        self._offset = 0
+
+    # read a fixed-size record
+    def read(self, record):
+        """Reads one record.
+
+        Args:
+            record (Struct): The record layout.
+
+        Returns:
+            tuple: The record's fields.
+        """
+        values = record.unpack_from(self._data, self._offset)
+        self._offset += record.size
+        return values
+
+    # read raw bytes
+    def read_bytes(self, length):
+        """Reads the given number of bytes.
+
+        Args:
+            length (int): The number of bytes.
+
+        Returns:
+            memoryview: The bytes, in place.
+        """
+        data = self._data[self._offset:self._offset + length]
+        if len(data) != length:
+            raise ValueError("snapshot is truncated")
+        self._offset += length
+        return data
+
+    # read an aligned block written by write_array
+    def read_block(self):
+        """Reads an array's bytes, skipping the padding in front of them.
+
+        Returns:
+            memoryview: The bytes, in place.
+        """
+        length, = self.read(struct.Struct("<Q"))
+        self._offset += -self._offset % ALIGNMENT
+        return self.read_bytes(length)
+
+    # read an array written by write_array
+    def read_array(self, typecode):
+        """Reads an array written by write_array.
+
+        Args:
+            typecode (string): The array.array typecode it was written with.
+
+        Returns:
+            array: The values.
+        """
+        values = array(typecode)
+        values.frombytes(self.read_block())
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
@@ -0,0 +1,76 @@
+"""
+file: startup_report.py
+author: Jerry Lane
+purpose: Measures how long the game takes to start. It runs the game again
+in a child interpreter with Python's -X importtime option, and breaks the
+import time down by module and package. Short-lived processes like the batch
+tools spend most of their time here.
+"""
+# import needed modules
+import subprocess
+import sys
+import time
+
+
+def measure_startup(script, arguments):
+    """
+    parameters: script - the path of the program to run
+                arguments - its command line arguments
+    return: a tuple of (return code, seconds, imports), where imports is a
+            list of (name, depth, self us, cumulative us) in import order
+    The measure_startup function runs the program in a new interpreter with
+    -X importtime. Its output is passed through, and stderr is passed
+    through too, apart from the import timings it collects.
+    """
+    start = time.perf_counter()
+    child = subprocess.run([sys.executable, "-X", "importtime", script] + list(arguments),
+        stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    imports = []
+    for line in child.stderr.splitlines():
+        if not line.startswith("import time:"):
+            print(line, file=sys.stderr)
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), depth, int(fields[0]), int(fields[1])))
+    return child.returncode, elapsed, imports
+
+
+def format_report(elapsed, imports, top = 10):
+    """
+    parameters: elapsed - the seconds the program ran for
+                imports - the imports, as returned by measure_startup
+                top - how many lines to show in each table
+    return: a list of lines of text
+    The format_report function summarizes the imports: the total, the
+    packages that took longest, and the slowest imports counting and not
+    counting what they imported in turn.
+    """
+    total = sum(own for _, _, own, _ in imports)
+    lines = [f"ran for {elapsed * 1000:.1f} ms, {total / 1000:.1f} ms of it importing "
+        f"{len(imports)} modules"]
+
+    # own time summed by top-level package
+    packages = {}
+    for name, _, own, _ in imports:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + own
+    lines.append("by package (ms):")
+    for package, own in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        lines.append(f"  {own / 1000:8.2f}  {package}")
+
+    # what each import cost including the imports it made
+    lines.append("slowest imports, including what they imported (ms):")
+    outermost = [entry for entry in imports if entry[1] == 0]
+    for name, _, _, cumulative in sorted(outermost, key=lambda entry: -entry[3])[:top]:
+        lines.append(f"  {cumulative / 1000:8.2f}  {name}")
+
+    # what each module cost on its own
+    lines.append("slowest modules on their own (ms):")
+    for name, _, own, _ in sorted(imports, key=lambda entry: -entry[2])[:top]:
+        lines.append(f"  {own / 1000:8.2f}  {name}")
+    return lines
@@ -0,0 +1,172 @@
+"""
+file: vector_env.py
+author: Jerry Lane
+purpose: The VectorEnv class runs thousands of independent Greed games in
+lockstep over shared NumPy arrays, for training automated players. It
+follows the same rules as Director._get_inputs and Director._do_updates;
+the artifacts are moved with the same fall function the ArtifactPool uses.
+"""
+# numpy is needed for the shared arrays
+import numpy
+
+from game.casting.artifact_pool import fall
+
+# set defaults, matching the game
+MAX_X = 900
+MAX_Y = 600
+CELL_SIZE = 15
+COLS = 60
+ROWS = 40
+DEFAULT_ARTIFACTS = 40
+MIN_VELOCITY = 1
+MAX_VELOCITY = 14
+
+# the nine actions, as (dx, dy): action = (dx + 1) * 3 + (dy + 1), as in input recordings
+ACTION_DX = numpy.array([-1, -1, -1, 0, 0, 0, 1, 1, 1], dtype=numpy.int32)
+ACTION_DY = numpy.array([-1, 0, 1, -1, 0, 1, -1, 0, 1], dtype=numpy.int32)
+
+# class declaration
+class VectorEnv:
+    """Many games stepped together.
+
+    The responsibility of a VectorEnv is to hold the state of every game in arrays with one row 
+    per game and to advance all of them with one call. A game that reaches episode_ticks is 
+    reported as done and starts over on the same step.
+
+    Attributes:
+        _artifact_count (int): The number of artifacts in each game.
+        _episode_ticks (int): How many ticks a game lasts.
+        _rng (Generator): The random numbers for every game.
+        _robot_x (ndarray): The robot's x coordinate in each game.
+        _velocity (ndarray): The game velocity of each game.
+        _ticks (ndarray): The ticks played so far in each game.
+        _score (ndarray): The score of each game.
+        _x, _y, _previous_y, _value (ndarray): The artifacts, one row per game.
+    """
+
+    # default constructor
+    def __init__(self, artifact_count = DEFAULT_ARTIFACTS, episode_ticks = 1000, seed = None):
+        """Constructs a new VectorEnv. Call reset before stepping it.
+
+        Args:
+            artifact_count (int): The number of artifacts in each game.
+            episode_ticks (int): How many ticks a game lasts before it is done.
+            seed (int): A seed for the random numbers.
+        """
+        self._artifact_count = artifact_count
+        self._episode_ticks = episode_ticks
+        self._rng = numpy.random.default_rng(seed)
+        self.reset(0)
+
+    # start n new games
+    def reset(self, n):
+        """Replaces every game with n new ones.
+
+        Args:
+            n (int): The number of games.
+
+        Returns:
+            dict: The observations, as returned by step.
+        """
+        shape = (n, self._artifact_count)
+        self._robot_x = numpy.full(n, MAX_X // 2, dtype=numpy.int32)
+        self._robot_y = MAX_Y - 15
+        self._velocity = numpy.full(n, MIN_VELOCITY, dtype=numpy.int32)
+        self._ticks = numpy.zeros(n, dtype=numpy.int32)
+        self._score = numpy.zeros(n, dtype=numpy.int32)
+        self._x = numpy.zeros(shape, dtype=numpy.int32)
+        self._y = numpy.zeros(shape, dtype=numpy.int32)
+        self._previous_y = numpy.zeros(shape, dtype=numpy.int32)
+        self._value = numpy.zeros(shape, dtype=numpy.int32)
+        self._reset_games(numpy.ones(n, dtype=bool))
+        return self._observations()
+
+    # get the number of games
+    def get_size(self):
+        """Gets the number of games.
+
+        Returns:
+            int: The number of games.
+        """
+        return len(self._robot_x)
+
+    # advance every game by one tick
+    def step(self, actions):
+        """Applies one action to each game and advances every game by one tick.
+
+        Args:
+            actions (ndarray): One action (0 to 8) per game; see ACTION_DX and ACTION_DY.
+
+        Returns:
+            tuple: (observations, rewards, dones). observations is the dict described in 
+                _observations, rewards is each game's change in score and dones marks the games 
+                that just finished and were started over.
+        """
+        actions = numpy.asarray(actions)
+        dx = ACTION_DX[actions]
+        dy = ACTION_DY[actions]
+
+        # up and down change the game velocity within its limits, as in Director._get_inputs
+        velocity = self._velocity
+        velocity += ((dy > 0) & (velocity < MAX_VELOCITY)).astype(numpy.int32)
+        velocity -= ((dy < 0) & (velocity > MIN_VELOCITY)).astype(numpy.int32)
+
+        # left and right move the robot one cell, wrapping around the screen; like an Actor, a
+        # robot that wrapped counts as having jumped there, not slid across the screen
+        robot_x = self._robot_x
+        robot_previous_x = robot_x.copy()
+        robot_x += dx * CELL_SIZE
+        wrapped = (robot_x < 0) | (robot_x >= MAX_X)
+        numpy.remainder(robot_x, MAX_X, out=robot_x)
+        robot_previous_x[wrapped] = robot_x[wrapped]
+
+        # move the artifacts, catch and respawn them, with one row per game
+        caught = fall(self._x, self._y, self._previous_y, velocity[:, None],
+            robot_previous_x[:, None], robot_x[:, None], self._robot_y, MAX_Y, CELL_SIZE, COLS,
+            self._rng)
+        rewards = (self._value * caught).sum(axis=1, dtype=numpy.int32)
+        self._score += rewards
+
+        # finished games start over straight away
+        self._ticks += 1
+        dones = self._ticks >= self._episode_ticks
+        if dones.any():
+            self._reset_games(dones)
+        return self._observations(), rewards, dones
+
+    # get the state the player can see
+    def _observations(self):
+        """Gets the observations of every game. The arrays are the environment's own, not 
+        copies; copy them if they need to outlive the next step.
+
+        Returns:
+            dict: robot_x (n), velocity (n), score (n), artifact_x (n, artifacts), 
+                artifact_y (n, artifacts) and artifact_value (n, artifacts).
+        """
+        return {
+            "robot_x": self._robot_x,
+            "velocity": self._velocity,
+            "score": self._score,
+            "artifact_x": self._x,
+            "artifact_y": self._y,
+            "artifact_value": self._value,
+        }
+
+    # start some games over
+    def _reset_games(self, games):
+        """Starts the selected games over, scattering new artifacts as create_cast does.
+
+        Args:
+            games (ndarray): A boolean mask of the games to start over.
+        """
+        count = int(numpy.count_nonzero(games))
+        shape = (count, self._artifact_count)
+        rng = self._rng
+        self._robot_x[games] = MAX_X // 2
+        self._velocity[games] = MIN_VELOCITY
+        self._ticks[games] = 0
+        self._score[games] = 0
+        self._x[games] = rng.integers(1, COLS, size=shape, dtype=numpy.int32) * CELL_SIZE
+        self._y[games] = rng.integers(1, ROWS, size=shape, dtype=numpy.int32) * CELL_SIZE
+        self._previous_y[games] = self._y[games]
+        self._value[games] = numpy.where(rng.integers(0, 2, size=shape) == 0, 1, -1)
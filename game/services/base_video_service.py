@@ -0,0 +1,161 @@
+"""
+file: base_video_service.py
+author: Jerry Lane
+This class describes what every video service (raylib window, terminal,
+or none at all) must be able to do, so the Director can draw to any of
+them.
+"""
+# import needed modules
+from abc import ABC, abstractmethod
+
+
+# class declaration
+class BaseVideoService(ABC):
+    """The interface shared by all video services.
+
+    The responsibility of a video service is to draw the game state. Subclasses must implement
+    the abstract methods open_window, close_window, is_window_open, clear_buffer, draw_actor and 
+    flush_buffer, or they can't be constructed; the rest have working defaults.
+
+    Attributes:
+        _width (int): The width of the playfield.
+        _height (int): The height of the playfield.
+        _cell_size (int): The size of a cell in the display grid.
+        _camera_x (float): The x of the playfield's left edge in the world actors are drawn from.
+        _camera_y (float): The y of the playfield's top edge in the world actors are drawn from.
+    """
+
+    # default constructor
+    def __init__(self, width, height, cell_size):
+        """Constructs a new video service for a playfield of the given size.
+
+        Args:
+            width (int): The width of the playfield.
+            height (int): The height of the playfield.
+            cell_size (int): The size of a cell in the display grid.
+        """
+        self._width = width
+        self._height = height
+        self._cell_size = cell_size
+        self._camera_x = 0
+        self._camera_y = 0
+
+    # close_window shuts down game
+    @abstractmethod
+    def close_window(self):
+        """Closes the window and releases all computing resources."""
+
+    # clear buffer method clears the buffer, readying for new drawing
+    @abstractmethod
+    def clear_buffer(self):
+        """Clears the buffer in preparation for the next rendering. This method should be called at
+        the beginning of the game's output phase.
+        """
+
+    # draw_actor method draws one actor
+    @abstractmethod
+    def draw_actor(self, actor, alpha = 1.0):
+        """Draws the given actor.
+
+        Args:
+            actor (Actor): The actor to draw.
+            alpha (float): How far between the actor's previous and current positions to draw it.
+        """
+
+    # draw actors method draws each actor in turn
+    def draw_actors(self, actors, alpha = 1.0):
+        """Draws the given actors.
+
+        Args:
+            actors (list): A list of actors to draw.
+            alpha (float): How far between each actor's previous and current positions to draw it.
+        """
+        for actor in actors:
+            self.draw_actor(actor, alpha)
+
+    # draw_overlay method draws lines of diagnostic text
+    def draw_overlay(self, lines):
+        """Draws lines of diagnostic text over the game. Does nothing unless overridden.
+
+        Args:
+            lines (list): The lines of text to draw.
+        """
+        pass
+
+    # flush_buffer method shows what was drawn
+    @abstractmethod
+    def flush_buffer(self):
+        """Shows what was drawn since clear_buffer. This method should be called at the end of
+        the game's output phase.
+        """
+
+    # get_cell_size method returns the cell size
+    def get_cell_size(self):
+        """Gets the cell size.
+        
+        Returns:
+            int: The cell size.
+        """
+        return self._cell_size
+
+    # set_cell_size method changes the cell size
+    def set_cell_size(self, cell_size):
+        """Updates the cell size.
+        
+        Args:
+            cell_size (int): The new cell size.
+        """
+        self._cell_size = cell_size
+
+    # get_camera method returns where drawing is offset from
+    def get_camera(self):
+        """Gets the world position at the top left of the playfield.
+
+        Returns:
+            tuple: The camera's (x, y).
+        """
+        return (self._camera_x, self._camera_y)
+
+    # set_camera method moves the view over the world
+    def set_camera(self, x, y):
+        """Moves the view, so actors are drawn at their position less the camera's. Overlays are 
+        not moved. Set it back to (0, 0) to draw actors that live in screen coordinates.
+
+        Args:
+            x (float): The world x at the left of the playfield.
+            y (float): The world y at the top of the playfield.
+        """
+        self._camera_x = x
+        self._camera_y = y
+
+    # returns the playfield's height
+    def get_height(self):
+        """Gets the playfield's height.
+        
+        Returns:
+            int: The playfield's height.
+        """
+        return self._height
+
+    # returns the playfield's width
+    def get_width(self):
+        """Gets the playfield's width.
+        
+        Returns:
+            int: The playfield's width.
+        """
+        return self._width
+
+    # returns True while the game should keep running
+    @abstractmethod
+    def is_window_open(self):
+        """Whether or not the game should keep running.
+
+        Returns:
+            bool: True if the window is open; false if otherwise.
+        """
+
+    # opens the output
+    @abstractmethod
+    def open_window(self):
+        """Gets the output ready for drawing."""
@@ -0,0 +1,109 @@
+"""
+file: bot_keyboard_service.py
+author: Jerry Lane
+This class plays the game in place of a person at the keyboard, using one
+of a few simple policies, so games can be simulated in bulk.
+"""
+# import needed modules
+import random
+
+from game.shared.point import Point
+
+# the policies a bot can play with
+POLICIES = ("idle", "random", "greedy")
+
+# class declaration
+class BotKeyboardService:
+    """Chooses a direction every tick by looking at the cast.
+
+    The responsibility of a BotKeyboardService is to stand in for the KeyboardService with an 
+    automated player:
+        idle    never presses anything.
+        random  wanders left and right at random and now and then changes the velocity.
+        greedy  heads for the gem that will land soonest and that it can still reach.
+
+    Attributes:
+        _cast (Cast): The cast the bot looks at.
+        _policy (string): One of POLICIES.
+        _random (Random): The bot's own random numbers, separate from the game's.
+        _cell_size (int): For scaling directional input to a grid.
+        _direction (Point): Reused for every direction returned.
+    """
+
+    # default constructor
+    def __init__(self, cast, policy = "greedy", seed = None, cell_size = 1):
+        """Constructs a new BotKeyboardService.
+
+        Args:
+            cast (Cast): The cast to look at.
+            policy (string): One of POLICIES.
+            seed (int): A seed for the bot's random choices.
+            cell_size (int): The size of a cell in the display grid.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy!r}, expected one of {', '.join(POLICIES)}")
+        self._cast = cast
+        self._policy = policy
+        self._random = random.Random(seed)
+        self._cell_size = cell_size
+        self._direction = Point(0, 0)
+
+    # nothing to collect
+    def poll(self):
+        """Does nothing; there are no keys to read."""
+        pass
+
+    # get direction method returns the bot's choice for this tick
+    def get_direction(self):
+        """Gets the direction the bot chooses for this tick. The same Point is reused on every 
+        call, so read it before calling again.
+
+        Returns:
+            Point: The selected direction.
+        """
+        dx = 0
+        dy = 0
+        if self._policy == "random":
+            dx = self._random.randint(-1, 1)
+            if self._random.random() < 0.02:
+                dy = self._random.choice((-1, 1))
+        elif self._policy == "greedy":
+            dx = self._chase_gem()
+        return self._direction.set(dx * self._cell_size, dy * self._cell_size)
+
+    # pick a step toward the best gem
+    def _chase_gem(self):
+        """Finds the gem that will reach the robot's row soonest while the robot can still get 
+        under it, and steps toward it.
+
+        Returns:
+            int: -1 to go left, 1 to go right, 0 to stay.
+        """
+        robot = self._cast.get_first_actor("robots").get_position()
+        robot_x = robot.get_x()
+        robot_y = robot.get_y()
+        cell_size = self._cell_size
+        best_ticks = None
+        best_x = robot_x
+        values = self._cast.get_catalog().get_values()
+        world = self._cast.get_world("artifacts")
+        for artifact in self._cast.get_actors("artifacts"):
+            if values[artifact.get_type_id()] <= 0:
+                continue
+            position = artifact.get_position()
+
+            # a world's artifacts stand still and the camera climbs past them
+            if world is None:
+                distance = robot_y - position.get_y()
+                speed = artifact.get_velocity().get_y()
+            else:
+                distance = robot_y - world.to_screen_y(position.get_y())
+                speed = world.get_speed()
+            if distance < 0:
+                continue
+            ticks = distance // max(1, speed)
+            steps = abs(position.get_x() - robot_x) // cell_size
+            if steps <= ticks and (best_ticks is None or ticks < best_ticks):
+                best_ticks = ticks
+                best_x = position.get_x()
+        return (best_x > robot_x) - (best_x < robot_x)
@@ -0,0 +1,247 @@
+"""
+file: frame_capture.py
+author: Jerry Lane
+purpose: The FrameCapture class saves the frames the game draws as a
+numbered image sequence. Frames are copied into a ring of preallocated
+buffers and written to disk by a background thread, so capturing never
+makes the game loop wait for the disk; when the writer falls behind,
+frames are dropped instead.
+"""
+# import the modules needed for the writer thread and for encoding images
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+# the image formats the writer can produce
+FORMATS = ("ppm", "png", "raw")
+
+# class declaration
+class FrameCapture:
+    """A background writer for captured frames.
+
+    The responsibility of a FrameCapture is to take RGBA frames from the game loop as cheaply as 
+    possible, by copying them into one of a fixed number of buffers, and to encode and write them 
+    on its own thread. The main thread never waits: if every buffer is still waiting to be 
+    written, the frame is dropped and counted.
+
+    Attributes:
+        _directory (string): The folder the frames are written to.
+        _format (string): One of FORMATS.
+        _slot_count (int): The number of frame buffers in the ring.
+        _size (tuple): The (width, height) the buffers are allocated for.
+        _free (Queue): The buffers the main thread may fill, allocated for the first frame's size.
+        _pending (Queue): (buffer, its free queue, frame number, width, height) of frames waiting 
+            to be written.
+        _thread (Thread): The writer thread.
+        _frames (int): The number of frames offered.
+        _captured (int): The number of frames copied into a buffer.
+        _dropped (int): The number of frames dropped because no buffer was free.
+        _written (int): The number of frames written to disk.
+        _overhead (float): Seconds the main thread spent capturing.
+        _max_overhead (float): The longest the main thread spent on one frame.
+        _error (Exception): The error that stopped the writer, or None.
+    """
+
+    # default constructor
+    def __init__(self, directory, image_format = "ppm", slots = 8):
+        """Constructs a new FrameCapture and starts its writer thread.
+
+        Args:
+            directory (string): The folder to write the frames to; it is created if needed.
+            image_format (string): One of FORMATS.
+            slots (int): How many frames may wait to be written before frames are dropped.
+        """
+        if image_format not in FORMATS:
+            raise ValueError(f"unknown format {image_format!r}, expected one of {', '.join(FORMATS)}")
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._format = image_format
+        self._slot_count = slots
+        self._size = None
+        self._free = queue.Queue()
+        self._pending = queue.Queue()
+        self._frames = 0
+        self._captured = 0
+        self._dropped = 0
+        self._written = 0
+        self._overhead = 0.0
+        self._max_overhead = 0.0
+        self._error = None
+        # a daemon, so a game that fails before close is called can still exit
+        self._thread = threading.Thread(target=self._write_frames, name="frame-capture",
+            daemon=True)
+        self._thread.start()
+
+    # copy a frame for the writer
+    def capture(self, pixels, width, height, start = None):
+        """Copies a frame into a free buffer and queues it for writing, or drops it if no buffer 
+        is free. Never waits for the writer.
+
+        Args:
+            pixels (buffer): The frame as width * height RGBA bytes, top row first.
+            width (int): The width of the frame, in pixels.
+            height (int): The height of the frame, in pixels.
+            start (float): When the caller started reading the frame, from time.perf_counter, 
+                so the read counts towards the overhead; defaults to now.
+
+        Returns:
+            bool: True if the frame was queued, False if it was dropped.
+        """
+        if start is None:
+            start = time.perf_counter()
+        self._frames += 1
+        number = self._frames
+        if (width, height) != self._size:
+            self.prepare(width, height)
+        free = self._free
+        try:
+            buffer = free.get_nowait()
+        except queue.Empty:
+            buffer = None
+        queued = buffer is not None and self._error is None
+        if not queued:
+            self._dropped += 1
+            if buffer is not None:
+                free.put(buffer)
+        else:
+            buffer[:] = pixels
+            self._pending.put((buffer, free, number, width, height))
+            self._captured += 1
+        elapsed = time.perf_counter() - start
+        self._overhead += elapsed
+        if elapsed > self._max_overhead:
+            self._max_overhead = elapsed
+        return queued
+
+    # finish writing and stop the writer thread
+    def close(self):
+        """Waits for every queued frame to be written, then stops the writer thread.
+
+        Raises:
+            Exception: Whatever stopped the writer, if it failed.
+        """
+        self._pending.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    # get the counts and timings
+    def get_stats(self):
+        """Gets how many frames were captured, dropped and written, and what capturing cost the 
+        main thread.
+
+        Returns:
+            dict: frames, captured, dropped and written counts, and mean_ms and max_ms overhead.
+        """
+        frames = self._frames
+        return {
+            "frames": frames,
+            "captured": self._captured,
+            "dropped": self._dropped,
+            "written": self._written,
+            "mean_ms": self._overhead / frames * 1000 if frames else 0.0,
+            "max_ms": self._max_overhead * 1000,
+        }
+
+    # summarize the stats in one line
+    def get_summary_line(self):
+        """Gets the stats as one line of text, for the overlay or the console.
+
+        Returns:
+            string: The summary.
+        """
+        stats = self.get_stats()
+        return (f"capture {stats['captured']}/{stats['frames']} frames, {stats['dropped']} dropped, "
+            f"{stats['mean_ms']:.2f}ms avg {stats['max_ms']:.2f}ms max")
+
+    # make the ring of buffers for a frame size
+    def prepare(self, width, height):
+        """Makes the ring of buffers for frames of the given size, so the first capture does not 
+        have to. Capturing a frame of another size makes a new ring; buffers the writer still 
+        holds go back to the old ring when it is done with them, and are then thrown away.
+
+        Args:
+            width (int): The width of a frame, in pixels.
+            height (int): The height of a frame, in pixels.
+        """
+        self._size = (width, height)
+        self._free = queue.Queue()
+        for _ in range(self._slot_count):
+            self._free.put(bytearray(width * height * 4))
+
+    # the writer thread
+    def _write_frames(self):
+        """Writes queued frames until close is called. Runs on the writer thread."""
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            buffer, free, number, width, height = item
+            try:
+                if self._error is None:
+                    self._write_frame(buffer, number, width, height)
+                    self._written += 1
+            except Exception as error:
+                self._error = error
+            free.put(buffer)
+
+    # encode and write one frame
+    def _write_frame(self, pixels, number, width, height):
+        """Writes one frame to its own numbered file in the capture folder.
+
+        Args:
+            pixels (bytearray): The frame as RGBA bytes, top row first.
+            number (int): The frame number.
+            width (int): The width of the frame, in pixels.
+            height (int): The height of the frame, in pixels.
+        """
+        path = os.path.join(self._directory, f"frame_{number:06d}.{self._format}")
+        with open(path, "wb") as file:
+            if self._format == "raw":
+                file.write(pixels)
+            elif self._format == "ppm":
+                file.write(f"P6\n{width} {height}\n255\n".encode("ascii"))
+                file.write(to_rgb(pixels))
+            else:
+                file.write(encode_png(pixels, width, height))
+
+
+def to_rgb(pixels):
+    """
+    parameters: pixels - RGBA bytes
+    return: the same pixels as RGB bytes
+    The to_rgb function drops the alpha channel.
+    """
+    rgb = bytearray(len(pixels) // 4 * 3)
+    rgb[0::3] = pixels[0::4]
+    rgb[1::3] = pixels[1::4]
+    rgb[2::3] = pixels[2::4]
+    return rgb
+
+
+def encode_png(pixels, width, height):
+    """
+    parameters: pixels - RGBA bytes, top row first
+                width - the width of the image, in pixels
+                height - the height of the image, in pixels
+    return: the image as the bytes of a PNG file
+    The encode_png function writes an RGBA PNG using only the standard
+    library, with no row filters and the fastest compression, trading file
+    size for speed.
+    """
+    stride = width * 4
+    rows = bytearray((stride + 1) * height)
+    for row in range(height):
+        start = row * (stride + 1) + 1
+        rows[start:start + stride] = pixels[row * stride:(row + 1) * stride]
+
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(bytes(rows), 1)) + chunk(b"IEND", b""))
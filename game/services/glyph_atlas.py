@@ -0,0 +1,112 @@
+"""
+file: glyph_atlas.py
+author: Jerry Lane
+This class keeps a texture of every single-character glyph the game has
+drawn, so each glyph is rasterized once and then copied to the screen as a
+textured quad.
+"""
+# import pyray for textures and drawing; it is only loaded once it is first used
+from game.services.lazy_import import lazy_import
+
+pyray = lazy_import("pyray")
+
+# the atlas is one row per font size, wide enough for a few hundred glyphs
+ATLAS_WIDTH = 1024
+ATLAS_HEIGHT = 256
+
+# class declaration
+class GlyphAtlas:
+    """A texture atlas of pre-rendered glyphs.
+
+    The responsibility of a GlyphAtlas is to render each (glyph, font size) pair once, in white,
+    into a shared render texture and hand back the source rectangle for it. Glyphs drawn from the
+    same texture are batched together by raylib, and tinting the white glyph gives any color.
+
+    Attributes:
+        _target (RenderTexture): The texture holding the glyphs, or None until first used.
+        _glyphs (dict): A dictionary of glyphs { key: (glyph, font_size), value: source Rectangle }
+        _rows (dict): A dictionary of rows { key: font_size, value: [row y, next free x] }
+        _next_row (int): The y coordinate of the next unused row.
+    """
+
+    # default constructor
+    def __init__(self):
+        """Constructs a new, empty GlyphAtlas. The texture is created on first use, once a window 
+        (and so a graphics context) exists."""
+        self._target = None
+        self._glyphs = {}
+        self._rows = {}
+        self._next_row = 0
+
+    # get the texture to draw from
+    def get_texture(self):
+        """Gets the atlas texture.
+
+        Returns:
+            Texture: The texture holding every glyph rendered so far.
+        """
+        return self._target.texture
+
+    # get or render a glyph
+    def get_source(self, glyph, font_size):
+        """Gets the rectangle of the atlas holding the given glyph, rendering it on first use.
+
+        Args:
+            glyph (string): A single character.
+            font_size (int): The font size.
+
+        Returns:
+            Rectangle: The glyph's source rectangle, or None if the atlas is full.
+        """
+        key = (glyph, font_size)
+        source = self._glyphs.get(key)
+        if source is None and key not in self._glyphs:
+            source = self._render(glyph, font_size)
+            self._glyphs[key] = source
+        return source
+
+    # release the texture
+    def unload(self):
+        """Releases the atlas texture. The atlas can be used again afterwards."""
+        if self._target is not None:
+            pyray.unload_render_texture(self._target)
+        self._target = None
+        self._glyphs = {}
+        self._rows = {}
+        self._next_row = 0
+
+    # rasterize one glyph into the atlas
+    def _render(self, glyph, font_size):
+        """Draws the glyph into the atlas in white.
+
+        Args:
+            glyph (string): A single character.
+            font_size (int): The font size.
+
+        Returns:
+            Rectangle: The glyph's source rectangle, or None if the atlas is full.
+        """
+        if self._target is None:
+            self._target = pyray.load_render_texture(ATLAS_WIDTH, ATLAS_HEIGHT)
+            pyray.begin_texture_mode(self._target)
+            pyray.clear_background(pyray.BLANK)
+            pyray.end_texture_mode()
+
+        # find room in the row for this font size, starting a new row if needed
+        width = pyray.measure_text(glyph, font_size)
+        row = self._rows.get(font_size)
+        if row is None or row[1] + width > ATLAS_WIDTH:
+            if self._next_row + font_size > ATLAS_HEIGHT:
+                return None
+            row = [self._next_row, 0]
+            self._rows[font_size] = row
+            self._next_row += font_size
+        x, y = row[1], row[0]
+        row[1] += width
+
+        pyray.begin_texture_mode(self._target)
+        pyray.draw_text(glyph, x, y, font_size, pyray.WHITE)
+        pyray.end_texture_mode()
+
+        # render textures are stored upside down, so flip the source rectangle
+        return pyray.Rectangle(x, ATLAS_HEIGHT - y - font_size, width, -font_size)
@@ -0,0 +1,202 @@
+"""
+file: input_recording.py
+author: Jerry Lane
+This module records the direction the keyboard reported on every game
+tick, saves it to a compact binary file along with everything needed to
+rebuild the game, and plays it back in place of the keyboard.
+
+File layout (little-endian):
+    header  magic "GRDR", version, flags, artifact count, seed, tick count,
+            final score, SHA-1 of the final state, spawn rate length
+    spawn   the spawn rate option as UTF-8 text, empty for no limit
+    catalog the length of the artifact catalog, then the catalog as UTF-8 JSON,
+            empty for the default one
+    ticks   one byte per tick: (dx + 1) * 3 + (dy + 1), with dx, dy in -1..1
+"""
+# import needed modules
+import struct
+
+from game.shared.point import Point
+
+MAGIC = b"GRDR"
+VERSION = 3
+CATALOG_LENGTH = struct.Struct("<I")
+FLAG_POOLED = 1
+HEADER = struct.Struct("<4sHHIQIi20sH")
+
+
+# class declaration
+class Recording:
+    """A recorded game.
+
+    The responsibility of a Recording is to hold what is needed to replay a game and check the 
+    result: how the cast was built, the input on every tick, and how the game ended.
+
+    Attributes:
+        seed (int): The seed the game's random.Random was created with.
+        artifact_count (int): The number of artifacts in the cast.
+        pooled (bool): Whether the artifacts were kept in an ArtifactPool.
+        spawn_rate (string): The spawn rate option the game ran with, or "" for no limit.
+        catalog (string): The game's ArtifactCatalog as JSON, or "" for DEFAULT_CATALOG.
+        inputs (bytearray): One encoded direction per tick.
+        final_score (int): The score after the last tick.
+        state_hash (string): Director.get_state_hash after the last tick, in hex.
+    """
+
+    # default constructor
+    def __init__(self, seed, artifact_count, pooled = False, spawn_rate = "", catalog = ""):
+        """Constructs a new, empty Recording.
+
+        Args:
+            seed (int): The seed the game's random.Random was created with.
+            artifact_count (int): The number of artifacts in the cast.
+            pooled (bool): Whether the artifacts were kept in an ArtifactPool.
+            spawn_rate (string): The spawn rate option, as given to respawn_scheduler.parse_curve.
+            catalog (string): The artifact catalog as JSON, as given to parse_catalog.
+        """
+        self.seed = seed
+        self.artifact_count = artifact_count
+        self.pooled = pooled
+        self.spawn_rate = spawn_rate
+        self.catalog = catalog
+        self.inputs = bytearray()
+        self.final_score = 0
+        self.state_hash = "0" * 40
+
+    # write the recording to a file
+    def save(self, path):
+        """Writes the recording to the given file.
+
+        Args:
+            path (string): The file to write.
+        """
+        flags = FLAG_POOLED if self.pooled else 0
+        spawn_rate = self.spawn_rate.encode()
+        catalog = self.catalog.encode()
+        header = HEADER.pack(MAGIC, VERSION, flags, self.artifact_count, self.seed,
+            len(self.inputs), self.final_score, bytes.fromhex(self.state_hash), len(spawn_rate))
+        with open(path, "wb") as file:
+            file.write(header)
+            file.write(spawn_rate)
+            file.write(CATALOG_LENGTH.pack(len(catalog)))
+            file.write(catalog)
+            file.write(self.inputs)
+
+    # read a recording from a file
+    @staticmethod
+    def load(path):
+        """Reads a recording from the given file.
+
+        Args:
+            path (string): The file to read.
+
+        Returns:
+            Recording: The recording.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, flags, artifact_count, seed, ticks, final_score, state_hash, \
+            spawn_length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} Greed recording")
+        start = HEADER.size + spawn_length
+        spawn_rate = data[HEADER.size:start].decode()
+        catalog_length, = CATALOG_LENGTH.unpack_from(data, start)
+        start += CATALOG_LENGTH.size
+        catalog = data[start:start + catalog_length].decode()
+        start += catalog_length
+        recording = Recording(seed, artifact_count, bool(flags & FLAG_POOLED), spawn_rate,
+            catalog)
+        recording.inputs = bytearray(data[start:start + ticks])
+        if len(recording.inputs) != ticks:
+            raise ValueError(f"{path} is truncated")
+        recording.final_score = final_score
+        recording.state_hash = state_hash.hex()
+        return recording
+
+
+# class declaration
+class RecordingKeyboardService:
+    """Passes another keyboard service's directions through, writing each one down.
+
+    The responsibility of a RecordingKeyboardService is to capture the input of every tick into a 
+    Recording without changing what the Director sees.
+
+    Attributes:
+        _keyboard_service (KeyboardService): The service being recorded.
+        _inputs (bytearray): Where each tick's encoded direction is appended.
+    """
+
+    # default constructor
+    def __init__(self, keyboard_service, recording):
+        """Constructs a new RecordingKeyboardService.
+
+        Args:
+            keyboard_service (KeyboardService): The service to record.
+            recording (Recording): The recording to append to.
+        """
+        self._keyboard_service = keyboard_service
+        self._inputs = recording.inputs
+
+    # let the wrapped service collect its input
+    def poll(self):
+        """Lets the wrapped service collect its input for this frame."""
+        self._keyboard_service.poll()
+
+    # get direction method records and returns the wrapped service's direction
+    def get_direction(self):
+        """Gets the wrapped service's direction, recording it.
+
+        Returns:
+            Point: The selected direction.
+        """
+        direction = self._keyboard_service.get_direction()
+        dx = (direction.get_x() > 0) - (direction.get_x() < 0)
+        dy = (direction.get_y() > 0) - (direction.get_y() < 0)
+        self._inputs.append((dx + 1) * 3 + (dy + 1))
+        return direction
+
+
+# class declaration
+class ReplayKeyboardService:
+    """Reports the directions from a Recording, one per call, in place of the keyboard.
+
+    Attributes:
+        _inputs (bytearray): The encoded directions.
+        _tick (int): The index of the next direction.
+        _cell_size (int): For scaling directional input to a grid.
+        _direction (Point): Reused for every direction returned.
+    """
+
+    # default constructor
+    def __init__(self, recording, cell_size = 1):
+        """Constructs a new ReplayKeyboardService.
+
+        Args:
+            recording (Recording): The recording to play back.
+            cell_size (int): The size of a cell in the display grid.
+        """
+        self._inputs = recording.inputs
+        self._tick = 0
+        self._cell_size = cell_size
+        self._direction = Point(0, 0)
+
+    # nothing to collect
+    def poll(self):
+        """Does nothing; the input comes from the recording."""
+        pass
+
+    # get direction method returns the next recorded direction
+    def get_direction(self):
+        """Gets the next recorded direction. Once the recording runs out, reports no direction.
+
+        Returns:
+            Point: The recorded direction, scaled to the grid.
+        """
+        code = 4
+        if self._tick < len(self._inputs):
+            code = self._inputs[self._tick]
+            self._tick += 1
+        dx = code // 3 - 1
+        dy = code % 3 - 1
+        return self._direction.set(dx * self._cell_size, dy * self._cell_size)
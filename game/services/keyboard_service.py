@@ -3,59 +3,161 @@ file: keyboard_service.py
 authors: authors of RobotFindsKitten
 This class represents the keyboard inputs.
 """
-# import needed modules
-import pyray
+# import needed modules; pyray is only loaded once a KeyboardService is made
+import time
+from collections import deque
+
+from game.services.lazy_import import lazy_import
 from game.shared.point import Point
 
+pyray = lazy_import("pyray")
+
+# the actions the game understands, and the names of the pyray key codes they start out bound
+# to, looked up when a KeyboardService is made so importing this module does not load raylib
+ACTIONS = ("left", "right", "up", "down")
+
+# the most events kept if nothing takes them, so the queue can't grow for a whole session
+MAX_EVENTS = 256
+DEFAULT_BINDINGS = {
+    "left": "KEY_LEFT",
+    "right": "KEY_RIGHT",
+    "up": "KEY_UP",
+    "down": "KEY_DOWN",
+}
+
 #class declaration
 class KeyboardService:
     """Detects player input. 
     
     The responsibility of a KeyboardService is to detect player key presses and translate them into 
-    a point representing a direction.
+    a point representing a direction. Key presses and releases are collected by poll, once per 
+    drawn frame, into a queue of events, so a key tapped between two game ticks still counts.
 
     Attributes:
         cell_size (int): For scaling directional input to a grid.
+        _bindings (dict): A dictionary of bindings { key: action, value: key code }
+        _down (dict): Whether each action's key was down at the last poll { key: action, value: bool }
+        _events (deque): The (time, action, pressed) events not yet taken by get_direction or 
+            get_events, at most MAX_EVENTS of them.
     """
 
     # default constructor
-    def __init__(self, cell_size = 1):
+    def __init__(self, cell_size = 1, bindings = None):
         """Constructs a new KeyboardService using the specified cell size.
         
         Args:
             cell_size (int): The size of a cell in the display grid.
+            bindings (dict): Optional { action: key code } overrides of DEFAULT_BINDINGS.
         """
         self._cell_size = cell_size
+        self._bindings = {action: getattr(pyray, name) for action, name in DEFAULT_BINDINGS.items()}
+        if bindings is not None:
+            for action, key in bindings.items():
+                self.set_binding(action, key)
+        self._down = {action: False for action in ACTIONS}
+        self._events = deque(maxlen=MAX_EVENTS)
+
+        # reused on every call so polling the keys does not allocate
+        self._direction = Point(0, 0)
+
+    # rebind an action to another key
+    def set_binding(self, action, key):
+        """Binds the given action to a different key.
+
+        Args:
+            action (string): One of ACTIONS.
+            key (int): A raylib key code, like pyray.KEY_A.
+        """
+        if action not in ACTIONS:
+            raise ValueError(f"unknown action {action!r}, expected one of {', '.join(ACTIONS)}")
+        self._bindings[action] = key
+
+    # collect the key events since the last poll
+    def poll(self):
+        """Collects the presses and releases of the bound keys since the last poll. Raylib only 
+        keeps them for one frame, so this should be called once per drawn frame. Presses come 
+        from raylib's key queue, so a key pressed and released within one frame is still seen; 
+        releases come from comparing which keys are down now with the last poll.
+        """
+        now = time.perf_counter()
+        events = self._events
+        actions = {key: action for action, key in self._bindings.items()}
+
+        # drain raylib's queue of pressed keys
+        pressed = set()
+        key = pyray.get_key_pressed()
+        while key != 0:
+            action = actions.get(key)
+            if action is not None and action not in pressed:
+                pressed.add(action)
+                events.append((now, action, True))
+            key = pyray.get_key_pressed()
+
+        # compare the held keys with the last poll
+        for action, key in self._bindings.items():
+            down = pyray.is_key_down(key)
+            if down != self._down[action]:
+                if down and action not in pressed:
+                    events.append((now, action, True))
+                elif not down:
+                    events.append((now, action, False))
+                self._down[action] = down
+
+            # pressed and released again within one frame
+            elif action in pressed and not down:
+                events.append((now, action, False))
+
+    # take the queued events
+    def get_events(self):
+        """Takes every event collected since the last call to this or get_direction, for callers 
+        that want the timings; get_direction won't see the events taken.
+
+        Returns:
+            List: (time, action, pressed) tuples, oldest first. time is from time.perf_counter 
+                at the poll that saw the event.
+        """
+        events = list(self._events)
+        self._events.clear()
+        return events
                 
-    # get direction method returns a new Point based upon keys pressed
+    # get direction method returns a Point based upon keys pressed
     def get_direction(self): 
-        """Gets the selected direction based on the currently pressed keys.
+        """Gets the selected direction from the keys held now and every press event queued since 
+        the last call, which it takes, so short taps between ticks are not lost. The Director 
+        calls it once per tick. The same Point is reused on every call, so read it before 
+        calling again.
 
         Returns:
             Point: The selected direction.
         """
+        # fold in every event since the last tick, then the keys still held
+        events = self._events
+        active = {action for _, action, pressed in events if pressed}
+        events.clear()
+        for action, down in self._down.items():
+            if down:
+                active.add(action)
+
         # default to x and y coords zero in case there is no key press
         dx = 0
         dy = 0
 
         # if key is pressed, change dx or dy value
-        if pyray.is_key_down(pyray.KEY_LEFT):
+        if "left" in active:
             dx = -1
         
-        if pyray.is_key_down(pyray.KEY_RIGHT):
+        if "right" in active:
             dx = 1
 
-        if pyray.is_key_down(pyray.KEY_UP):
+        if "up" in active:
             dy = 1
         
-        if pyray.is_key_down(pyray.KEY_DOWN):
+        if "down" in active:
             dy = -1
 
-        # make new Point our of dx, dy values
-        direction = Point(dx, dy)
-        direction = direction.scale(self._cell_size)
+        # store dx, dy in the reused Point, scaled to the grid
+        direction = self._direction.set(dx, dy)
+        direction.iscale(self._cell_size)
         
-        # return new Point
+        # return the Point
         return direction
-
-        
\ No newline at end of file
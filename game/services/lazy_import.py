@@ -0,0 +1,33 @@
+"""
+file: lazy_import.py
+author: Jerry Lane
+purpose: Imports a module on first use instead of when the importing
+module is loaded. The services import pyray this way, so tools that only
+need the cast or a headless game never pay for loading raylib.
+"""
+# import the import machinery
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """
+    parameters: name - the name of the module, like "pyray"
+    return: the module, not yet loaded
+    The lazy_import function finds the module now, so a missing module is
+    still reported at import time, but only runs it the first time one of
+    its attributes is used. After that it is the ordinary module, with no
+    cost on each use. A module that is already loaded is returned as is.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,44 @@
+"""
+file: null_keyboard_service.py
+author: Jerry Lane
+This class stands in for the KeyboardService when the game runs without a
+display. It never imports pyray and always reports the same direction.
+"""
+# import needed modules
+from game.shared.point import Point
+
+# class declaration
+class NullKeyboardService:
+    """Provides a fixed direction instead of reading the keyboard. 
+
+    The responsibility of a NullKeyboardService is to feed the Director input when there is no 
+    keyboard, such as in headless soak tests.
+
+    Attributes:
+        _direction (Point): The direction returned on every call, already scaled to the grid.
+    """
+
+    # default constructor
+    def __init__(self, cell_size = 1, dx = 0, dy = 0):
+        """Constructs a new NullKeyboardService that always reports the given direction.
+        
+        Args:
+            cell_size (int): The size of a cell in the display grid.
+            dx (int): The horizontal direction (-1, 0 or 1).
+            dy (int): The vertical direction (-1, 0 or 1).
+        """
+        self._direction = Point(dx, dy).scale(cell_size)
+
+    # nothing to collect
+    def poll(self):
+        """Does nothing; there are no keys to read."""
+        pass
+
+    # get direction method returns the fixed direction
+    def get_direction(self):
+        """Gets the fixed direction.
+
+        Returns:
+            Point: The fixed direction.
+        """
+        return self._direction
@@ -0,0 +1,94 @@
+"""
+file: null_video_service.py
+author: Jerry Lane
+This class stands in for the VideoService when the game runs without a
+display. It never imports pyray and draws nothing.
+"""
+# import needed modules
+from game.services.base_video_service import BaseVideoService
+
+# class declaration
+class NullVideoService(BaseVideoService):
+    """Discards the game state instead of drawing it. The responsibility of a NullVideoService is
+    to answer the same questions as a VideoService (size, cell size, window state) so the Director
+    can run on machines without a display, or as fast as the CPU allows.
+
+    Attributes:
+        _width (int): The width of the playfield.
+        _height (int): The height of the playfield.
+        _cell_size (int): The size of a cell in the display grid.
+        _max_frames (int): The number of frames before the "window" closes, or None for never.
+        _frames (int): The number of frames flushed so far.
+    """
+
+    # default constructor
+    def __init__(self, width, height, cell_size, max_frames = None):
+        """Constructs a new NullVideoService for a playfield of the given size.
+
+        Args:
+            width (int): The width of the playfield.
+            height (int): The height of the playfield.
+            cell_size (int): The size of a cell in the display grid.
+            max_frames (int): How many frames to run before reporting the window closed.
+        """
+        super().__init__(width, height, cell_size)
+        self._max_frames = max_frames
+        self._frames = 0
+
+    # there is no window to close
+    def close_window(self):
+        """Does nothing; there are no resources to release."""
+        pass
+
+    # nothing to clear
+    def clear_buffer(self):
+        """Does nothing; there is no buffer to clear."""
+        pass
+
+    # nothing to draw
+    def draw_actor(self, actor, alpha = 1.0):
+        """Does nothing with the given actor.
+
+        Args:
+            actor (Actor): The actor that would have been drawn.
+            alpha (float): How far between ticks it would have been drawn.
+        """
+        pass
+
+    # nothing to draw
+    def draw_actors(self, actors, alpha = 1.0):
+        """Does nothing with the given actors.
+
+        Args:
+            actors (list): The actors that would have been drawn.
+            alpha (float): How far between ticks they would have been drawn.
+        """
+        pass
+
+    # nothing to draw
+    def draw_overlay(self, lines):
+        """Does nothing with the given lines.
+
+        Args:
+            lines (list): The lines of text that would have been drawn.
+        """
+        pass
+
+    # counts the frame instead of showing it
+    def flush_buffer(self):
+        """Counts the frame so is_window_open can stop after max_frames."""
+        self._frames += 1
+
+    # the "window" stays open until max_frames have been flushed
+    def is_window_open(self):
+        """Whether or not the game should keep running.
+
+        Returns:
+            bool: False once max_frames frames have been flushed; True otherwise.
+        """
+        return self._max_frames is None or self._frames < self._max_frames
+
+    # there is no window to open
+    def open_window(self):
+        """Resets the frame count; there is no window to open."""
+        self._frames = 0
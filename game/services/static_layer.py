@@ -0,0 +1,106 @@
+"""
+file: static_layer.py
+author: Jerry Lane
+This class composites the parts of the screen that never change, like the
+debug grid, into a texture once, so each frame only has
+to copy that texture instead of drawing them again.
+"""
+# import pyray for textures and drawing; it is only loaded once it is first used
+from game.services.lazy_import import lazy_import
+
+pyray = lazy_import("pyray")
+
+# class declaration
+class StaticLayer:
+    """A cached picture of the unchanging parts of the screen.
+
+    The responsibility of a StaticLayer is to draw its layers into a render texture once and to 
+    copy that texture to the screen every frame. It redraws only after being invalidated or when 
+    the size it was drawn at changes.
+
+    Attributes:
+        _layers (list): The functions that draw each layer, in order, bottom first.
+        _target (RenderTexture): The cached picture, or None until first drawn.
+        _key (tuple): The (width, height, cell_size) the picture was drawn for.
+        _size (tuple): The (width, height) of the texture.
+    """
+
+    # default constructor
+    def __init__(self):
+        """Constructs a new StaticLayer with no layers."""
+        self._layers = []
+        self._target = None
+        self._key = None
+        self._size = None
+
+    # add a layer on top of the others
+    def add_layer(self, draw):
+        """Adds a layer on top of the existing ones and invalidates the cached picture.
+
+        Args:
+            draw (function): Called with (width, height, cell_size) to draw the layer.
+        """
+        self._layers.append(draw)
+        self.invalidate()
+
+    # whether there is anything to draw
+    def is_empty(self):
+        """Whether or not the layer has nothing to draw.
+
+        Returns:
+            bool: True if no layers were added; false if otherwise.
+        """
+        return not self._layers
+
+    # copy the cached picture to the screen
+    def draw(self, width, height, cell_size):
+        """Copies the cached picture to the screen, first redrawing it if it is out of date. Must 
+        be called between pyray.begin_drawing and pyray.end_drawing.
+
+        Args:
+            width (int): The width of the screen.
+            height (int): The height of the screen.
+            cell_size (int): The size of a cell in the display grid.
+        """
+        key = (width, height, cell_size)
+        if self._target is None or key != self._key:
+            self._render(width, height, cell_size)
+            self._key = key
+
+        # render textures are stored upside down, so flip while copying
+        source = pyray.Rectangle(0, 0, width, -height)
+        pyray.draw_texture_rec(self._target.texture, source, (0, 0), pyray.WHITE)
+
+    # force a redraw on the next frame
+    def invalidate(self):
+        """Marks the cached picture as out of date."""
+        self._key = None
+
+    # release the texture
+    def unload(self):
+        """Releases the cached picture. It is redrawn if used again."""
+        if self._target is not None:
+            pyray.unload_render_texture(self._target)
+        self._target = None
+        self._key = None
+        self._size = None
+
+    # draw every layer into the texture
+    def _render(self, width, height, cell_size):
+        """Draws every layer into a texture of the given size.
+
+        Args:
+            width (int): The width of the screen.
+            height (int): The height of the screen.
+            cell_size (int): The size of a cell in the display grid.
+        """
+        if self._target is not None and self._size != (width, height):
+            self.unload()
+        if self._target is None:
+            self._target = pyray.load_render_texture(width, height)
+            self._size = (width, height)
+        pyray.begin_texture_mode(self._target)
+        pyray.clear_background(pyray.BLANK)
+        for draw in self._layers:
+            draw(width, height, cell_size)
+        pyray.end_texture_mode()
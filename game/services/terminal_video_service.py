@@ -0,0 +1,189 @@
+"""
+file: terminal_video_service.py
+author: Jerry Lane
+This class draws the game as text in a terminal using ANSI escape codes,
+sending only the cells that changed since the last frame, so a game can be
+watched over SSH without raylib or a display.
+"""
+# import needed modules
+import sys
+import time
+
+from game.services.base_video_service import BaseVideoService
+
+# ANSI escape codes
+ESC = "\x1b["
+ENTER_SCREEN = ESC + "?1049h" + ESC + "?25l" + ESC + "2J"
+LEAVE_SCREEN = ESC + "0m" + ESC + "?25h" + ESC + "?1049l"
+RESET_COLOR = ESC + "0m"
+
+# class declaration
+class TerminalVideoService(BaseVideoService):
+    """Draws the game state in a terminal, one character per grid cell.
+
+    The responsibility of a TerminalVideoService is to keep the frame being drawn and the frame 
+    on screen as grids of (character, color) cells and, on flush, to send the terminal only the 
+    cells that differ.
+
+    Attributes:
+        _frame_rate (int): The frames per second to hold to.
+        _stream (file): Where to write the escape codes.
+        _cols (int): The number of columns in the grid.
+        _rows (int): The number of rows in the grid.
+        _back (list): The frame being drawn, one (character, color tuple) per cell.
+        _front (list): The frame on screen.
+        _next_frame (float): When the next frame is due, from time.perf_counter.
+        _bytes_written (int): The number of characters sent so far.
+    """
+
+    # default constructor
+    def __init__(self, width, height, cell_size, frame_rate, stream = None):
+        """Constructs a new TerminalVideoService.
+
+        Args:
+            width (int): The width of the playfield, in pixels.
+            height (int): The height of the playfield, in pixels.
+            cell_size (int): The size of a grid cell, in pixels; one cell is one character.
+            frame_rate (int): The frames per second to hold to.
+            stream (file): Where to write; defaults to standard output.
+        """
+        super().__init__(width, height, cell_size)
+        self._frame_rate = frame_rate
+        self._stream = sys.stdout if stream is None else stream
+        self._cols = width // cell_size
+        self._rows = height // cell_size
+        blank = (" ", None)
+        self._back = [blank] * (self._cols * self._rows)
+        self._front = list(self._back)
+        self._next_frame = 0.0
+        self._bytes_written = 0
+
+    # get the amount of output so far
+    def get_bytes_written(self):
+        """Gets the number of characters sent to the terminal so far.
+
+        Returns:
+            int: The number of characters.
+        """
+        return self._bytes_written
+
+    # put the terminal back the way it was
+    def close_window(self):
+        """Leaves the alternate screen and shows the cursor again."""
+        self._write(LEAVE_SCREEN)
+        self._stream.flush()
+
+    # start a new frame
+    def clear_buffer(self):
+        """Blanks the frame being drawn."""
+        blank = (" ", None)
+        back = self._back
+        for cell in range(len(back)):
+            back[cell] = blank
+
+    # put an actor's text into the grid
+    def draw_actor(self, actor, alpha = 1.0):
+        """Writes the actor's text into the grid, starting at the cell under its position. Text 
+        is drawn at whole cells, so alpha is ignored, and the camera is rounded to a whole cell.
+
+        Args:
+            actor (Actor): The actor to draw.
+            alpha (float): Ignored.
+        """
+        position = actor.get_position()
+        color = actor.get_color().to_tuple()
+        cell_size = self._cell_size
+        self._put(actor.get_text(), int(position.get_x() - self._camera_x) // cell_size,
+            int(position.get_y() - self._camera_y) // cell_size, color)
+
+    # draw lines of text in the top right corner
+    def draw_overlay(self, lines):
+        """Writes the given lines, right-aligned, in the top right corner of the grid.
+
+        Args:
+            lines (list): The lines of text to draw.
+        """
+        for row, line in enumerate(lines, start=1):
+            self._put(line, self._cols - len(line) - 1, row, (255, 255, 0, 255))
+
+    # send the changed cells to the terminal
+    def flush_buffer(self):
+        """Sends the cells that changed since the last frame, then waits until the next frame 
+        is due."""
+        out = []
+        color = None
+        cols = self._cols
+        front = self._front
+        last = -2
+        for cell, value in enumerate(self._back):
+            if value == front[cell]:
+                continue
+            front[cell] = value
+
+            # move the cursor unless it is already in place after the last cell written
+            if cell != last + 1 or cell % cols == 0:
+                out.append(f"{ESC}{cell // cols + 1};{cell % cols + 1}H")
+            last = cell
+            text, cell_color = value
+            if cell_color != color:
+                color = cell_color
+                out.append(RESET_COLOR if color is None else
+                    f"{ESC}38;2;{color[0]};{color[1]};{color[2]}m")
+            out.append(text)
+        if out:
+            out.append(RESET_COLOR)
+            self._write("".join(out))
+            self._stream.flush()
+
+        # hold to the frame rate
+        now = time.perf_counter()
+        if self._next_frame > now:
+            time.sleep(self._next_frame - now)
+            now = self._next_frame
+        self._next_frame = now + 1 / self._frame_rate
+
+    # the game runs until it is interrupted
+    def is_window_open(self):
+        """Whether or not the game should keep running. A terminal has no close button, so the 
+        game runs until it is interrupted.
+
+        Returns:
+            bool: Always True.
+        """
+        return True
+
+    # take over the terminal
+    def open_window(self):
+        """Switches to the terminal's alternate screen, hides the cursor and clears it."""
+        self._write(ENTER_SCREEN)
+        self._front = [(" ", None)] * (self._cols * self._rows)
+        self._next_frame = time.perf_counter()
+
+    # write text into the grid
+    def _put(self, text, col, row, color):
+        """Writes text into the frame being drawn, clipped to the grid.
+
+        Args:
+            text (string): The text.
+            col (int): The column of the first character.
+            row (int): The row.
+            color (tuple): The (r, g, b, a) color.
+        """
+        if not 0 <= row < self._rows:
+            return
+        cols = self._cols
+        base = row * cols
+        for offset, character in enumerate(text):
+            column = col + offset
+            if 0 <= column < cols:
+                self._back[base + column] = (character, color)
+
+    # write to the terminal
+    def _write(self, text):
+        """Writes text to the stream, counting it.
+
+        Args:
+            text (string): The text to write.
+        """
+        self._stream.write(text)
+        self._bytes_written += len(text)
@@ -0,0 +1,75 @@
+"""
+file: text_cache.py
+author: Jerry Lane
+This class keeps a texture of each actor's text, like the banner, and only
+renders it again when the text changes.
+"""
+# import pyray for textures and drawing; it is only loaded once it is first used
+from game.services.lazy_import import lazy_import
+
+pyray = lazy_import("pyray")
+
+# class declaration
+class TextCache:
+    """Rendered text, kept until it changes.
+
+    The responsibility of a TextCache is to measure and rasterize an actor's text once per change 
+    of text, in white, so drawing it each frame is a single tinted texture copy.
+
+    Attributes:
+        _entries (dict): { key: actor, value: (text revision, font size, RenderTexture, width) }
+    """
+
+    # default constructor
+    def __init__(self):
+        """Constructs a new, empty TextCache."""
+        self._entries = {}
+
+    # draw an actor's text from its cached texture
+    def draw(self, actor, x, y):
+        """Draws the actor's text at the given position, rendering it first if it is new or 
+        has changed since it was last drawn.
+
+        Args:
+            actor (Actor): The actor whose text to draw.
+            x (float): The x coordinate.
+            y (float): The y coordinate.
+        """
+        revision = actor.get_text_revision()
+        font_size = actor.get_font_size()
+        entry = self._entries.get(actor)
+        if entry is None or entry[0] != revision or entry[1] != font_size:
+            if entry is not None:
+                pyray.unload_render_texture(entry[2])
+            entry = self._render(actor.get_text(), revision, font_size)
+            self._entries[actor] = entry
+        _, _, target, width = entry
+        source = pyray.Rectangle(0, 0, width, -font_size)
+        pyray.draw_texture_rec(target.texture, source, (x, y), actor.get_color().to_tuple())
+
+    # release every texture
+    def unload(self):
+        """Releases every cached texture."""
+        for entry in self._entries.values():
+            pyray.unload_render_texture(entry[2])
+        self._entries = {}
+
+    # rasterize text into a new texture
+    def _render(self, text, revision, font_size):
+        """Renders the text in white into a texture just big enough for it.
+
+        Args:
+            text (string): The text.
+            revision (int): The actor's text revision.
+            font_size (int): The font size.
+
+        Returns:
+            tuple: (revision, font size, RenderTexture, width)
+        """
+        width = max(1, pyray.measure_text(text, font_size))
+        target = pyray.load_render_texture(width, font_size)
+        pyray.begin_texture_mode(target)
+        pyray.clear_background(pyray.BLANK)
+        pyray.draw_text(text, 0, 0, font_size, pyray.WHITE)
+        pyray.end_texture_mode()
+        return (revision, font_size, target, width)
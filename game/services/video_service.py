@@ -3,32 +3,54 @@ file: video_service.py
 authors: authors of RobotFindsKitten
 This class represents the game field display.
 """
-# import pyray for raytracing, etc
-import pyray
+# import time for timing frame capture and pyray for raytracing, etc; pyray is only loaded
+# once the window is opened
+import time
+
+from game.services.base_video_service import BaseVideoService
+from game.services.glyph_atlas import GlyphAtlas
+from game.services.lazy_import import lazy_import
+from game.services.static_layer import StaticLayer
+from game.services.text_cache import TextCache
+
+pyray = lazy_import("pyray")
+
+# what the frame capture uses from pyray; older bindings lack some of these
+CAPTURE_FUNCTIONS = ("get_render_width", "get_render_height", "rl_draw_render_batch_active",
+    "load_image_from_screen", "unload_image", "ffi")
 
 # class declaration
-class VideoService: 
+class VideoService(BaseVideoService): 
     """Outputs the game state. The responsibility of the class of objects is to draw the game state 
     on the screen. 
     """
 
     # default constructor
-    def __init__(self, caption, width, height, cell_size, frame_rate, debug = False):
+    def __init__(self, caption, width, height, cell_size, frame_rate, debug = False, 
+            capture = None):
         """Constructs a new VideoService using the specified debug mode.
         
         Args:
             debug (bool): whether or not to draw in debug mode.
+            capture (FrameCapture): Where to send a copy of every frame, or None.
         """
+        super().__init__(width, height, cell_size)
         self._caption = caption
-        self._width = width
-        self._height = height
-        self._cell_size = cell_size
         self._frame_rate = frame_rate
         self._debug = debug
+        self._atlas = GlyphAtlas()
+        self._static_layer = StaticLayer()
+        self._text_cache = TextCache()
+        self._capture = capture
+        if debug == True:
+            self._static_layer.add_layer(self._draw_grid)
 
     # close_window shuts down game
     def close_window(self):
         """Closes the window and releases all computing resources."""
+        self._atlas.unload()
+        self._static_layer.unload()
+        self._text_cache.unload()
         pyray.close_window()
 
     # clear buffer method clears the buffer, readying for new drawing
@@ -38,68 +60,98 @@ class VideoService:
         """
         pyray.begin_drawing()
         pyray.clear_background(pyray.BLACK)
-        if self._debug == True:
-            self._draw_grid()
+        if not self._static_layer.is_empty():
+            width = pyray.get_screen_width()
+            height = pyray.get_screen_height()
+            self._static_layer.draw(width, height, self._cell_size)
+
+    # add_static_layer method adds something that is drawn once and then reused every frame
+    def add_static_layer(self, draw):
+        """Adds a layer that never changes, such as HUD chrome. It is drawn once into a texture,
+        along with the debug grid, and that texture is copied to the screen every frame.
+
+        Args:
+            draw (function): Called with (width, height, cell_size) to draw the layer.
+        """
+        self._static_layer.add_layer(draw)
     
     # draw_actor method draws the actor onscreen by color, text, position, and font size
-    def draw_actor(self, actor):
+    def draw_actor(self, actor, alpha = 1.0):
         """Draws the given actor's text on the screen.
 
         Args:
             actor (Actor): The actor to draw.
+            alpha (float): How far between the actor's previous and current positions to draw it.
         """ 
         text = actor.get_text()
-        x = actor.get_position().get_x()
-        y = actor.get_position().get_y()
+        x, y = actor.get_interpolated_position(alpha)
+        x = int(x - self._camera_x)
+        y = int(y - self._camera_y)
         font_size = actor.get_font_size()
         color = actor.get_color().to_tuple()
         pyray.draw_text(text, x, y, font_size, color)
         
-    # draw actors method separates the actors in a list and sends it to draw_actor method 
-    # one at a time
-    def draw_actors(self, actors):
-        """Draws the text for the given list of actors on the screen.
+    # draw actors method draws every single-character actor from the glyph atlas in one batch,
+    # then draws the longer text, like the banner, on top from the text cache
+    def draw_actors(self, actors, alpha = 1.0):
+        """Draws the text for the given list of actors on the screen. Single characters are 
+        copied from the glyph atlas, so they share one texture and raylib sends them to the 
+        graphics card as a single batch. Longer text is drawn afterwards from textures that are 
+        only rendered again when the text changes.
 
         Args:
             actors (list): A list of actors to draw.
+            alpha (float): How far between each actor's previous and current positions to draw it.
         """ 
+        atlas = self._atlas
+        camera_x = self._camera_x
+        camera_y = self._camera_y
+        texture = None
+        text_actors = []
         for actor in actors:
-            self.draw_actor(actor)
+            text = actor.get_text()
+            if len(text) != 1:
+                text_actors.append(actor)
+                continue
+            source = atlas.get_source(text, actor.get_font_size())
+            if source is None:
+                text_actors.append(actor)
+                continue
+            if texture is None:
+                texture = atlas.get_texture()
+            x, y = actor.get_interpolated_position(alpha)
+            color = actor.get_color().to_tuple()
+            pyray.draw_texture_rec(texture, source, (x - camera_x, y - camera_y), color)
+        for actor in text_actors:
+            if len(actor.get_text()) > 1:
+                x, y = actor.get_interpolated_position(alpha)
+                self._text_cache.draw(actor, x - camera_x, y - camera_y)
+            else:
+                self.draw_actor(actor, alpha)
     
+    # draw_overlay method draws lines of diagnostic text in the top right corner
+    def draw_overlay(self, lines):
+        """Draws the given lines of text, right-aligned, in the top right corner of the screen.
+
+        Args:
+            lines (list): The lines of text to draw.
+        """
+        font_size = 10
+        y = self._cell_size
+        for line in lines:
+            x = self._width - pyray.measure_text(line, font_size) - self._cell_size
+            pyray.draw_text(line, x, y, font_size, pyray.YELLOW)
+            y += font_size + 2
+
     # flush_buffer method writes the buffer contents to game screen
     def flush_buffer(self):
         """Copies the buffer contents to the screen. This method should be called at the end of
         the game's output phase.
         """ 
+        if self._capture is not None:
+            self._capture_frame()
         pyray.end_drawing()
 
-    # get_cell_size method returns the video screen's cell size
-    def get_cell_size(self):
-        """Gets the video screen's cell size.
-        
-        Returns:
-            Grid: The video screen's cell size.
-        """
-        return self._cell_size
-
-    # returns video screen's height
-    def get_height(self):
-        """Gets the video screen's height.
-        
-        Returns:
-            Grid: The video screen's height.
-        """
-        return self._height
-
-    # returns width of screen
-    def get_width(self):
-        """Gets the video screen's width.
-        
-        Returns:
-            Grid: The video screen's width.
-        """
-        return self._width
-
     # returns True if game window is still open, False if being closed
     def is_window_open(self):
         """Whether or not the window was closed by the user.
@@ -116,13 +168,50 @@ class VideoService:
         Args:
             title (string): The title of the window.
         """
+        if self._capture is not None:
+            self._check_capture()
         pyray.init_window(self._width, self._height, self._caption)
         pyray.set_target_fps(self._frame_rate)
+        if self._capture is not None:
+            self._capture.prepare(pyray.get_render_width(), pyray.get_render_height())
+
+    # makes sure pyray can do everything the frame capture asks of it
+    def _check_capture(self):
+        """Checks that pyray has every function _capture_frame and open_window use for the frame 
+        capture, before the window opens, rather than failing on the first captured frame.
+
+        Raises:
+            RuntimeError: If any of CAPTURE_FUNCTIONS is missing.
+        """
+        missing = [name for name in CAPTURE_FUNCTIONS if not hasattr(pyray, name)]
+        if missing:
+            raise RuntimeError("capturing frames needs Raylib Python CFFI 4.0 or newer; this "
+                f"pyray has no {', '.join(missing)}")
+
+    # copies the finished frame for the frame capture
+    def _capture_frame(self):
+        """Reads back the frame drawn so far and hands it to the frame capture, which copies it 
+        and writes it out on its own thread. Called before end_drawing, while the frame is still 
+        in the back buffer.
+        """
+        start = time.perf_counter()
+        pyray.rl_draw_render_batch_active()
+        image = pyray.load_image_from_screen()
+        size = image.width * image.height * 4
+        self._capture.capture(pyray.ffi.buffer(image.data, size), image.width, image.height, 
+            start)
+        pyray.unload_image(image)
 
     # draws a grid on game screen
-    def _draw_grid(self):
-        """Draws a grid on the screen."""
-        for y in range(0, self._height, self._cell_size):
-            pyray.draw_line(0, y, self._width, y, pyray.GRAY)
-        for x in range(0, self._width, self._cell_size):
-            pyray.draw_line(x, 0, x, self._height, pyray.GRAY)
\ No newline at end of file
+    def _draw_grid(self, width, height, cell_size):
+        """Draws a grid on the screen.
+
+        Args:
+            width (int): The width of the screen.
+            height (int): The height of the screen.
+            cell_size (int): The size of a cell in the grid.
+        """
+        for y in range(0, height, cell_size):
+            pyray.draw_line(0, y, width, y, pyray.GRAY)
+        for x in range(0, width, cell_size):
+            pyray.draw_line(x, 0, x, height, pyray.GRAY)
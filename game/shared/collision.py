@@ -0,0 +1,57 @@
+"""
+file: collision.py
+author: Jerry Lane
+purpose: Swept collision between a falling artifact and the robot. Instead
+of comparing where the two ended up after a tick, it follows both over the
+whole tick: the artifact falls straight down while the robot slides from
+one column towards the next, and the artifact is caught if the robot is
+under it at the moment it crosses the robot's row. The answer is exact at
+any velocity, so no sub-stepping is needed.
+"""
+
+
+def swept_catch(artifact_x, artifact_y, velocity_y, robot_previous_x, robot_x, robot_y,
+        cell_size):
+    """
+    parameters: artifact_x - the artifact's x, which does not change while it falls
+                artifact_y - the artifact's y after the tick
+                velocity_y - how far the artifact fell this tick, at least 1
+                robot_previous_x - the robot's x before the tick
+                robot_x - the robot's x after the tick
+                robot_y - the robot's y, which never changes
+                cell_size - the size of a cell in the display grid
+    return: True if the robot caught the artifact during the tick
+    The swept_catch function finds the fraction of the tick t = (robot_y -
+    start_y) / velocity_y at which the artifact crossed the robot's row, and
+    catches it if that happened during the tick and the robot, part way
+    along its move at t, overlapped the artifact's cell. Everything is
+    multiplied through by velocity_y to stay in whole numbers.
+
+    It only uses arithmetic, comparisons, & and abs, so every argument can
+    also be a NumPy array: given arrays of artifacts (or one row of
+    artifacts per game) it tests them all at once and returns a boolean
+    array.
+    """
+    # how far the artifact had to fall to reach the robot's row; it crossed during the tick if
+    # that is between nothing and the whole fall
+    reach = robot_y - artifact_y + velocity_y
+    crossed = (reach >= 0) & (reach <= velocity_y)
+
+    # at t = reach / velocity_y the robot is at robot_previous_x + (robot_x -
+    # robot_previous_x) * t; it overlaps the artifact if they are less than a cell apart
+    offset = (artifact_x - robot_previous_x) * velocity_y - (robot_x - robot_previous_x) * reach
+    return crossed & (abs(offset) < cell_size * velocity_y)
+
+
+def swept_columns(robot_previous_x, robot_x, cell_size):
+    """
+    parameters: robot_previous_x - the robot's x before the tick
+                robot_x - the robot's x after the tick
+                cell_size - the size of a cell in the display grid
+    return: a range of the x coordinates of the columns the robot passed over
+    The swept_columns function lists the only columns swept_catch can catch
+    an artifact in, so a ColumnIndex can be asked for just those.
+    """
+    low = min(robot_previous_x, robot_x)
+    high = max(robot_previous_x, robot_x)
+    return range(low, high + 1, cell_size)
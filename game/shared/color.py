@@ -16,7 +16,9 @@ class Color:
         _green (int): The green value.
         _blue (int): The blue value.
         _alpha (int): The alpha or opacity.
+        _tuple (tuple): The four values, built once since a Color never changes.
     """
+    __slots__ = ("_red", "_green", "_blue", "_alpha", "_tuple")
 
     # default constructor
     def __init__(self, red, green, blue, alpha = 255):
@@ -34,6 +36,7 @@ class Color:
         self._green = green
         self._blue = blue
         self._alpha = alpha
+        self._tuple = (red, green, blue, alpha)
 
     # returns a color as four separate values (a tuple)
     def to_tuple(self):
@@ -42,4 +45,4 @@ class Color:
         Returns:
             Tuple(int, int, int, int): The color as a tuple.
         """
-        return (self._red, self._green, self._blue, self._alpha)
\ No newline at end of file
+        return self._tuple
\ No newline at end of file
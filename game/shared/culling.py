@@ -0,0 +1,180 @@
+"""
+file: culling.py
+author: Jerry Lane
+purpose: Decides which artifacts are worth drawing. Artifacts outside the
+view are culled, which never changes the picture.
+
+Coalescing goes further, and is off unless asked for: of the artifacts
+that share a grid cell, only the one drawn last is kept. This is a lossy
+approximation. Glyphs are text on a transparent background and rarely
+line up exactly, so the ones dropped would often have shown around the
+edges of the one kept. With a level of detail threshold, a column crowded
+with more visible cells than that is coalesced over blocks of LOD_ROWS
+rows, which drops whole rows of artifacts that would have been seen. In
+exchange the draw pass costs what the screen can hold, however large the
+cast is.
+
+The same rules are written twice: here for actors, one at a time, and in
+artifact_pool.visible_rows for the parallel arrays of an ArtifactPool, all
+at once.
+"""
+# set defaults
+LOD_ROWS = 4
+
+
+# class declaration
+class Culler:
+    """Picks the artifacts to draw each frame.
+
+    The responsibility of a Culler is to leave out the artifacts of a cast group that are outside 
+    the view, and, when coalescing, those it approximates away, and to count what it left out.
+
+    Attributes:
+        _width (int): The width of the view.
+        _height (int): The height of the view.
+        _cell_size (int): The size of a cell in the display grid.
+        _coalesce (bool): Whether to draw one artifact per cell.
+        _lod_threshold (int): How many visible cells a column may have before it is coalesced
+            over blocks of LOD_ROWS rows, or None to never do so.
+        _cells (dict): The artifact drawn in each cell, reused every frame.
+        _considered (int): The artifacts looked at in the last frame.
+        _culled (int): The artifacts in the last frame that were outside the view.
+        _drawn (int): The artifacts in the last frame that were drawn.
+    """
+
+    # default constructor
+    def __init__(self, width, height, cell_size, coalesce = False, lod_threshold = None):
+        """Constructs a new Culler for a view of the given size.
+
+        Args:
+            width (int): The width of the view.
+            height (int): The height of the view.
+            cell_size (int): The size of a cell in the display grid.
+            coalesce (bool): Whether to draw only the last artifact in each cell, which changes 
+                the picture.
+            lod_threshold (int): How many visible cells a column may have before it is drawn at
+                a coarser level of detail, or None to always draw every cell. Only used when 
+                coalescing.
+        """
+        self._width = width
+        self._height = height
+        self._cell_size = cell_size
+        self._coalesce = coalesce
+        self._lod_threshold = lod_threshold
+        self._cells = {}
+        self._considered = 0
+        self._culled = 0
+        self._drawn = 0
+
+    # pick the artifacts to draw
+    def cull(self, actors, alpha = 1.0, camera_y = 0, pool = None):
+        """Gets the artifacts to draw this frame, in the order they should be drawn.
+
+        Args:
+            actors (Iterable): The artifacts, in the order they would have been drawn.
+            alpha (float): How far between the last two ticks they are drawn.
+            camera_y (float): The world y at the top of the view.
+            pool (ArtifactPool): The pool the artifacts are views of, or None. Pooled artifacts
+                are culled over the pool's arrays without looking at the views, by the same 
+                rules.
+
+        Returns:
+            List: The artifacts to draw.
+        """
+        if pool is not None:
+            rows, culled = pool.get_visible_rows(alpha, camera_y, self._width, self._height,
+                self._cell_size, self._coalesce, self._lod_threshold)
+            self._count(len(pool), culled, len(rows))
+            return pool.create_views(rows)
+
+        width = self._width
+        height = self._height
+        cell_size = self._cell_size
+        coalesce = self._coalesce
+        cells = self._cells
+        visible = []
+        considered = 0
+        inside = 0
+        for actor in actors:
+            considered += 1
+            x, y = actor.get_interpolated_position(alpha)
+            y -= camera_y
+            if x <= -cell_size or x >= width or y <= -cell_size or y >= height:
+                continue
+            inside += 1
+            if coalesce:
+
+                # move the cell to the end, so the cells stay in the order they are drawn
+                key = (int(x // cell_size), int(y // cell_size))
+                cells.pop(key, None)
+                cells[key] = actor
+            else:
+                visible.append(actor)
+        if coalesce:
+            visible = self._coarsen(cells) if self._lod_threshold is not None \
+                else list(cells.values())
+            cells.clear()
+        self._count(considered, considered - inside, len(visible))
+        return visible
+
+    # get what the last frame left out
+    def get_stats(self):
+        """Gets how many artifacts the last frame looked at, culled and drew. The rest were
+        coalesced into the ones drawn.
+
+        Returns:
+            dict: considered, culled, coalesced and drawn.
+        """
+        return {
+            "considered": self._considered,
+            "culled": self._culled,
+            "coalesced": self._considered - self._culled - self._drawn,
+            "drawn": self._drawn,
+        }
+
+    # describe the last frame in one line
+    def get_summary_line(self):
+        """Gets a short line describing the last frame, for drawing on screen.
+
+        Returns:
+            string: The line of text.
+        """
+        stats = self.get_stats()
+        return (f"drawn {stats['drawn']} of {stats['considered']} "
+            f"(culled {stats['culled']}, coalesced {stats['coalesced']})")
+
+    # coalesce crowded columns over blocks of rows
+    def _coarsen(self, cells):
+        """Coalesces the cells of every column with more than the threshold of them over blocks
+        of LOD_ROWS rows, keeping the last artifact of each block.
+
+        Args:
+            cells (dict): The artifact drawn in each (column, row) cell.
+
+        Returns:
+            List: The artifacts to draw.
+        """
+        counts = {}
+        for column, _ in cells:
+            counts[column] = counts.get(column, 0) + 1
+        threshold = self._lod_threshold
+        blocks = {}
+        for (column, row), actor in cells.items():
+            if counts[column] > threshold:
+                blocks[(column, row // LOD_ROWS)] = actor
+        return [actor for (column, row), actor in cells.items()
+            if counts[column] <= threshold or blocks[(column, row // LOD_ROWS)] is actor]
+
+    # remember what a frame left out
+    def _count(self, considered, culled, drawn):
+        """Records the counts of the frame just culled.
+
+        Args:
+            considered (int): The artifacts looked at.
+            culled (int): The artifacts outside the view.
+            drawn (int): The artifacts to draw.
+        """
+        self._considered = considered
+        self._culled = culled
+        self._drawn = drawn
+
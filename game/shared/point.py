@@ -15,6 +15,7 @@ class Point:
         _x (integer): The horizontal distance from the origin.
         _y (integer): The vertical distance from the origin.
     """
+    __slots__ = ("_x", "_y")
     
     # default constructor
     def __init__(self, x, y):
@@ -41,6 +42,20 @@ class Point:
         y = self._y + other.get_y()
         return Point(x, y)
 
+    # adds another point to this one in place
+    def iadd(self, other):
+        """Adds the given point to this one without creating a new Point.
+
+        Args:
+            other (Point): The Point to add.
+
+        Returns:
+            Point: This Point, now holding the sum.
+        """
+        self._x += other._x
+        self._y += other._y
+        return self
+
     # compares two points to one another
     def equals(self, other):
         """Whether or not this Point is equal to the given one.
@@ -71,6 +86,24 @@ class Point:
         """
         return self._y
 
+    # moves this point by an offset, wrapping at the maximum values
+    def move_in_place(self, dx, dy, max_x, max_y):
+        """Moves this point by the given offset without creating a new Point, wrapping from one
+        side to the other when it reaches the given maximum x and y values.
+
+        Args:
+            dx (int): The horizontal offset.
+            dy (int): The vertical offset.
+            max_x (int): The maximum x value.
+            max_y (int): The maximum y value.
+
+        Returns:
+            Point: This Point, now moved.
+        """
+        self._x = (self._x + dx) % max_x
+        self._y = (self._y + dy) % max_y
+        return self
+
     # scale a point according to factor and return it
     def scale(self, factor):
         """
@@ -82,4 +115,33 @@ class Point:
         Returns:
             Point: A new Point that is scaled.
         """
-        return Point(self._x * factor, self._y * factor)
\ No newline at end of file
+        return Point(self._x * factor, self._y * factor)
+
+    # scale this point in place
+    def iscale(self, factor):
+        """Scales this point by the provided factor without creating a new Point.
+
+        Args:
+            factor (int): The amount to scale.
+
+        Returns:
+            Point: This Point, now scaled.
+        """
+        self._x *= factor
+        self._y *= factor
+        return self
+
+    # overwrite both coordinates
+    def set(self, x, y):
+        """Replaces this point's coordinates without creating a new Point.
+
+        Args:
+            x (int): The new x value.
+            y (int): The new y value.
+
+        Returns:
+            Point: This Point, now holding the new values.
+        """
+        self._x = x
+        self._y = y
+        return self
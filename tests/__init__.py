@@ -0,0 +1,7 @@
+"""
+file: __init__.py
+author: Jerry Lane
+purpose: Marks the tests as a package, so pytest puts the project root on
+the path and the tests can import game the way __main__.py does. Run them
+from the project root with python3 -m pytest.
+"""
@@ -0,0 +1,68 @@
+"""
+file: test_artifact_catalog.py
+author: Jerry Lane
+purpose: Checks that artifact catalogs are read as written, survive a
+round trip through JSON, clamp fast kinds to one cell per tick and refuse
+files that are not valid catalogs.
+"""
+# import needed modules
+import json
+
+import pytest
+
+from game.casting.artifact_catalog import DEFAULT_CATALOG, MAX_VELOCITY, parse_catalog
+
+
+def catalog_of(*entries):
+    """
+    parameters: entries - the artifact entries, as dicts
+    return: the catalog text holding them
+    """
+    return json.dumps({"artifacts": list(entries)})
+
+
+# the defaults fill in what an entry leaves out
+def test_defaults():
+    catalog = parse_catalog(catalog_of({"name": "gem", "glyph": "o"}))
+    kind = catalog.get_type(0)
+    assert (kind.value, kind.weight, kind.speed, kind.color) == (0, 1, 1.0, None)
+
+
+# writing a catalog out and reading it back changes nothing
+def test_round_trip():
+    text = catalog_of({"name": "gem", "glyph": "o", "value": 3, "weight": 2, "speed": 1.5,
+        "color": [0, 255, 0, 255]}, {"name": "rock", "glyph": "*", "value": -1})
+    catalog = parse_catalog(text)
+    assert parse_catalog(catalog.to_json()).to_json() == catalog.to_json()
+    assert DEFAULT_CATALOG.get_values() == parse_catalog(DEFAULT_CATALOG.to_json()).get_values()
+
+
+# a kind never falls less than 1 or more than MAX_VELOCITY per tick, however fast it is
+def test_velocities_are_clamped():
+    catalog = parse_catalog(catalog_of({"name": "slow", "glyph": "s", "speed": 0.01},
+        {"name": "fast", "glyph": "f", "speed": 40}))
+    assert [velocity.get_y() for velocity in catalog.get_velocities(3)] == [1, MAX_VELOCITY]
+
+
+# anything that is not a valid catalog is refused with a ValueError
+@pytest.mark.parametrize("text", [
+    "not json",
+    json.dumps({"kinds": []}),
+    json.dumps({"artifacts": 5}),
+    catalog_of(),
+    catalog_of("gem"),
+    catalog_of({"glyph": "o"}),
+    catalog_of({"name": "gem"}),
+    catalog_of({"name": "gem", "glyph": "oo"}),
+    catalog_of({"name": "gem", "glyph": 7}),
+    catalog_of({"name": "gem", "glyph": "o", "value": "lots"}),
+    catalog_of({"name": "gem", "glyph": "o", "weight": -1}),
+    catalog_of({"name": "gem", "glyph": "o", "weight": 0}),
+    catalog_of({"name": "gem", "glyph": "o", "speed": 0}),
+    catalog_of({"name": "gem", "glyph": "o", "speed": -2}),
+    catalog_of({"name": "gem", "glyph": "o", "color": [0, 255]}),
+    catalog_of({"name": "gem", "glyph": "o", "color": "green"}),
+])
+def test_invalid_catalogs(text):
+    with pytest.raises(ValueError):
+        parse_catalog(text)
@@ -0,0 +1,91 @@
+"""
+file: test_chunked_world.py
+author: Jerry Lane
+purpose: Checks that a world file reads back the chunks it was written
+from, that damaged world files are refused when they are opened, and that
+a world keeps only the chunks around the camera in the cast.
+"""
+# import needed modules
+import os
+import struct
+
+import pytest
+
+from game.casting.artifact_catalog import DEFAULT_CATALOG, load_catalog
+from game.casting.cast import Cast
+from game.casting.chunked_world import ChunkedWorld, GeneratedChunkSource, HEADER, \
+    MappedChunkSource, save_world
+
+CATALOG_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + "/data/artifacts.json"
+CHUNKS = 5
+
+
+@pytest.fixture
+def world_path(tmp_path):
+    """
+    parameters: tmp_path - pytest's temporary directory
+    return: the path of a world file of CHUNKS generated chunks
+    """
+    path = tmp_path / "world.grw"
+    save_world(path, GeneratedChunkSource(7), CHUNKS)
+    return path
+
+
+# a world file holds the chunks it was written from, and repeats after the last one
+def test_mapped_chunks_match_generated(world_path):
+    generated = GeneratedChunkSource(7)
+    mapped = MappedChunkSource(world_path)
+    for index in range(CHUNKS):
+        assert mapped.get_chunk(index) == generated.get_chunk(index)
+    assert mapped.get_chunk(CHUNKS) == mapped.get_chunk(0)
+    mapped.close()
+
+
+# change the file's bytes and expect it to be refused
+def assert_refused(path, data, catalog = None):
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        MappedChunkSource(path, catalog)
+
+
+# files that are cut short are refused
+def test_truncated_files(world_path):
+    data = world_path.read_bytes()
+    assert_refused(world_path, data[:HEADER.size - 1])
+    assert_refused(world_path, data[:HEADER.size + 8])
+    assert_refused(world_path, data[:-1])
+
+
+# offsets that go backward or don't match the records are refused
+def test_bad_offsets(world_path):
+    data = bytearray(world_path.read_bytes())
+    struct.pack_into("<I", data, HEADER.size + 8, 0)
+    assert_refused(world_path, data)
+    data = bytearray(world_path.read_bytes())
+    struct.pack_into("<I", data, HEADER.size, 1)
+    assert_refused(world_path, data)
+
+
+# type ids must be in the catalog the world is played with
+def test_type_ids_are_checked(world_path):
+    data = bytearray(world_path.read_bytes())
+    records_start = HEADER.size + 4 * (CHUNKS + 1)
+    struct.pack_into("<H", data, records_start + 4, len(DEFAULT_CATALOG))
+    assert_refused(world_path, data)
+    world_path.write_bytes(bytes(data))
+    MappedChunkSource(world_path, load_catalog(CATALOG_PATH)).close()
+
+
+# only the chunks around the camera are in the cast
+def test_world_pages_chunks(world_path):
+    cast = Cast()
+    world = ChunkedWorld(MappedChunkSource(world_path))
+    cast.attach_world("artifacts", world)
+    for _ in range(200):
+        world.scroll(15)
+        world.update(cast, "artifacts")
+    stats = world.get_stats()
+    assert stats["active_chunks"] <= 3
+    assert stats["live_artifacts"] == len(cast.get_actors("artifacts"))
+    assert stats["chunks_loaded"] > stats["active_chunks"]
+    world.close()
@@ -0,0 +1,84 @@
+"""
+file: test_culling.py
+author: Jerry Lane
+purpose: Checks that the Culler leaves out only what it should, and that
+culling a pool over its arrays picks exactly the artifacts, in the same
+order, that culling its views one at a time does.
+"""
+# import needed modules
+import random
+
+import pytest
+
+from game.casting.artifact import Artifact
+from game.casting.cast_factory import create_cast, CELL_SIZE, MAX_X, MAX_Y
+from game.directing.director import Director
+from game.services.null_keyboard_service import NullKeyboardService
+from game.services.null_video_service import NullVideoService
+from game.shared.culling import Culler
+from game.shared.point import Point
+
+
+def make_artifact(x, y):
+    """
+    parameters: x, y - where the artifact is
+    return: an Artifact standing still at x, y
+    """
+    artifact = Artifact()
+    artifact.set_position(Point(x, y))
+    return artifact
+
+
+def describe(view, alpha):
+    """
+    parameters: view - a pooled artifact
+                alpha - how far between the last two ticks it is drawn
+    return: a tuple of where it is drawn, its glyph and its color
+    """
+    return (view.get_interpolated_position(alpha), view.get_text(), view.get_color().to_tuple())
+
+
+# without coalescing, everything in view is drawn, in order, and nothing else
+def test_cull_keeps_everything_in_view():
+    inside = [make_artifact(0, 0), make_artifact(30, 30), make_artifact(30, 30)]
+    outside = [make_artifact(-CELL_SIZE, 0), make_artifact(MAX_X, 0), make_artifact(0, MAX_Y)]
+    culler = Culler(MAX_X, MAX_Y, CELL_SIZE)
+    assert culler.cull(inside[:2] + outside + inside[2:]) == inside
+    assert culler.get_stats() == {"considered": 6, "culled": 3, "coalesced": 0, "drawn": 3}
+
+
+# coalescing keeps the last artifact in each cell
+def test_coalesce_keeps_the_last_in_each_cell():
+    first, second, third = make_artifact(30, 30), make_artifact(31, 32), make_artifact(60, 30)
+    culler = Culler(MAX_X, MAX_Y, CELL_SIZE, coalesce = True)
+    assert culler.cull([first, third, second]) == [third, second]
+    assert culler.get_stats()["coalesced"] == 1
+
+
+# the camera moves the view over the world
+def test_cull_follows_the_camera():
+    artifact = make_artifact(30, -300)
+    culler = Culler(MAX_X, MAX_Y, CELL_SIZE)
+    assert culler.cull([artifact]) == []
+    assert culler.cull([artifact], camera_y = -400) == [artifact]
+
+
+# the pooled and plain paths agree on what to draw
+@pytest.mark.parametrize("coalesce, lod_threshold", [(False, None), (True, None), (True, 5)])
+@pytest.mark.parametrize("alpha, camera_y", [(1.0, 0), (0.5, 0), (0.25, -100)])
+def test_pooled_and_plain_culling_agree(coalesce, lod_threshold, alpha, camera_y):
+    pytest.importorskip("numpy")
+    rng = random.Random(3)
+    cast = create_cast(5000, True, rng)
+    director = Director(NullKeyboardService(CELL_SIZE), NullVideoService(MAX_X, MAX_Y, CELL_SIZE),
+        rng = rng)
+    director.run_ticks(cast, 7)
+    pool = cast.get_pool("artifacts")
+    views = pool.create_views()
+    pooled = Culler(MAX_X, MAX_Y, CELL_SIZE, coalesce, lod_threshold)
+    plain = Culler(MAX_X, MAX_Y, CELL_SIZE, coalesce, lod_threshold)
+    picked = pooled.cull(views, alpha, camera_y, pool)
+    expected = plain.cull(views, alpha, camera_y)
+    assert [describe(view, alpha) for view in picked] == \
+        [describe(view, alpha) for view in expected]
+    assert pooled.get_stats() == plain.get_stats()
@@ -0,0 +1,54 @@
+"""
+file: test_headless.py
+author: Jerry Lane
+purpose: Checks that the game runs without a window: the Director plays
+ticks with the null services, and a seed is enough to play the same game
+twice.
+"""
+# import needed modules
+import random
+
+from game.casting.cast_factory import create_cast, CELL_SIZE, MAX_X, MAX_Y
+from game.directing.director import Director
+from game.services.null_keyboard_service import NullKeyboardService
+from game.services.null_video_service import NullVideoService
+
+
+def play(seed, ticks, artifacts = 40):
+    """
+    parameters: seed - the seed for the cast and the director
+                ticks - how many ticks to run
+                artifacts - how many artifacts to create
+    return: a tuple of (score, state hash) after the last tick
+    The play function runs a headless game the way --headless does.
+    """
+    rng = random.Random(seed)
+    cast = create_cast(artifacts, False, rng)
+    director = Director(NullKeyboardService(CELL_SIZE), NullVideoService(MAX_X, MAX_Y, CELL_SIZE),
+        rng = rng)
+    score = director.run_ticks(cast, ticks)
+    return score, director.get_state_hash(cast)
+
+
+# the same seed plays the same game
+def test_seeded_games_repeat():
+    assert play(5, 2000) == play(5, 2000)
+
+
+# different seeds scatter the artifacts differently
+def test_seeds_change_the_game():
+    assert play(5, 200)[1] != play(6, 200)[1]
+
+
+# no ticks leave the game as it was built
+def test_no_ticks_score_nothing():
+    assert play(5, 0)[0] == 0
+
+
+# the real game loop stops once the null video service reports its window closed
+def test_start_game_stops_when_the_window_closes():
+    cast = create_cast(40, False, random.Random(1))
+    video_service = NullVideoService(MAX_X, MAX_Y, CELL_SIZE, max_frames = 3)
+    director = Director(NullKeyboardService(CELL_SIZE), video_service, rng = random.Random(1))
+    director.start_game(cast)
+    assert not video_service.is_window_open()
@@ -0,0 +1,104 @@
+"""
+file: test_recording.py
+author: Jerry Lane
+purpose: Checks that a recorded game replays to the same score and state,
+with and without a pool, a catalog and a spawn rate, and that damaged
+recordings are refused.
+"""
+# import needed modules
+import os
+import random
+
+import pytest
+
+from game.casting.artifact_catalog import load_catalog
+from game.casting.cast_factory import create_cast, CELL_SIZE, MAX_X, MAX_Y
+from game.casting.respawn_scheduler import parse_curve
+from game.directing.director import Director
+from game.directing.replayer import replay
+from game.services.bot_keyboard_service import BotKeyboardService
+from game.services.input_recording import Recording, RecordingKeyboardService
+from game.services.null_video_service import NullVideoService
+
+CATALOG_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + "/data/artifacts.json"
+
+
+def record(path, seed, ticks, pooled = False, spawn_rate = "", catalog = None):
+    """
+    parameters: path - the recording file to write
+                seed - the game's seed
+                ticks - how many ticks to play
+                pooled - whether to keep the artifacts in a pool
+                spawn_rate - the --spawn-rate option, or "" for no limit
+                catalog - the ArtifactCatalog, or None for the default one
+    return: the saved Recording
+    The record function plays a game with the random bot, writing down its
+    input the way --record does.
+    """
+    rng = random.Random(seed)
+    cast = create_cast(40, pooled, rng, catalog)
+    recording = Recording(seed, 40, pooled, spawn_rate, catalog.to_json() if catalog else "")
+    keyboard_service = RecordingKeyboardService(BotKeyboardService(cast, "random", seed,
+        CELL_SIZE), recording)
+    spawn_curve = parse_curve(spawn_rate) if spawn_rate else None
+    director = Director(keyboard_service, NullVideoService(MAX_X, MAX_Y, CELL_SIZE), rng = rng,
+        spawn_curve = spawn_curve)
+    recording.final_score = director.run_ticks(cast, ticks)
+    recording.state_hash = director.get_state_hash(cast)
+    recording.save(path)
+    return recording
+
+
+# check that replaying the file ends the way the game did
+def assert_replays(path):
+    recording, score, state_hash = replay(path)
+    assert score == recording.final_score
+    assert state_hash == recording.state_hash
+
+
+# a plain game replays
+def test_replay_matches(tmp_path):
+    path = tmp_path / "game.grr"
+    record(path, 5, 2000)
+    assert_replays(path)
+
+
+# the catalog and spawn rate are stored with the recording
+def test_replay_matches_with_catalog_and_spawn_rate(tmp_path):
+    path = tmp_path / "game.grr"
+    record(path, 8, 1000, spawn_rate = "ramp:1:5:100", catalog = load_catalog(CATALOG_PATH))
+    assert_replays(path)
+
+
+# a pooled game replays too
+def test_pooled_replay_matches(tmp_path):
+    pytest.importorskip("numpy")
+    path = tmp_path / "game.grr"
+    record(path, 5, 2000, pooled = True, catalog = load_catalog(CATALOG_PATH))
+    assert_replays(path)
+
+
+# a recording reads back as it was saved
+def test_load_round_trips(tmp_path):
+    path = tmp_path / "game.grr"
+    saved = record(path, 3, 300, spawn_rate = "burst:2:10:50:5")
+    loaded = Recording.load(path)
+    assert (loaded.seed, loaded.artifact_count, loaded.pooled, loaded.spawn_rate,
+        loaded.catalog) == (saved.seed, saved.artifact_count, saved.pooled, saved.spawn_rate,
+        saved.catalog)
+    assert loaded.inputs == saved.inputs
+    assert loaded.final_score == saved.final_score
+    assert loaded.state_hash == saved.state_hash
+
+
+# files that are not recordings, or are cut short, are refused
+def test_damaged_recordings_are_refused(tmp_path):
+    path = tmp_path / "game.grr"
+    record(path, 5, 100)
+    data = path.read_bytes()
+    path.write_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        Recording.load(path)
+    path.write_bytes(data[:-10])
+    with pytest.raises(ValueError):
+        Recording.load(path)
@@ -0,0 +1,93 @@
+"""
+file: test_snapshot.py
+author: Jerry Lane
+purpose: Checks that a game restored from a snapshot carries on exactly
+as the game it was taken from: playing on from a restored snapshot gives
+the same bytes as never having stopped.
+"""
+# import needed modules
+import random
+
+import pytest
+
+from game.casting.cast_factory import create_cast, CELL_SIZE, MAX_X, MAX_Y
+from game.directing.director import Director
+from game.directing.snapshot import load_snapshot, pack_snapshot, save_snapshot, unpack_snapshot
+from game.services.bot_keyboard_service import BotKeyboardService
+from game.services.null_video_service import NullVideoService
+
+
+def make_director(cast, rng):
+    """
+    parameters: cast - the cast the bot watches
+                rng - the director's random generator
+    return: a Director playing with the greedy bot and no window
+    """
+    return Director(BotKeyboardService(cast, "greedy", 1, CELL_SIZE),
+        NullVideoService(MAX_X, MAX_Y, CELL_SIZE), rng = rng)
+
+
+def play_through(pooled, ticks):
+    """
+    parameters: pooled - whether to keep the artifacts in a pool
+                ticks - how many ticks to play
+    return: the snapshot after the last tick
+    """
+    rng = random.Random(9)
+    cast = create_cast(40, pooled, rng)
+    director = make_director(cast, rng)
+    director.run_ticks(cast, ticks)
+    return pack_snapshot(director, cast)
+
+
+def play_on(snapshot, ticks):
+    """
+    parameters: snapshot - the snapshot to restore
+                ticks - how many more ticks to play
+    return: the snapshot after the last tick
+    """
+    cast, state = unpack_snapshot(snapshot)
+    director = make_director(cast, random.Random(0))
+    director.set_state(state)
+    director.run_ticks(cast, ticks)
+    return pack_snapshot(director, cast)
+
+
+# a restored game plays on byte for byte like the original
+@pytest.mark.parametrize("pooled", [False, True])
+def test_restore_plays_on_identically(pooled):
+    if pooled:
+        pytest.importorskip("numpy")
+    assert play_on(play_through(pooled, 500), 500) == play_through(pooled, 1000)
+
+
+# restoring and saving again changes nothing
+@pytest.mark.parametrize("pooled", [False, True])
+def test_snapshot_round_trips(pooled):
+    if pooled:
+        pytest.importorskip("numpy")
+    snapshot = play_through(pooled, 300)
+    assert play_on(snapshot, 0) == snapshot
+
+
+# a snapshot file is memory-mapped back the same as the bytes it was saved from
+def test_save_and_load(tmp_path):
+    rng = random.Random(4)
+    cast = create_cast(40, False, rng)
+    director = make_director(cast, rng)
+    director.run_ticks(cast, 200)
+    path = tmp_path / "game.grs"
+    save_snapshot(path, director, cast)
+    restored, state = load_snapshot(path)
+    again = make_director(restored, random.Random(0))
+    again.set_state(state)
+    assert pack_snapshot(again, restored) == pack_snapshot(director, cast)
+
+
+# anything that is not a snapshot is refused
+def test_not_a_snapshot():
+    snapshot = play_through(False, 10)
+    with pytest.raises(ValueError):
+        unpack_snapshot(b"XXXX" + snapshot[4:])
+    with pytest.raises(ValueError):
+        unpack_snapshot(snapshot[:len(snapshot) // 2])